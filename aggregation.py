@@ -0,0 +1,77 @@
+# aggregation.py
+"""Penjumlahan per hari / bulan / minggu / kategori dengan NumPy untuk TransactionStore.
+
+Array kolom (timestamp terurut, rid, jumlah, tipe, kategori dan kunci
+tanggal) dibaca lewat np.frombuffer tanpa salinan. Rentang dicari dengan
+np.searchsorted, lalu seluruh baris di rentang itu dijumlahkan sekali
+jalan dengan np.bincount; yang dikembalikan hanya total per grup.
+"""
+try:
+    import numpy as np
+except ImportError:  # numpy ikut terpasang bersama matplotlib
+    np = None
+
+
+def available():
+    return np is not None
+
+
+def _view(arr):
+    # view tanpa salinan; jangan disimpan lebih lama dari satu pemanggilan,
+    # array yang sedang di-view tidak bisa bertambah panjang
+    return np.frombuffer(arr, dtype=arr.typecode)
+
+
+def sum_by(keys, rids, cols, start_ts=None, end_ts=None, by=None):
+    """{grup: {tipe: total}} untuk baris dengan start_ts <= timestamp < end_ts.
+
+    `keys`/`rids` adalah indeks waktu TransactionStore (terurut), `cols`
+    ColumnarTransactions-nya. Urutan grup mengikuti kemunculan pertama.
+    """
+    ts = _view(keys)
+    lo = 0 if start_ts is None else int(np.searchsorted(ts, start_ts, "left"))
+    hi = len(ts) if end_ts is None else int(np.searchsorted(ts, end_ts, "left"))
+    if lo >= hi:
+        return {}
+    return _sum(_view(rids)[lo:hi], cols, by)
+
+
+def sum_rids(rids, cols, by=None):
+    """Seperti sum_by untuk daftar rid sembarang (mis. hasil query, urut waktu)."""
+    if not len(rids):
+        return {}
+    return _sum(_view(rids), cols, by)
+
+
+def _sum(rid, cols, by):
+    jumlah = _view(cols.jumlah)[rid]
+    tipe = _view(cols.tipe)[rid].astype(np.intp)
+
+    if by is None:
+        grup = np.zeros(len(rid), dtype=np.intp)
+        names = [None]
+    elif by in ("hari", "bulan", "minggu_ke"):
+        # kunci tanggal integer dipetakan ke 0..n-1 supaya bincount tetap kecil
+        kunci, grup = np.unique(_view(getattr(cols, by))[rid], return_inverse=True)
+        names = kunci.tolist()
+    elif by == "kategori":
+        grup = _view(cols.kategori)[rid].astype(np.intp)
+        names = cols.kategori_names.strings
+    else:
+        raise ValueError(f"grup tidak dikenal: {by!r}")
+
+    n_tipe = len(cols.tipe_names)
+    size = len(names) * n_tipe
+    flat = grup * n_tipe + tipe
+    sums = np.bincount(flat, weights=jumlah, minlength=size).reshape(-1, n_tipe)
+    counts = np.bincount(flat, minlength=size).reshape(-1, n_tipe)
+
+    present, first = np.unique(grup, return_index=True)
+    hasil = {}
+    for g in present[np.argsort(first)]:
+        hasil[names[g]] = {
+            cols.tipe_names[k]: float(sums[g, k])
+            for k in range(n_tipe)
+            if counts[g, k]
+        }
+    return hasil
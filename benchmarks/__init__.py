@@ -0,0 +1 @@
+"""Benchmark Cash Tracker; dijalankan dari root proyek, mis. `python -m benchmarks.bench_memory`."""
@@ -0,0 +1,51 @@
+# benchmarks/bench_charts.py
+"""Waktu persiapan data grafik bar + pie per refresh (NumPy vs loop Python).
+
+    python -m benchmarks.bench_charts --rows 1000000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+
+import aggregation
+import charts
+from benchmarks.bench_memory import make_rows
+from data_store import TransactionStore
+
+
+def time_refresh(store, ref_date, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for mode in ("mingguan", "bulanan"):
+            charts.bar_series(store, ref_date, mode)
+            charts.pie_series(store, ref_date, mode)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+    store = TransactionStore(rows)
+    ref_date = datetime.fromtimestamp(rows[len(rows) // 2]["timestamp"])
+
+    result = {"rows": args.rows}
+    if aggregation.available():
+        result["numpy_ms"] = round(time_refresh(store, ref_date, args.repeat), 3)
+
+    np, aggregation.np = aggregation.np, None
+    try:
+        result["python_ms"] = round(time_refresh(store, ref_date, args.repeat), 3)
+    finally:
+        aggregation.np = np
+
+    print(json.dumps(result, indent=4))
+    return result
+
+
+if __name__ == "__main__":
+    main()
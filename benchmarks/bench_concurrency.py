@@ -0,0 +1,105 @@
+# benchmarks/bench_concurrency.py
+"""Beberapa instance menambah transaksi bersamaan ke ledger yang sama.
+
+    python -m benchmarks.bench_concurrency --rows 100000 --procs 1 4 --appends 500
+
+Setiap proses memuat store (seperti aplikasi yang terbuka), lalu memanggil
+add_transaction berulang kali. Dicatat throughput total, latensi per
+tambah, dan banyak transaksi yang hilang (harus 0).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.ledger import write_ledger
+
+
+def _worker(folder, wid, appends, barrier, out):
+    os.chdir(folder)
+    import data_store
+
+    data_store.init_json()
+    data_store.get_store()
+    barrier.wait()
+
+    latensi = []
+    for i in range(appends):
+        start = time.perf_counter()
+        data_store.add_transaction({
+            "tipe": "pengeluaran",
+            "jumlah": 1000,
+            "kategori": "Bench",
+            "keterangan": f"proses {wid} ke-{i}",
+            "timestamp": time.time(),
+            "waktu": time.strftime("%H:%M:%S"),
+        })
+        latensi.append((time.perf_counter() - start) * 1000)
+    data_store.wait_for_compaction()
+    out.put(latensi)
+
+
+def run(rows, procs, appends):
+    ctx = multiprocessing.get_context("spawn")  # instance terpisah, bukan salinan fork
+    with tempfile.TemporaryDirectory() as tmp:
+        write_ledger(os.path.join(tmp, "data_cash.json"), rows)
+        barrier = ctx.Barrier(procs + 1)
+        out = ctx.Queue()
+        workers = [
+            ctx.Process(target=_worker, args=(tmp, w, appends, barrier, out))
+            for w in range(procs)
+        ]
+        for p in workers:
+            p.start()
+        barrier.wait()
+        start = time.perf_counter()
+        latensi = [x for _ in workers for x in out.get()]
+        elapsed = time.perf_counter() - start
+        for p in workers:
+            p.join()
+
+        # periksa dari proses baru: semua tambahan harus ada
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            import data_store
+
+            data_store.drop_cache()
+            data = data_store.load_json()
+            ada = sum(1 for t in data["transaksi"] if t["kategori"] == "Bench")
+        finally:
+            os.chdir(cwd)
+
+    latensi.sort()
+    return {
+        "procs": procs,
+        "appends_per_s": round(len(latensi) / elapsed),
+        "latency_ms": {
+            "p50": round(statistics.median(latensi), 3),
+            "p95": round(latensi[int(len(latensi) * 0.95)], 3),
+            "max": round(latensi[-1], 3),
+        },
+        "lost": procs * appends - ada,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--procs", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--appends", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    result = {
+        "rows": args.rows,
+        "runs": [run(args.rows, procs, args.appends) for procs in args.procs],
+    }
+    print(json.dumps(result, indent=4))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_memory.py
+"""Bandingkan memori list-of-dicts (format data_cash.json) dengan ColumnarTransactions.
+
+    python -m benchmarks.bench_memory --rows 1000000
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from columnar import ColumnarTransactions
+
+KATEGORI = ["Makan", "transportasi", "Jajan", "Tagihan", "Hiburan", "isi bensin"]
+KETERANGAN = ["makan siang", "naik bus", "beli kopi", "bayar listrik", "nonton", "bensin"]
+
+
+def make_rows(n, seed=0):
+    """Transaksi sintetis, di-roundtrip lewat JSON supaya string-nya tidak ter-share."""
+    rng = random.Random(seed)
+    ts = 1_700_000_000.0
+    rows = []
+    for _ in range(n):
+        ts += rng.uniform(60, 7200)
+        pemasukan = rng.random() < 0.1
+        rows.append({
+            "tipe": "pemasukan" if pemasukan else "pengeluaran",
+            "jumlah": float(rng.randrange(1, 500) * 1000),
+            "kategori": "Gaji part-time" if pemasukan else rng.choice(KATEGORI),
+            "keterangan": rng.choice(KETERANGAN),
+            "waktu": time.strftime("%H:%M:%S", time.localtime(ts)),
+            "timestamp": ts,
+        })
+    return json.loads(json.dumps(rows))
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    text = json.dumps(make_rows(args.rows))
+
+    dicts, dict_bytes = measure(lambda: json.loads(text))
+    del dicts
+    cols, col_bytes = measure(lambda: ColumnarTransactions(json.loads(text)))
+    del cols
+
+    result = {
+        "rows": args.rows,
+        "list_of_dicts_bytes": dict_bytes,
+        "columnar_bytes": col_bytes,
+        "bytes_per_row": {
+            "list_of_dicts": round(dict_bytes / args.rows, 1),
+            "columnar": round(col_bytes / args.rows, 1),
+        },
+        "ratio": round(dict_bytes / col_bytes, 2),
+    }
+    print(json.dumps(result, indent=4))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_snapshot.py
+"""Bandingkan waktu muat & ukuran file snapshot JSON dengan snapshot biner.
+
+    python -m benchmarks.bench_snapshot --rows 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import binary_snapshot
+from benchmarks.ledger import write_ledger
+from columnar import ColumnarTransactions
+
+
+def load_json(path):
+    with open(path) as f:
+        data = json.load(f)
+    data["transaksi"] = ColumnarTransactions(data["transaksi"])
+    return data
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "data_cash.json")
+        bin_path = os.path.join(tmp, "data_cash.bin")
+        write_ledger(json_path, args.rows)
+        with open(bin_path, "wb") as f:
+            binary_snapshot.dump(load_json(json_path), f)
+
+        json_s = best_of(lambda: load_json(json_path), args.repeat)
+        bin_s = best_of(lambda: binary_snapshot.load(bin_path), args.repeat)
+        json_bytes = os.path.getsize(json_path)
+        bin_bytes = os.path.getsize(bin_path)
+
+    result = {
+        "rows": args.rows,
+        "load_s": {"json": round(json_s, 4), "bin": round(bin_s, 4)},
+        "file_bytes": {"json": json_bytes, "bin": bin_bytes},
+        "speedup": round(json_s / bin_s, 1),
+        "size_ratio": round(json_bytes / bin_bytes, 2),
+    }
+    print(json.dumps(result, indent=4))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/ledger.py
+"""Pembuat data_cash.json sintetis (1k - 10M transaksi) untuk benchmark.
+
+    python -m benchmarks.ledger --rows 1000000 --out data_cash.json
+
+Datanya dibuat mirip pemakaian nyata: tersebar beberapa tahun, kategori
+pengeluaran condong ke beberapa kategori favorit (bobot Zipf), nominal
+log-normal per kategori, gaji di awal bulan. File ditulis per baris
+seperti snapshot data_store, jadi 10M baris tidak perlu ditahan di memori.
+"""
+import argparse
+import json
+import random
+import time
+
+# (kategori, nominal tipikal); urutan = seberapa sering dipakai
+PENGELUARAN = [
+    ("Makan", 25_000),
+    ("Jajan", 15_000),
+    ("transportasi", 20_000),
+    ("isi bensin", 50_000),
+    ("Belanja", 150_000),
+    ("Tagihan", 350_000),
+    ("Hiburan", 75_000),
+    ("Kesehatan", 120_000),
+    ("Pendidikan", 500_000),
+    ("Donasi", 50_000),
+    ("Hadiah", 200_000),
+    ("Servis motor", 250_000),
+]
+PEMASUKAN = [
+    ("Transfer masuk", 300_000),
+    ("Gaji part-time", 1_500_000),
+    ("Bonus", 750_000),
+    ("Jual barang", 200_000),
+]
+KETERANGAN = {
+    "Makan": ["makan siang", "makan malam", "sarapan", "warteg", "nasi padang"],
+    "Jajan": ["beli kopi", "es teh", "gorengan", "martabak"],
+    "transportasi": ["naik bus", "ojek online", "parkir", "KRL"],
+    "isi bensin": ["pertalite", "pertamax"],
+    "Tagihan": ["bayar listrik", "internet", "pulsa", "air PDAM"],
+}
+GAJI = ("Gaji", 5_000_000)
+
+DEFAULT_YEARS = 3
+DEFAULT_END = 1_767_139_200.0  # 2025-12-31 00:00 UTC; tetap supaya hasil bisa diulang
+
+
+def _zipf_weights(n, s=1.1):
+    return [1 / (i + 1) ** s for i in range(n)]
+
+
+def _nominal(rng, tipikal):
+    # log-normal di sekitar nominal tipikal, dibulatkan ke Rp 500
+    return float(max(500, round(tipikal * rng.lognormvariate(0, 0.6) / 500) * 500))
+
+
+def iter_transactions(n, years=DEFAULT_YEARS, end=DEFAULT_END, seed=0):
+    """Yield `n` dict transaksi terurut waktu, berakhir di sekitar `end`."""
+    rng = random.Random(seed)
+    start = end - years * 365 * 86400
+    gap = (end - start) / max(n, 1)
+
+    keluar = [k for k, _ in PENGELUARAN]
+    keluar_w = _zipf_weights(len(keluar))
+    masuk = [k for k, _ in PEMASUKAN]
+    masuk_w = _zipf_weights(len(masuk), 1.5)
+    tipikal = dict(PENGELUARAN + PEMASUKAN + [GAJI])
+
+    ts = start
+    bulan_gaji = None
+    last_id = 0
+    for _ in range(n):
+        ts += rng.expovariate(1 / gap)
+        lt = time.localtime(ts)
+
+        if (lt.tm_year, lt.tm_mon) != bulan_gaji and lt.tm_mday <= 5:
+            bulan_gaji = (lt.tm_year, lt.tm_mon)
+            tipe, kategori = "pemasukan", GAJI[0]
+        elif rng.random() < 0.08:
+            tipe, kategori = "pemasukan", rng.choices(masuk, masuk_w)[0]
+        else:
+            tipe, kategori = "pengeluaran", rng.choices(keluar, keluar_w)[0]
+
+        pilihan = KETERANGAN.get(kategori)
+        keterangan = rng.choice(pilihan) if pilihan else kategori.lower()
+
+        # id seperti data_store.new_id: mikrodetik, selalu naik
+        last_id = max(last_id + 1, int(ts * 1_000_000))
+        yield {
+            "id": last_id,
+            "tipe": tipe,
+            "jumlah": _nominal(rng, tipikal[kategori]),
+            "kategori": kategori,
+            "keterangan": keterangan,
+            "waktu": time.strftime("%H:%M:%S", lt),
+            "timestamp": ts,
+        }
+
+
+def write_ledger(path, n, years=DEFAULT_YEARS, end=DEFAULT_END, seed=0):
+    """Tulis snapshot data_cash.json berisi `n` transaksi sintetis."""
+    kategori = {}
+    with open(path, "w") as f:
+        f.write('{\n    "transaksi": [')
+        sep = "\n        "
+        for t in iter_transactions(n, years, end, seed):
+            f.write(sep)
+            f.write(json.dumps(t))
+            sep = ",\n        "
+            kategori.setdefault(t["kategori"], None)
+        f.write("\n    ]" if sep != "\n        " else "]")
+        f.write(f',\n    "kategori": {json.dumps(list(kategori))}')
+        f.write(',\n    "journal_seq": 0\n}\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--years", type=int, default=DEFAULT_YEARS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="data_cash.json")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    write_ledger(args.out, args.rows, args.years, seed=args.seed)
+    print(f"{args.rows} transaksi -> {args.out} ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# benchmarks/suite.py
+"""Benchmark tanpa GUI untuk setiap tahap refresh, dengan pembanding baseline.
+
+    python -m benchmarks.suite --sizes 1000 10000 100000 --out hasil.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+
+Untuk setiap ukuran dibuat ledger sintetis (benchmarks.ledger) di folder
+sementara, lalu diukur median waktu (ms) tiap tahap:
+
+- load_json / save_json     : baca (parse ulang) dan tulis ulang data_cash.json
+- build_store               : indeks + agregat TransactionStore dari data termuat
+- refresh_summary           : saldo, pengeluaran bulan ini & hari ini
+- update_filter_options     : daftar tanggal filter + daftar kategori
+- search                    : langkah pertama pencarian teks tabel riwayat
+- query                     : langkah pertama Query multi-kriteria + totalnya
+- weekly_chart_data         : data grafik bar (mingguan & bulanan)
+- pie_chart_data            : data pie kategori (mingguan & bulanan)
+- render_bar / render_pie   : update + draw grafik dengan backend Agg
+
+Dengan --baseline, tahap yang lebih lambat dari baseline melebihi
+toleransi dicetak sebagai REGRESI dan proses keluar dengan kode 1; begitu
+juga tahap yang belum ada di baseline (TANPA BASELINE).
+"""
+import matplotlib
+
+matplotlib.use("Agg")
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import aggregation
+import charts
+import data_store
+import search
+from benchmarks import ledger
+from query import Query
+
+SIZES = (1_000, 10_000, 100_000)
+MODES = ("mingguan", "bulanan")
+
+
+def measure(fn, repeat):
+    """Median waktu `fn()` dalam ms dari `repeat` kali jalan."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(times), 3)
+
+
+def bench_size(n, repeat, io_repeat):
+    """{tahap: ms} untuk ledger sintetis berisi `n` transaksi."""
+    ref_date = datetime.fromtimestamp(ledger.DEFAULT_END - 86400)
+    result = {}
+
+    def load():
+        data_store.drop_cache()
+        return data_store.load_json()
+
+    def build_store():
+        data_store.reload()
+        return data_store.get_store()
+
+    result["load_json"] = measure(load, io_repeat)
+    result["build_store"] = measure(build_store, io_repeat)
+    store = data_store.get_store()
+
+    def summary():
+        agg = store.aggregates
+        agg.saldo()
+        agg.month_total(ref_date, "pengeluaran")
+        agg.day_total(ref_date, "pengeluaran")
+
+    def filter_options():
+        ["Semua"] + store.dates()
+        store.categories()
+
+    def search_rows():
+        for teks in ("bus", "mak sia"):
+            store.query(Query(teks=teks), limit=search.CHUNK)
+
+    # kategori jarang (posting list), tipe + jumlah (indeks waktu), teks
+    queries = [
+        Query(kategori="Servis motor"),
+        Query(tipe="pengeluaran", min_jumlah=100_000),
+        Query(kategori={"Makan", "Jajan"}, max_jumlah=20_000, teks="sia"),
+    ]
+
+    def query_rows():
+        for q in queries:
+            store.query(q, limit=search.CHUNK)
+            store.query_sum(q)
+
+    def bar_data():
+        for mode in MODES:
+            charts.bar_series(store, ref_date, mode)
+
+    def pie_data():
+        for mode in MODES:
+            charts.pie_series(store, ref_date, mode)
+
+    result["refresh_summary"] = measure(summary, repeat)
+    result["update_filter_options"] = measure(filter_options, repeat)
+    result["search"] = measure(search_rows, repeat)
+    result["query"] = measure(query_rows, repeat)
+    result["weekly_chart_data"] = measure(bar_data, repeat)
+    result["pie_chart_data"] = measure(pie_data, repeat)
+
+    # render seperti di aplikasi: grafik sudah dibangun, refresh hanya update
+    bar_chart = charts.BarChart(*_figure())
+    series = charts.bar_series(store, ref_date, "mingguan")
+    bar_chart.update("mingguan", *series)
+    result["render_bar"] = measure(lambda: bar_chart.update("mingguan", *series), repeat)
+
+    pie_chart = charts.PieChart(*_figure())
+    labels, sizes = charts.pie_series(store, ref_date, "bulanan")
+    pie_chart.update(labels, sizes)
+    result["render_pie"] = measure(lambda: pie_chart.update(labels, sizes), repeat)
+
+    data = data_store.load_json()
+    result["save_json"] = measure(lambda: data_store.save_json(data), io_repeat)
+    return result
+
+
+def _figure():
+    figure = Figure(figsize=(5, 4), dpi=100)
+    return figure, FigureCanvasAgg(figure)
+
+
+def run(sizes, repeat, io_repeat):
+    data_store.use_backend("json")
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="cash_bench_") as tmp:
+        try:
+            for n in sizes:
+                folder = os.path.join(tmp, str(n))
+                os.mkdir(folder)
+                os.chdir(folder)
+                ledger.write_ledger(data_store.FILE_JSON, n)
+                results[str(n)] = bench_size(n, repeat, io_repeat)
+                data_store.drop_cache()
+                print(f"{n:>10} transaksi selesai", file=sys.stderr)
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def meta():
+    return {
+        "tanggal": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": aggregation.np.__version__ if aggregation.available() else None,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def compare(results, baseline, tolerance, min_ms):
+    """Daftar (ukuran, tahap, baseline_ms, ms) yang melambat melebihi toleransi.
+
+    Selisih di bawah `min_ms` diabaikan supaya noise tahap yang sangat
+    cepat tidak dianggap regresi. Tahap yang tidak ada di baseline untuk
+    ukuran yang ada di baseline ikut dilaporkan dengan baseline_ms None:
+    baseline perlu dibuat ulang.
+    """
+    regresi = []
+    base_results = baseline.get("results", {})
+    for size, stages in results.items():
+        if size not in base_results:
+            continue  # ukuran di luar baseline (--sizes lain): tidak ada pembanding
+        for stage, ms in stages.items():
+            base = base_results[size].get(stage)
+            if base is None:
+                regresi.append((size, stage, None, ms))
+            elif ms > base * (1 + tolerance) and ms - base > min_ms:
+                regresi.append((size, stage, base, ms))
+    return regresi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--io-repeat", type=int, default=3,
+                        help="pengulangan tahap load/save/build (lebih lambat)")
+    parser.add_argument("--out", help="tulis hasil JSON ke file ini")
+    parser.add_argument("--baseline", help="baseline JSON untuk dibandingkan")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="simpan hasil sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="batas melambat relatif, 0.5 = 50%%")
+    parser.add_argument("--min-ms", type=float, default=1.0,
+                        help="selisih absolut minimal agar dianggap regresi")
+    args = parser.parse_args(argv)
+
+    report = {"meta": meta(), "results": run(args.sizes, args.repeat, args.io_repeat)}
+    text = json.dumps(report, indent=4)
+    print(text)
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            f.write(text + "\n")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regresi = compare(report["results"], baseline, args.tolerance, args.min_ms)
+    for size, stage, base, ms in regresi:
+        if base is None:
+            print(f"TANPA BASELINE {stage} @ {size} transaksi: {ms:.3f} ms", file=sys.stderr)
+            continue
+        print(
+            f"REGRESI {stage} @ {size} transaksi: {base:.3f} ms -> {ms:.3f} ms "
+            f"({ms / base:.2f}x)",
+            file=sys.stderr,
+        )
+    if regresi:
+        return 1
+    print("Tidak ada regresi terhadap baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# binary_snapshot.py
+"""Snapshot biner ledger (data_cash.bin) untuk backend JSON.
+
+Dipakai bila CASH_TRACKER_SNAPSHOT=bin: snapshot ditulis ke data_cash.bin
+sebagai pengganti data_cash.json, journal tetap data_cash.journal.
+
+Isi file:
+
+    MAGIC (8 byte) | panjang header (uint32 LE) | header JSON | padding ke 8
+    blok data, masing-masing rata 8 byte:
+      - kolom ColumnarTransactions (columnar.ARRAYS), lebar tetap per baris:
+        id int64, timestamp & jumlah float64, tipe int8, kategori &
+        keterangan id int32, kunci tanggal hari/bulan/pekan int32 +
+        minggu_ke int8
+      - tiap tabel string (tipe, kategori, keterangan): offset int64 +
+        blob UTF-8
+
+Header mencatat tipe, posisi dan panjang tiap blok, byte order, zona
+waktu saat kunci tanggal dihitung, dan field snapshot lain (kategori,
+journal_seq). Saat dibaca file di-mmap; tiap kolom disalin ke array
+lewat memoryview (satu memcpy per kolom, tanpa objek Python per baris)
+dan keterangan baru di-decode saat barisnya dibaca (PackedStrings).
+
+data_cash.json tetap bisa dipakai untuk diedit manual / backup:
+
+    python -m binary_snapshot export --out data_cash.json
+    python -m binary_snapshot import data_cash.json
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from columnar import ARRAYS, ColumnarTransactions, PackedStrings, StringTable
+from datekeys import tz_signature
+
+MAGIC = b"CASHBIN1"
+VERSI = 1
+_STRING_TABLES = ("tipe_names", "kategori_names", "keterangan_strings")
+
+
+def _pad(n):
+    return -n % 8
+
+
+def _packed(table):
+    """(offsets, blob) satu StringTable."""
+    if isinstance(table, PackedStrings) and not table.materialized:
+        return table.offsets, table.blob  # belum berubah sejak dibaca
+    encoded = [s.encode() for s in table.strings]
+    offsets = array("q", [0])
+    total = 0
+    for b in encoded:
+        total += len(b)
+        offsets.append(total)
+    return offsets, b"".join(encoded)
+
+
+def dump(data, f):
+    """Tulis `data` (transaksi berupa ColumnarTransactions) ke file biner `f`."""
+    cols = data["transaksi"]
+    order = cols.order
+    n = len(order)
+    # tanpa slot bebas dan urutan sisip = urutan slot: kolom ditulis apa adanya
+    rapat = len(cols.ids) == n and order == array("q", range(n))
+
+    blocks = []
+    for name in ARRAYS:
+        col = getattr(cols, name)
+        if not rapat:
+            col = array(col.typecode, (col[rid] for rid in order))
+        blocks.append((name, col))
+    for name in _STRING_TABLES:
+        offsets, blob = _packed(getattr(cols, name))
+        blocks.append((name + ".offsets", offsets))
+        blocks.append((name + ".blob", blob))
+
+    if cols.extra:
+        posisi = {rid: i for i, rid in enumerate(order)}
+        extra = {str(posisi[rid]): v for rid, v in cols.extra.items() if rid in posisi}
+    else:
+        extra = {}
+
+    header = {
+        "versi": VERSI,
+        "n": n,
+        "byteorder": sys.byteorder,
+        "tz": repr(cols.tz),
+        "blok": {},
+        "extra": extra,
+        "data": {k: v for k, v in data.items() if k != "transaksi"},
+    }
+    offset = 0
+    for name, block in blocks:
+        nbytes = memoryview(block).nbytes
+        typecode = block.typecode if isinstance(block, array) else "B"
+        itemsize = block.itemsize if isinstance(block, array) else 1
+        header["blok"][name] = [typecode, itemsize, offset, nbytes]
+        offset += nbytes + _pad(nbytes)
+
+    raw = json.dumps(header).encode()
+    f.write(MAGIC)
+    f.write(struct.pack("<I", len(raw)))
+    f.write(raw)
+    f.write(b"\0" * _pad(len(MAGIC) + 4 + len(raw)))
+    for _, block in blocks:
+        f.write(block)
+        f.write(b"\0" * _pad(memoryview(block).nbytes))
+
+
+def is_snapshot(path):
+    """True bila `path` berupa snapshot biner (diawali MAGIC)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_header(path):
+    """(header, posisi awal blok data) tanpa membaca blok data."""
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC) + 4)
+        if head[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: bukan snapshot biner")
+        (size,) = struct.unpack("<I", head[len(MAGIC):])
+        header = json.loads(f.read(size))
+    if header.get("versi") != VERSI:
+        raise ValueError(f"{path}: versi snapshot {header.get('versi')} tidak dikenal")
+    start = len(MAGIC) + 4 + size
+    return header, start + _pad(start)
+
+
+def load(path):
+    """Isi snapshot seperti json.load(data_cash.json), transaksi sebagai ColumnarTransactions."""
+    header, base = read_header(path)
+    swap = header["byteorder"] != sys.byteorder
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as buf:
+            def block(name):
+                typecode, itemsize, offset, nbytes = header["blok"][name]
+                start = base + offset
+                if typecode == "B":
+                    return bytes(buf[start:start + nbytes])
+                arr = array(typecode)
+                if arr.itemsize != itemsize:
+                    raise ValueError(f"{path}: ukuran kolom {name} tidak cocok")
+                arr.frombytes(buf[start:start + nbytes])
+                if swap:
+                    arr.byteswap()
+                return arr
+
+            arrays = {name: block(name) for name in ARRAYS}
+            tables = {
+                name: PackedStrings(block(name + ".offsets"), block(name + ".blob"))
+                for name in _STRING_TABLES
+            }
+
+    # tipe & kategori hanya beberapa string: langsung di-decode
+    tipe = StringTable(tables["tipe_names"].strings)
+    kategori = StringTable(tables["kategori_names"].strings)
+    tz = tz_signature()
+    cols = ColumnarTransactions.from_arrays(
+        arrays, tipe, kategori, tables["keterangan_strings"],
+        extra={int(pos): v for pos, v in header["extra"].items()},
+        tz=tz if header["tz"] == repr(tz) else None,
+    )
+
+    data = dict(header["data"])
+    data["transaksi"] = cols
+    return data
+
+
+# -------------------------------------------------------------
+#   CLI: EKSPOR / IMPOR data_cash.json
+# -------------------------------------------------------------
+def main(argv=None):
+    import data_store
+
+    parser = argparse.ArgumentParser(description="Ekspor / impor snapshot ledger sebagai JSON")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("export", help="tulis seluruh ledger ke file JSON")
+    p.add_argument("--out", default=data_store.FILE_JSON)
+    p = sub.add_parser("import", help="ganti isi ledger dengan file JSON")
+    p.add_argument("path", nargs="?", default=data_store.FILE_JSON)
+    args = parser.parse_args(argv)
+
+    live = os.path.abspath(data_store.snapshot_file())
+    data_store.init_json()
+
+    if args.cmd == "export":
+        if os.path.abspath(args.out) == live:
+            parser.error(f"{args.out} adalah snapshot yang sedang dipakai")
+        data = data_store.load_json()
+        tmp = args.out + ".tmp"
+        with open(tmp, "w") as f:
+            data_store._dump_snapshot(
+                {"transaksi": data["transaksi"], "kategori": data["kategori"]}, f
+            )
+        os.replace(tmp, args.out)
+        print(f"{len(data['transaksi'])} transaksi diekspor ke {args.out}")
+        return 0
+
+    if os.path.abspath(args.path) == live:
+        parser.error(f"{args.path} adalah snapshot yang sedang dipakai")
+    with open(args.path) as f:
+        data = json.load(f)
+    data.pop("journal_seq", None)
+    data_store.save_json(data)
+    print(f"{len(data['transaksi'])} transaksi diimpor dari {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
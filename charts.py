@@ -1,186 +1,503 @@
 # charts.py
+import math
+import threading
+from collections import OrderedDict, namedtuple
 from datetime import datetime, timedelta
-from collections import defaultdict
-from matplotlib.ticker import FuncFormatter
+
+# matplotlib baru diimpor saat grafik pertama dibangun (BarChart/PieChart),
+# jadi persiapan data di modul ini bisa dipakai tanpa biaya import-nya
+from datekeys import day_of, month_of
+from instrumentation import timed
+
+HARI = ["Min", "Sen", "Sel", "Rab", "Kam", "Jum", "Sab"]
+MINGGU = [1, 2, 3, 4, 5]
+BULAN = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun",
+         "Jul", "Agu", "Sep", "Okt", "Nov", "Des"]
+
+# banyak tahun pada mode multi_tahun (tahun referensi + 4 sebelumnya)
+TAHUN_MULTI = 5
+
+# mode jangka panjang dibaca dari store.rollups: mode -> (level batang, judul)
+ROLLUP_MODES = {
+    "kuartalan": ("bulan", "Grafik Kuartalan"),
+    "tahunan": ("bulan", "Grafik Tahunan"),
+    "multi_tahun": ("tahun", f"Grafik {TAHUN_MULTI} Tahun"),
+}
+
+# batas entri cache: series (murah, kecil) dan hasil render per canvas
+SERIES_CACHE_SIZE = 64
+RASTER_CACHE_SIZE = 16
+
+# key = (mode, awal periode, query filter atau None, versi data periode itu)
+ChartData = namedtuple("ChartData", ["key", "bar", "pie"])
 
 
 def _format_y_axis(ax):
+    from matplotlib.ticker import FuncFormatter
+
     ax.yaxis.set_major_formatter(
         FuncFormatter(lambda x, p: format(int(x), ',').replace(',', '.'))
     )
 
 
-def update_charts(
-    data,
-    selected_date,
-    mode,
-    figure_weekly,
-    canvas_weekly,
-    lbl_bulan,
-    figure_pie,
-    canvas_pie,
-):
-    """Update label bulan + grafik bar dan pie."""
-    bulan_str = selected_date.strftime("%B %Y")
-    lbl_bulan.config(text=bulan_str)
+class LRUCache:
+    """Dict berukuran tetap; entri yang paling lama tidak dipakai dibuang."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()  # dipakai dari worker refresh & main loop
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+series_cache = LRUCache(SERIES_CACHE_SIZE)
+
+
+def chart_data(store, ref_date, mode, q=None):
+    """Data grafik tanpa widget: ChartData(key, (pemasukan, pengeluaran), (labels, sizes)).
+
+    Tidak menyentuh widget, jadi boleh dijalankan di thread worker. Hasil
+    di-cache per (mode, awal periode, query, versi data periode); selama
+    tidak ada transaksi di periode itu yang berubah, berpindah mode/tanggal
+    cukup mengambil dari cache. `q` (query.Query, opsional) membatasi
+    baris yang dijumlah, misalnya filter riwayat yang sedang aktif.
+    """
+    if q is not None and not q.filtered:
+        q = None
+    start, end = chart_period(ref_date, mode)
+    key = (mode, start, q, store.version(start.timestamp(), end.timestamp()))
+    data = series_cache.get(key)
+    if data is not None:
+        return data
+
+    with timed("chart.bar_series"):
+        bar = bar_series(store, ref_date, mode, q)
+    with timed("chart.pie_series"):
+        pie = pie_series(store, ref_date, mode, q)
+    data = ChartData(key, bar, pie)
+    series_cache.put(key, data)
+    return data
+
+
+def apply_charts(data, selected_date, mode, bar_chart, lbl_bulan, pie_chart):
+    """Terapkan hasil chart_data ke widget (harus di main loop Tk)."""
+    (pemasukan, pengeluaran), (labels, sizes) = data.bar, data.pie
+    lbl_bulan.config(text=period_label(selected_date, mode))
+
+    with timed("chart.bar_update"):
+        bar_chart.update(
+            mode, pemasukan, pengeluaran, key=data.key,
+            labels=bar_labels(selected_date, mode),
+        )
+    with timed("chart.pie_update"):
+        pie_chart.update(labels, sizes, key=data.key)
 
-    update_weekly_chart(data, selected_date, mode, figure_weekly, canvas_weekly)
-    update_pie_chart(data, selected_date, mode, figure_pie, canvas_pie)
 
+# -------------------------------------------------------------
+#   PERSIAPAN DATA
+# -------------------------------------------------------------
+def _week_start(ref_date):
+    # minggu referensi: mulai dari Minggu (Min)
+    start = ref_date - timedelta(days=ref_date.weekday() + 1)
+    return datetime(start.year, start.month, start.day)
 
-def update_weekly_chart(data, ref_date, mode, figure_weekly, canvas_weekly):
-    figure_weekly.clear()
-    ax = figure_weekly.add_subplot(111)
 
-    # margin supaya label & angka sumbu tidak kepotong
-    figure_weekly.subplots_adjust(left=0.18, bottom=0.30, top=0.88, right=0.96)
+def _month_range(ref_date):
+    start = datetime(ref_date.year, ref_date.month, 1)
+    if start.month == 12:
+        return start, datetime(start.year + 1, 1, 1)
+    return start, datetime(start.year, start.month + 1, 1)
 
-    _format_y_axis(ax)
 
-    # styling umum
-    ax.grid(axis="y", linestyle="--", alpha=0.3)
-    ax.tick_params(axis="x", labelsize=9)
-    ax.tick_params(axis="y", labelsize=9)
+def _rollup_keys(ref_date, mode):
+    """Kunci rollup tiap batang untuk mode jangka panjang (urut kiri ke kanan)."""
+    if mode == "kuartalan":
+        awal = month_of(ref_date) - (ref_date.month - 1) % 3
+        return list(range(awal, awal + 3))
+    if mode == "tahunan":
+        awal = ref_date.year * 12
+        return list(range(awal, awal + 12))
+    return list(range(ref_date.year - TAHUN_MULTI + 1, ref_date.year + 1))
 
-    # lebar satu batang
-    width = 0.4
 
+def chart_period(ref_date, mode):
+    """(awal, akhir) periode grafik: minggu (mulai Minggu), bulan, kuartal,
+    tahun, atau TAHUN_MULTI tahun terakhir sampai tahun referensi."""
     if mode == "mingguan":
-        # ===================== MODE MINGGUAN =====================
-        # minggu referensi: mulai dari Minggu (Min)
-        start = ref_date - timedelta(days=ref_date.weekday() + 1)
-        days = [start + timedelta(days=i) for i in range(7)]
+        start = _week_start(ref_date)
+        return start, start + timedelta(days=7)
+    if mode == "kuartalan":
+        bulan = ref_date.month - (ref_date.month - 1) % 3
+        start = datetime(ref_date.year, bulan, 1)
+        if bulan == 10:
+            return start, datetime(ref_date.year + 1, 1, 1)
+        return start, datetime(ref_date.year, bulan + 3, 1)
+    if mode == "tahunan":
+        return datetime(ref_date.year, 1, 1), datetime(ref_date.year + 1, 1, 1)
+    if mode == "multi_tahun":
+        return (
+            datetime(ref_date.year - TAHUN_MULTI + 1, 1, 1),
+            datetime(ref_date.year + 1, 1, 1),
+        )
+    return _month_range(ref_date)
 
-        pemasukan = []
-        pengeluaran = []
 
-        for d in days:
-            list_p = [
-                t["jumlah"]
-                for t in data["transaksi"]
-                if t["tipe"] == "pemasukan"
-                and datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m-%d")
-                == d.strftime("%Y-%m-%d")
-            ]
-            list_q = [
-                t["jumlah"]
-                for t in data["transaksi"]
-                if t["tipe"] == "pengeluaran"
-                and datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m-%d")
-                == d.strftime("%Y-%m-%d")
-            ]
-
-            pemasukan.append(sum(list_p))
-            pengeluaran.append(sum(list_q))
-
-        x = list(range(7))  # 0..6
-        # posisi batang: pemasukan sedikit ke kiri, pengeluaran sedikit ke kanan
-        x_pemasukan = [i - width / 2 for i in x]
-        x_pengeluaran = [i + width / 2 for i in x]
+def period_label(ref_date, mode):
+    """Teks label periode di atas grafik."""
+    if mode == "kuartalan":
+        return f"Kuartal {(ref_date.month - 1) // 3 + 1} {ref_date.year}"
+    if mode == "tahunan":
+        return str(ref_date.year)
+    if mode == "multi_tahun":
+        return f"{ref_date.year - TAHUN_MULTI + 1} - {ref_date.year}"
+    return ref_date.strftime("%B %Y")
 
-        bars_p = ax.bar(x_pemasukan, pemasukan, width=width,
-                        label="Pemasukan", color="#4CAF50")
-        bars_q = ax.bar(x_pengeluaran, pengeluaran, width=width,
-                        label="Pengeluaran", color="#F44336", alpha=0.7)
 
-        ax.set_xticks(x)
-        ax.set_xticklabels(["Min", "Sen", "Sel", "Rab", "Kam", "Jum", "Sab"])
+def bar_labels(ref_date, mode):
+    """Label sumbu x tiap batang."""
+    if mode == "mingguan":
+        return HARI
+    if mode == "bulanan":
+        return [f"Minggu {i}" for i in MINGGU]
+    if mode == "multi_tahun":
+        return [str(tahun) for tahun in _rollup_keys(ref_date, mode)]
+    return [BULAN[bulan % 12] for bulan in _rollup_keys(ref_date, mode)]
+
+
+def _sum_by(store, start, end, by, q=None):
+    """store.sum_by untuk start <= waktu < end, lewat query_sum bila ada filter."""
+    if q is None:
+        return store.sum_by(start.timestamp(), end.timestamp(), by)
+    return store.query_sum(q.within(start.timestamp(), end.timestamp()), by)
+
+
+def _filtered_rollup(store, ref_date, mode, q):
+    """Pengganti store.rollups.totals untuk mode jangka panjang bila ada filter.
+
+    Rollup tidak menyimpan total per keterangan/jumlah, jadi baris hasil
+    query dijumlah per bulan (per tahun = bulan // 12 untuk multi_tahun).
+    """
+    start, end = chart_period(ref_date, mode)
+    hasil = {}
+    for bulan, total in _sum_by(store, start, end, "bulan", q).items():
+        key = bulan // 12 if ROLLUP_MODES[mode][0] == "tahun" else bulan
+        gabung = hasil.setdefault(key, {})
+        for tipe, jumlah in total.items():
+            gabung[tipe] = gabung.get(tipe, 0) + jumlah
+    return hasil
+
+
+def bar_series(store, ref_date, mode, q=None):
+    """Total (pemasukan, pengeluaran) per batang.
+
+    Mingguan (per hari) dan bulanan (per minggu) dijumlah oleh store (di
+    memori atau SUM/GROUP BY di SQL) dengan kunci hari / minggu_ke
+    integer. Kuartalan/tahunan (per bulan) dan multi_tahun (per tahun)
+    dibaca dari store.rollups, jadi biayanya sebanding dengan jumlah
+    batang, bukan jumlah transaksi di periode itu. Dengan query filter
+    `q`, yang dijumlah hanya baris hasil query.
+    """
+    if mode in ROLLUP_MODES:
+        keys = _rollup_keys(ref_date, mode)
+        level = ROLLUP_MODES[mode][0]
+        if q is None:
+            per_periode = store.rollups.totals(level, keys[0], keys[-1])
+        else:
+            per_periode = _filtered_rollup(store, ref_date, mode, q)
+        pemasukan = [per_periode.get(k, {}).get("pemasukan", 0) for k in keys]
+        pengeluaran = [per_periode.get(k, {}).get("pengeluaran", 0) for k in keys]
+        return pemasukan, pengeluaran
 
-        for label in ax.get_xticklabels():
-            label.set_rotation(90)
-            label.set_ha("center")
+    if mode == "mingguan":
+        start = _week_start(ref_date)
+        end = start + timedelta(days=7)
+        per_hari = _sum_by(store, start, end, "hari", q)
+        hari_awal = day_of(start)
 
-        ax.set_title("Grafik Mingguan", fontsize=12, fontweight="bold", pad=10)
+        pemasukan = []
+        pengeluaran = []
 
+        for i in range(7):
+            total = per_hari.get(hari_awal + i, {})
+            pemasukan.append(total.get("pemasukan", 0))
+            pengeluaran.append(total.get("pengeluaran", 0))
+        return pemasukan, pengeluaran
+
+    start, end = _month_range(ref_date)
+    per_minggu = _sum_by(store, start, end, "minggu_ke", q)
+
+    pemasukan = [per_minggu.get(i, {}).get("pemasukan", 0) for i in MINGGU]
+    pengeluaran = [per_minggu.get(i, {}).get("pengeluaran", 0) for i in MINGGU]
+    return pemasukan, pengeluaran
+
+
+def pie_series(store, ref_date, mode, q=None):
+    """(labels, sizes) pengeluaran per kategori pada periode referensi."""
+    if mode in ROLLUP_MODES and q is None:
+        keys = _rollup_keys(ref_date, mode)
+        if mode == "tahunan":  # satu entri tahun, bukan 12 entri bulan
+            tahun = ref_date.year
+            per_kategori = store.rollups.by_kategori("tahun", tahun, tahun)
+        else:
+            level = ROLLUP_MODES[mode][0]
+            per_kategori = store.rollups.by_kategori(level, keys[0], keys[-1])
     else:
-        # ===================== MODE BULANAN =====================
-        this_month = ref_date.strftime("%Y-%m")
-        trans_month = [
-            t for t in data["transaksi"]
-            if datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m") == this_month
-        ]
-
-        weekly_pemasukan = defaultdict(int)
-        weekly_pengeluaran = defaultdict(int)
+        start, end = chart_period(ref_date, mode)
+        per_kategori = _sum_by(store, start, end, "kategori", q)
+
+    labels = []
+    sizes = []
+    for kategori, total in per_kategori.items():
+        if "pengeluaran" in total:
+            labels.append(kategori)
+            sizes.append(total["pengeluaran"])
+    return labels, sizes
+
+
+# -------------------------------------------------------------
+#   CONTROLLER GRAFIK
+# -------------------------------------------------------------
+class RasterCache:
+    """Hasil render (buffer Agg) per key untuk satu canvas.
+
+    Setiap draw canvas disimpan di bawah key state yang sedang tampil.
+    Bila state dengan key yang sama diminta lagi dan ukuran canvas belum
+    berubah, buffer itu cukup di-blit tanpa menggambar ulang figure.
+    """
+
+    def __init__(self, figure, canvas, maxsize=RASTER_CACHE_SIZE):
+        self.figure = figure
+        self.canvas = canvas
+        self.key = None  # key state yang sedang dipasang di artist
+        self._regions = LRUCache(maxsize)
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _size(self):
+        return tuple(int(v) for v in self.figure.bbox.size)
+
+    def _on_draw(self, event):
+        if self.key is not None:
+            region = self.canvas.copy_from_bbox(self.figure.bbox)
+            self._regions.put(self.key, (self._size(), region))
+
+    def show(self, key):
+        """Pasang `key` sebagai state aktif; True bila cukup di-blit dari cache."""
+        self.key = key
+        cached = self._regions.get(key) if key is not None else None
+        if cached is None or cached[0] != self._size():
+            self.canvas.draw_idle()
+            return False
+        self.canvas.restore_region(cached[1])
+        self.canvas.blit(self.figure.bbox)
+        return True
+
+
+class BarChart:
+    """Grafik batang pemasukan vs pengeluaran.
+
+    Axes, formatter, batang, tick dan legend dibuat sekali per mode dan
+    disimpan; pindah mode cukup menukar axes yang terlihat. Refresh data
+    berikutnya hanya mengganti tinggi batang (dan label sumbu x bila
+    berubah, mis. tahun pada mode multi_tahun) lalu menskalakan ulang
+    sumbu y, dan bila `key` sudah pernah digambar hasil render-nya di-blit
+    dari RasterCache.
+    """
 
-        for t in trans_month:
-            dt = datetime.fromtimestamp(t["timestamp"])
-            week_index = (dt.day - 1) // 7 + 1  # 1..5
-
-            if t["tipe"] == "pemasukan":
-                weekly_pemasukan[week_index] += t["jumlah"]
-            elif t["tipe"] == "pengeluaran":
-                weekly_pengeluaran[week_index] += t["jumlah"]
+    # lebar satu batang
+    width = 0.4
 
-        x = [1, 2, 3, 4, 5]
-        pemasukan = [weekly_pemasukan[i] for i in x]
-        pengeluaran = [weekly_pengeluaran[i] for i in x]
+    def __init__(self, figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self.mode = None
+        self.ax = None
+        self.bars_p = []
+        self.bars_q = []
+        self._axes = {}  # mode -> (ax, bars_p, bars_q)
+        self._labels = {}  # mode -> label sumbu x yang terpasang
+        self.raster = RasterCache(figure, canvas)
+
+    def update(self, mode, pemasukan, pengeluaran, key=None, labels=None):
+        if mode != self.mode:
+            if mode not in self._axes:
+                self._build(mode, pemasukan, pengeluaran, labels)
+            for m, (ax, _, _) in self._axes.items():
+                ax.set_visible(m == mode)
+            self.mode = mode
+            self.ax, self.bars_p, self.bars_q = self._axes[mode]
+
+        if labels is not None and labels != self._labels[mode]:
+            self.ax.set_xticklabels(labels, rotation=90, ha="center")
+            self._labels[mode] = list(labels)
+
+        for bar, h in zip(self.bars_p, pemasukan):
+            bar.set_height(h)
+        for bar, h in zip(self.bars_q, pengeluaran):
+            bar.set_height(h)
+        self.ax.relim()
+        self.ax.autoscale_view(scalex=False)
+
+        self.raster.show(key)
+
+    def _build(self, mode, pemasukan, pengeluaran, labels=None):
+        ax = self.figure.add_subplot(111)
+
+        # margin supaya label & angka sumbu tidak kepotong
+        self.figure.subplots_adjust(left=0.18, bottom=0.30, top=0.88, right=0.96)
+
+        _format_y_axis(ax)
+
+        # styling umum
+        ax.grid(axis="y", linestyle="--", alpha=0.3)
+        ax.tick_params(axis="x", labelsize=9)
+        ax.tick_params(axis="y", labelsize=9)
+
+        if mode == "mingguan":
+            x = list(range(7))  # 0..6
+            labels = HARI
+            title = "Grafik Mingguan"
+        elif mode in ROLLUP_MODES:
+            x = list(range(len(pemasukan)))
+            labels = labels or [""] * len(x)
+            title = ROLLUP_MODES[mode][1]
+        else:
+            x = MINGGU
+            labels = [f"Minggu {i}" for i in x]
+            title = "Grafik Bulanan"
 
-        x_pemasukan = [i - width / 2 for i in x]
-        x_pengeluaran = [i + width / 2 for i in x]
+        # posisi batang: pemasukan sedikit ke kiri, pengeluaran sedikit ke kanan
+        x_pemasukan = [i - self.width / 2 for i in x]
+        x_pengeluaran = [i + self.width / 2 for i in x]
 
-        bars_p = ax.bar(x_pemasukan, pemasukan, width=width,
+        bars_p = ax.bar(x_pemasukan, pemasukan, width=self.width,
                         label="Pemasukan", color="#4CAF50")
-        bars_q = ax.bar(x_pengeluaran, pengeluaran, width=width,
+        bars_q = ax.bar(x_pengeluaran, pengeluaran, width=self.width,
                         label="Pengeluaran", color="#F44336", alpha=0.7)
 
         ax.set_xticks(x)
-        ax.set_xticklabels([f"Minggu {i}" for i in x])
+        ax.set_xticklabels(labels)
 
         for label in ax.get_xticklabels():
             label.set_rotation(90)
             label.set_ha("center")
 
-        ax.set_title("Grafik Bulanan", fontsize=12, fontweight="bold", pad=10)
+        ax.set_title(title, fontsize=12, fontweight="bold", pad=10)
+        ax.legend(fontsize=9, loc="upper right")
+        self._axes[mode] = (ax, bars_p, bars_q)
+        self._labels[mode] = list(labels)
 
-    ax.legend(fontsize=9, loc="upper right")
-    canvas_weekly.draw()
 
+class PieChart:
+    """Diagram pie kategori pengeluaran.
 
-def update_pie_chart(data, ref_date, mode, figure_pie, canvas_pie):
-    figure_pie.clear()
-    ax = figure_pie.add_subplot(111)
+    Axes dan judul dibuat sekali. Selama daftar kategori sama, wedge dan
+    teksnya hanya digeser sudutnya; pie baru dibuat bila kategori berubah.
+    State yang sudah pernah digambar (per `key`) di-blit dari RasterCache.
+    """
 
-    if mode == "mingguan":
-        start = ref_date - timedelta(days=ref_date.weekday() + 1)
-        end = start + timedelta(days=6)
-
-        pengeluaran = [
-            t for t in data["transaksi"]
-            if t["tipe"] == "pengeluaran"
-            and start.date()
-            <= datetime.fromtimestamp(t["timestamp"]).date()
-            <= end.date()
-        ]
-    else:
-        month_str = ref_date.strftime("%Y-%m")
-        pengeluaran = [
-            t for t in data["transaksi"]
-            if t["tipe"] == "pengeluaran"
-            and datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m")
-            == month_str
-        ]
-
-    if not pengeluaran:
-        ax.text(0.5, 0.5, "Tidak ada data", ha="center", va="center", fontsize=10)
-    else:
-        kategori_sum = defaultdict(int)
-        for t in pengeluaran:
-            kategori_sum[t["kategori"]] += t["jumlah"]
+    startangle = 90
+    labeldistance = 1.1
+    pctdistance = 0.6
 
-        labels = list(kategori_sum.keys())
-        sizes = list(kategori_sum.values())
+    def __init__(self, figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self.ax = figure.add_subplot(111)
+        self.labels = None
+        self.wedges = []
+        self.texts = []
+        self.autotexts = []
 
-        wedges, texts, autotexts = ax.pie(
+        self.empty_text = self.ax.text(
+            0.5, 0.5, "Tidak ada data", ha="center", va="center", fontsize=10,
+            transform=self.ax.transAxes,
+        )
+        self.ax.set_title(
+            "Kategori Pengeluaran", fontsize=12, fontweight="bold", pad=10
+        )
+        self.ax.axis("off")
+        self.raster = RasterCache(figure, canvas)
+
+    def update(self, labels, sizes, key=None):
+        total = sum(sizes)
+        if not labels or total <= 0:
+            self._clear_pie()
+            self.labels = None
+            self.empty_text.set_visible(True)
+        elif labels == self.labels:
+            self._move_wedges(sizes, total)
+        else:
+            self._build_pie(labels, sizes)
+
+        self.raster.show(key)
+
+    def _build_pie(self, labels, sizes):
+        self._clear_pie()
+        self.empty_text.set_visible(False)
+        self.labels = list(labels)
+
+        self.wedges, self.texts, self.autotexts = self.ax.pie(
             sizes,
             labels=labels,
+            colors=self._colors(len(labels)),
             autopct="%1.1f%%",
             textprops={"fontsize": 9},
-            startangle=90,
+            startangle=self.startangle,
+            labeldistance=self.labeldistance,
+            pctdistance=self.pctdistance,
         )
 
         # supaya benar-benar bentuk lingkaran
-        ax.axis("equal")
-
-    ax.set_title("Kategori Pengeluaran", fontsize=12, fontweight="bold", pad=10)
-    canvas_pie.draw()
+        self.ax.axis("equal")
+
+    @staticmethod
+    def _colors(n):
+        # warna diambil dari awal siklus setiap kali, sama seperti pie baru
+        from matplotlib import rcParams
+
+        cycle = rcParams["axes.prop_cycle"].by_key()["color"]
+        return [cycle[i % len(cycle)] for i in range(n)]
+
+    def _move_wedges(self, sizes, total):
+        theta1 = self.startangle
+        for wedge, text, autotext, size in zip(
+            self.wedges, self.texts, self.autotexts, sizes
+        ):
+            theta2 = theta1 + 360.0 * size / total
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+
+            mid = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(mid), math.sin(mid)
+            text.set_position((self.labeldistance * x, self.labeldistance * y))
+            text.set_ha("left" if x > 0 else "right")
+            autotext.set_position((self.pctdistance * x, self.pctdistance * y))
+            autotext.set_text(f"{100.0 * size / total:.1f}%")
+
+            theta1 = theta2
+
+    def _clear_pie(self):
+        for artist in self.wedges + self.texts + self.autotexts:
+            artist.remove()
+        self.wedges, self.texts, self.autotexts = [], [], []
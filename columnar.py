@@ -0,0 +1,459 @@
+# columnar.py
+import json
+import time
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+
+from datekeys import date_keys, tz_signature
+
+# urutan field seperti di data_cash.json
+FIELDS = ("id", "tipe", "jumlah", "kategori", "keterangan", "waktu", "timestamp")
+_WAJIB = frozenset(("tipe", "jumlah", "kategori", "keterangan", "timestamp"))
+_KOLOM = frozenset(FIELDS)
+
+# kolom array per slot, dalam urutan tetap (dipakai copy & snapshot biner)
+ARRAYS = ("ids", "timestamp", "jumlah", "tipe", "kategori", "keterangan",
+          "hari", "bulan", "pekan", "minggu_ke")
+
+
+class StringTable:
+    """String ter-intern: tiap string unik disimpan sekali, baris cukup memegang id."""
+
+    def __init__(self, strings=()):
+        self.strings = []
+        self._ids = {}
+        for s in strings:
+            self.id_of(s)
+
+    def id_of(self, s):
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def find(self, s):
+        """id `s`, atau None bila belum pernah di-intern (tanpa menambah)."""
+        return self._ids.get(s)
+
+    def __getitem__(self, i):
+        return self.strings[i]
+
+    def __len__(self):
+        return len(self.strings)
+
+    def copy(self):
+        new = StringTable()
+        new.strings = list(self.strings)
+        new._ids = dict(self._ids)
+        return new
+
+
+class PackedStrings(StringTable):
+    """StringTable yang dibaca dari blob UTF-8 + array offset (snapshot biner).
+
+    String di-decode satu per satu saat diminta, jadi string milik baris
+    yang tidak pernah dibaca tidak pernah menjadi objek Python. Tabel baru
+    di-decode seluruhnya (jadi StringTable biasa) saat pertama kali ada
+    string ditambahkan lewat id_of atau daftar `strings` diminta.
+    """
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets  # array("q"), len = banyak string + 1
+        self.blob = blob        # bytes
+        self._decoded = {}
+        self._list = None
+
+    @property
+    def strings(self):
+        return self._materialize()
+
+    @property
+    def materialized(self):
+        return self._list is not None
+
+    def _materialize(self):
+        if self._list is None:
+            self._list = [self[i] for i in range(len(self.offsets) - 1)]
+            self._ids = {s: i for i, s in enumerate(self._list)}
+        return self._list
+
+    def id_of(self, s):
+        self._materialize()  # id_of butuh indeks string -> id
+        return super().id_of(s)
+
+    def find(self, s):
+        self._materialize()
+        return super().find(s)
+
+    def __getitem__(self, i):
+        if self._list is not None:
+            return self._list[i]
+        s = self._decoded.get(i)
+        if s is None:
+            s = self._decoded[i] = self.blob[self.offsets[i]:self.offsets[i + 1]].decode()
+        return s
+
+    def __len__(self):
+        return len(self.offsets) - 1 if self._list is None else len(self._list)
+
+    def copy(self):
+        if self._list is None:
+            return PackedStrings(self.offsets, self.blob)  # isi tidak berubah
+        return super().copy()
+
+
+class ColumnarTransactions:
+    """Daftar transaksi dalam bentuk kolom.
+
+    id transaksi di array("q") dengan indeks hash id -> slot (find),
+    timestamp & jumlah disimpan di array("d"), tipe sebagai kode kecil,
+    kategori dan keterangan sebagai id ke StringTable. Kolom `waktu` tidak
+    disimpan karena selalu bisa diturunkan dari timestamp. Kunci tanggal
+    lokal (lihat datekeys) dihitung sekali setiap timestamp di-set dan
+    disimpan di kolom hari, bulan, pekan dan minggu_ke.
+
+    Dari luar berperilaku seperti list transaksi dalam urutan sisip (len,
+    index, iterasi, append, del); setiap baris dibaca lewat RowView yang
+    bersifat seperti dict. Slot baris (rid) stabil selama baris itu ada,
+    slot baris yang dihapus dipakai ulang oleh append berikutnya.
+    """
+
+    def __init__(self, transaksi=()):
+        self.ids = array("q")  # 0 = belum punya id
+        self.timestamp = array("d")
+        self.jumlah = array("d")
+        self.tipe = array("b")
+        self.kategori = array("i")
+        self.keterangan = array("i")
+
+        self.hari = array("i")
+        self.bulan = array("i")
+        self.pekan = array("i")
+        self.minggu_ke = array("b")
+        self.tz = tz_signature()  # zona waktu saat kunci tanggal dihitung
+
+        self.tipe_names = StringTable(["pemasukan", "pengeluaran"])
+        self.kategori_names = StringTable()
+        self.keterangan_strings = StringTable()
+        self.extra = {}  # rid -> field lain yang tidak punya kolom
+        self._by_id = {}  # id transaksi -> rid (None: dibangun saat dibutuhkan)
+
+        self.order = array("q")  # rid dalam urutan sisip
+        self._free = []
+
+        self.extend(transaksi)
+
+    @classmethod
+    def from_arrays(cls, arrays, tipe_names, kategori_names, keterangan_strings,
+                    extra=None, tz=None):
+        """Bangun dari array kolom yang sudah jadi (mis. dari snapshot biner).
+
+        `arrays` memetakan nama di ARRAYS ke array dengan panjang sama; slot
+        0..n-1 menjadi urutan sisip. Indeks id -> slot baru dibangun saat
+        pertama kali dibutuhkan. Bila `tz` bukan zona waktu saat ini, kunci
+        tanggal dihitung ulang.
+        """
+        new = cls.__new__(cls)
+        for name in ARRAYS:
+            setattr(new, name, arrays[name])
+        new.tz = tz
+        new.tipe_names = tipe_names
+        new.kategori_names = kategori_names
+        new.keterangan_strings = keterangan_strings
+        new.extra = dict(extra or {})
+        new._by_id = None
+        new.order = array("q", range(len(new.ids)))
+        new._free = []
+        new.refresh_date_keys()
+        return new
+
+    # -------------------------- seperti list --------------------------
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RowView(self, rid) for rid in self.order[index]]
+        return RowView(self, self.order[index])
+
+    def __iter__(self):
+        for rid in self.order:
+            yield RowView(self, rid)
+
+    def __delitem__(self, index):
+        rid = self.order[index]
+        del self.order[index]
+        self.release(rid)
+
+    def append(self, t):
+        row = self.new_row(t)
+        self.order.append(row.rid)
+        return row
+
+    def extend(self, rows):
+        """Tambahkan banyak baris di akhir; mengembalikan daftar rid-nya.
+
+        Kolom diisi per kolom sekaligus, bukan per field seperti append.
+        Baris dengan field tambahan atau saat ada slot bebas lewat append biasa.
+        """
+        rows = list(rows)
+        if self._free or not all(_WAJIB <= t.keys() <= _KOLOM for t in rows):
+            return [self.append(t).rid for t in rows]
+
+        start = len(self.timestamp)
+        self.ids.extend(t.get("id", 0) for t in rows)
+        self.timestamp.extend(t["timestamp"] for t in rows)
+        self.jumlah.extend(t["jumlah"] for t in rows)
+        self.tipe.extend(self.tipe_names.id_of(t["tipe"]) for t in rows)
+        self.kategori.extend(self.kategori_names.id_of(t["kategori"]) for t in rows)
+        self.keterangan.extend(
+            self.keterangan_strings.id_of(t["keterangan"]) for t in rows
+        )
+
+        keys = [date_keys(t["timestamp"]) for t in rows]
+        self.hari.extend(k[0] for k in keys)
+        self.bulan.extend(k[1] for k in keys)
+        self.pekan.extend(k[2] for k in keys)
+        self.minggu_ke.extend(k[3] for k in keys)
+
+        rids = range(start, start + len(rows))
+        by_id = self._index()
+        for rid in rids:
+            if self.ids[rid]:
+                by_id[self.ids[rid]] = rid
+        self.order.extend(rids)
+        return list(rids)
+
+    def to_dicts(self):
+        """List dict transaksi (untuk ditulis ke JSON), dibangun per kolom."""
+        return [self._as_dict(rid) for rid in self.order]
+
+    def json_rows(self):
+        """Teks JSON tiap baris dalam urutan sisip, sama dengan json.dumps(to_dicts()[i]).
+
+        String ter-intern cukup di-encode sekali per string unik dan baris
+        ditulis lewat satu format string, tanpa membuat dict per baris.
+        """
+        dumps = json.dumps
+        tipe_json = [dumps(s) for s in self.tipe_names.strings]
+        kategori_json = [dumps(s) for s in self.kategori_names.strings]
+        keterangan_json = [dumps(s) for s in self.keterangan_strings.strings]
+        fmt = (
+            '{"id": %d, "tipe": %s, "jumlah": %s, "kategori": %s, '
+            '"keterangan": %s, "waktu": "%02d:%02d:%02d", "timestamp": %r}'
+        )
+        localtime = time.localtime
+
+        for rid in self.order:
+            if rid in self.extra:
+                yield dumps(self._as_dict(rid))
+                continue
+            ts = self.timestamp[rid]
+            jumlah = self.jumlah[rid]
+            h, m, s = localtime(ts)[3:6]
+            yield fmt % (
+                self.ids[rid],
+                tipe_json[self.tipe[rid]],
+                "%d" % jumlah if jumlah.is_integer() else dumps(jumlah),
+                kategori_json[self.kategori[rid]],
+                keterangan_json[self.keterangan[rid]],
+                h, m, s,
+                ts,
+            )
+
+    def _as_dict(self, rid):
+        ts = self.timestamp[rid]
+        jumlah = self.jumlah[rid]
+        t = {
+            "id": self.ids[rid],
+            "tipe": self.tipe_names[self.tipe[rid]],
+            "jumlah": int(jumlah) if jumlah.is_integer() else jumlah,
+            "kategori": self.kategori_names[self.kategori[rid]],
+            "keterangan": self.keterangan_strings[self.keterangan[rid]],
+            "waktu": "%02d:%02d:%02d" % time.localtime(ts)[3:6],
+            "timestamp": ts,
+        }
+        if rid in self.extra:
+            t.update(self.extra[rid])
+        return t
+
+    def copy(self, by_id=True):
+        """Salinan lepas, misalnya untuk diserialisasi di thread lain.
+
+        Array kolom disalin (memcpy), string di StringTable dipakai bersama.
+        Dengan by_id=False indeks id -> slot tidak ikut disalin; find() pada
+        salinan membangunnya ulang bila memang dipakai.
+        """
+        new = ColumnarTransactions.__new__(ColumnarTransactions)
+        new.__dict__.update(self.__dict__)
+        for name in ARRAYS + ("order",):
+            setattr(new, name, getattr(self, name)[:])
+        new.tipe_names = self.tipe_names.copy()
+        new.kategori_names = self.kategori_names.copy()
+        new.keterangan_strings = self.keterangan_strings.copy()
+        new.extra = {rid: dict(v) for rid, v in self.extra.items()}
+        new._by_id = None if self._by_id is None or not by_id else dict(self._by_id)
+        new._free = list(self._free)
+        return new
+
+    # ---------------------------- per slot ----------------------------
+    def row(self, rid):
+        return RowView(self, rid)
+
+    def find(self, trans_id):
+        """RowView untuk id transaksi, atau None (O(1) lewat indeks hash)."""
+        rid = self._index().get(trans_id)
+        return None if rid is None else RowView(self, rid)
+
+    def _index(self):
+        """Indeks id transaksi -> rid, dibangun sekali saat pertama dipakai."""
+        if self._by_id is None:
+            ids = self.ids
+            self._by_id = {ids[rid]: rid for rid in self.order if ids[rid]}
+        return self._by_id
+
+    def index_of(self, row):
+        """Posisi `row` dalam urutan sisip."""
+        return self.order.index(row.rid)
+
+    def new_row(self, t):
+        """Simpan `t` di slot baru tanpa memasukkannya ke urutan."""
+        if self._free:
+            rid = self._free.pop()
+            self.ids[rid] = 0
+        else:
+            rid = len(self.timestamp)
+            self.ids.append(0)
+            self.timestamp.append(0.0)
+            self.jumlah.append(0.0)
+            self.tipe.append(0)
+            self.kategori.append(0)
+            self.keterangan.append(0)
+            self.hari.append(0)
+            self.bulan.append(0)
+            self.pekan.append(0)
+            self.minggu_ke.append(0)
+
+        for key, value in t.items():
+            self.set(rid, key, value)
+        return RowView(self, rid)
+
+    def release(self, rid):
+        """Kembalikan slot ke daftar bebas.
+
+        Isi kolom tidak dihapus, jadi RowView baris ini masih bisa dibaca
+        sampai slotnya dipakai append berikutnya (mis. untuk mengurangi
+        agregat setelah baris dihapus).
+        """
+        self.extra.pop(rid, None)
+        by_id = self._index()
+        if by_id.get(self.ids[rid]) == rid:
+            del by_id[self.ids[rid]]
+        self._free.append(rid)
+
+    def set_order(self, rids):
+        self.order = array("q", rids)
+
+    def set(self, rid, key, value):
+        if key == "id":
+            by_id = self._index()
+            if by_id.get(self.ids[rid]) == rid:
+                del by_id[self.ids[rid]]
+            self.ids[rid] = value
+            if value:
+                by_id[value] = rid
+        elif key == "timestamp":
+            self.timestamp[rid] = value
+            self._set_date_keys(rid)
+        elif key == "jumlah":
+            self.jumlah[rid] = value
+        elif key == "tipe":
+            self.tipe[rid] = self.tipe_names.id_of(value)
+        elif key == "kategori":
+            self.kategori[rid] = self.kategori_names.id_of(value)
+        elif key == "keterangan":
+            self.keterangan[rid] = self.keterangan_strings.id_of(value)
+        elif key == "waktu":
+            pass  # diturunkan dari timestamp
+        else:
+            self.extra.setdefault(rid, {})[key] = value
+
+    def get(self, rid, key):
+        if key == "id":
+            return self.ids[rid]
+        if key == "timestamp":
+            return self.timestamp[rid]
+        if key == "jumlah":
+            jumlah = self.jumlah[rid]
+            return int(jumlah) if jumlah.is_integer() else jumlah
+        if key == "tipe":
+            return self.tipe_names[self.tipe[rid]]
+        if key == "kategori":
+            return self.kategori_names[self.kategori[rid]]
+        if key == "keterangan":
+            return self.keterangan_strings[self.keterangan[rid]]
+        if key == "waktu":
+            return datetime.fromtimestamp(self.timestamp[rid]).strftime("%H:%M:%S")
+        return self.extra[rid][key]
+
+    # -------------------------- kunci tanggal --------------------------
+    def date_keys(self, rid):
+        """(hari, bulan, pekan, minggu_ke) yang sudah tersimpan untuk slot `rid`."""
+        return self.hari[rid], self.bulan[rid], self.pekan[rid], self.minggu_ke[rid]
+
+    def _set_date_keys(self, rid):
+        (self.hari[rid], self.bulan[rid],
+         self.pekan[rid], self.minggu_ke[rid]) = date_keys(self.timestamp[rid])
+
+    def refresh_date_keys(self):
+        """Hitung ulang kunci tanggal bila zona waktu berubah; True bila dihitung ulang."""
+        tz = tz_signature()
+        if tz == self.tz:
+            return False
+        self.tz = tz
+        for rid in range(len(self.timestamp)):
+            self._set_date_keys(rid)
+        return True
+
+
+class RowView(Mapping):
+    """Satu baris ColumnarTransactions yang bisa dipakai seperti dict transaksi."""
+
+    __slots__ = ("cols", "rid")
+
+    def __init__(self, cols, rid):
+        self.cols = cols
+        self.rid = rid
+
+    def __getitem__(self, key):
+        try:
+            return self.cols.get(self.rid, key)
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        yield from FIELDS
+        yield from self.cols.extra.get(self.rid, ())
+
+    def __len__(self):
+        return len(FIELDS) + len(self.cols.extra.get(self.rid, ()))
+
+    def __setitem__(self, key, value):
+        self.cols.set(self.rid, key, value)
+
+    def update(self, fields):
+        for key, value in fields.items():
+            self.cols.set(self.rid, key, value)
+
+    def __eq__(self, other):
+        if isinstance(other, RowView):
+            return other.cols is self.cols and other.rid == self.rid
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash((id(self.cols), self.rid))
+
+    def __repr__(self):
+        return f"RowView({dict(self)!r})"
@@ -1,34 +1,1599 @@
 # data_store.py
+import bisect
+import contextlib
+import hashlib
+import itertools
 import json
 import os
+import threading
+import time
+from array import array
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import aggregation
+import binary_snapshot
+import query
+import rollups
+import search
+from file_lock import FileLock
+from instrumentation import timed
+from columnar import ColumnarTransactions, RowView
+from datekeys import date_keys, day_label, day_of, month_of
 
 FILE_JSON = "data_cash.json"
-refresh_lock = False
+FILE_BIN = "data_cash.bin"
+FILE_JOURNAL = "data_cash.journal"
+FILE_ROLLUPS = "data_cash.rollups.json"
+FILE_LOCK = "data_cash.lock"
+
+# format snapshot backend JSON: "json" (data_cash.json, bisa diedit manual)
+# atau "bin" (data_cash.bin, lihat binary_snapshot.py)
+SNAPSHOT_FORMAT = os.environ.get("CASH_TRACKER_SNAPSHOT", "json")
+
+# jumlah baris journal minimal sebelum dipadatkan kembali ke snapshot; untuk
+# data besar journal baru dipadatkan setelah sepanjang isi snapshot, jadi
+# impor massal tidak menulis ulang snapshot berkali-kali
+COMPACT_THRESHOLD = 500
+
+# setiap tulisan milik proses ini menaikkan write_generation dan mencatat
+# identitas file (mtime_ns, size, inode) hasilnya, supaya event watchdog
+# dari tulisan sendiri bisa dikenali dan diabaikan
+write_generation = 0
+_own_writes = {}  # path -> (generation, signature)
+_own_lock = threading.Lock()
+
+_journal_lock = threading.RLock()  # reentran: read_store() lalu get_store()
+_compact_thread = None
+
+# kunci penulis antar-proses (beberapa instance aplikasi pada data yang
+# sama); isinya state versi data di disk, lihat _disk_state
+_file_lock = FileLock(FILE_LOCK)
+
+# state di memori: data hasil load_json + TransactionStore di atasnya
+_data = None
+_store = None
+_store_copy = None  # (versi store, salinan) terakhir dari read_store()
+
+# cache load_json, dikunci dengan identitas file snapshot & journal
+VERIFY_HASH = False  # True: cocokkan juga hash isi file (lebih teliti, lebih lambat)
+cache_stats = {"hits": 0, "misses": 0}
+_cache = {"key": None, "data": None, "journal_offset": 0}
+_cache_lock = threading.Lock()
+
+_last_id = 0
+_id_lock = threading.Lock()
+
 
+# -------------------------------------------------------------
+#   API PUBLIK (DITERUSKAN KE BACKEND AKTIF)
+# -------------------------------------------------------------
+_backend = None
 
+
+def use_backend(backend):
+    """Pilih backend penyimpanan: "json", "shard", "sqlite", atau objek StorageBackend."""
+    global _backend
+    if backend == "json":
+        backend = JsonBackend()
+    elif backend == "shard":
+        from shards import ShardBackend
+        backend = ShardBackend()
+    elif backend == "sqlite":
+        from sqlite_backend import SqliteBackend
+        backend = SqliteBackend()
+    _backend = backend
+    return backend
+
+
+def get_backend():
+    if _backend is None:
+        use_backend(os.environ.get("CASH_TRACKER_BACKEND", "json"))
+    return _backend
+
+
+@timed("store.init_json")
 def init_json():
-    """Buat file JSON awal jika belum ada."""
-    if not os.path.exists(FILE_JSON):
-        data = {
-            "transaksi": [],
-            "kategori": []
-        }
-        with open(FILE_JSON, "w") as f:
-            json.dump(data, f, indent=4)
+    """Siapkan penyimpanan (file JSON / database) jika belum ada."""
+    get_backend().init()
 
 
+@timed("store.load_json")
 def load_json():
-    """Membaca seluruh data dari JSON."""
-    with open(FILE_JSON, "r") as f:
-        return json.load(f)
+    """Seluruh data ledger: {"transaksi": [...], "kategori": [...]}."""
+    return get_backend().load()
 
 
+@timed("store.save_json")
 def save_json(data):
-    """Menyimpan data ke JSON dengan lock agar watchdog tidak double-refresh."""
-    global refresh_lock
-    refresh_lock = True
+    """Tulis ulang seluruh data ledger."""
+    get_backend().save(data)
+
+
+def new_id():
+    """Id transaksi baru: waktu dalam mikrodetik, selalu naik di proses ini."""
+    global _last_id
+    with _id_lock:
+        _last_id = max(_last_id + 1, time.time_ns() // 1000)
+        return _last_id
+
+
+def _with_id(trans):
+    """`trans`, atau salinannya yang diberi id baru bila belum punya."""
+    if trans.get("id"):
+        return trans
+    return dict(trans, id=new_id())
+
+
+@timed("store.add_transaction")
+def add_transaction(trans):
+    """Tambah satu transaksi; mengembalikan id-nya."""
+    trans = _with_id(trans)
+    get_backend().insert(trans)
+    return trans["id"]
+
+
+@timed("store.add_transactions")
+def add_transactions(rows):
+    """Tambah banyak transaksi sekaligus (satu tulisan per batch); mengembalikan id-nya."""
+    rows = [_with_id(t) for t in rows]
+    if rows:
+        get_backend().insert_many(rows)
+    return [t["id"] for t in rows]
+
+
+@timed("store.get_transaction")
+def get_transaction(trans_id):
+    """Transaksi (dict salinan) dengan id `trans_id`, atau None."""
+    return get_backend().get(trans_id)
+
+
+@timed("store.edit_transaction")
+def edit_transaction(trans_id, fields, expected=None):
+    """Ubah field transaksi dengan id `trans_id`.
+
+    `expected`: isi transaksi yang dilihat pemanggil sebelum mengedit (mis.
+    saat form edit dibuka). Dengan itu edit digabung dengan perubahan dari
+    instance lain, lihat _merge_fields; ConflictError bila bertabrakan.
+    """
+    get_backend().update(trans_id, fields, expected)
+
+
+@timed("store.delete_transaction")
+def delete_transaction(trans_id):
+    """Hapus transaksi dengan id `trans_id`."""
+    get_backend().delete(trans_id)
+
+
+@timed("store.get_store")
+def get_store():
+    """Store query (TransactionStore atau setaranya) untuk data saat ini."""
+    return get_backend().store()
+
+
+def read_store():
+    """Store untuk dibaca dari thread lain (mis. worker refresh).
+
+    Kunci penulis hanya ditahan selama store diambil, bukan selama
+    pembacaannya: tambah/edit/hapus di thread Tk tidak menunggu komputasi
+    refresh. Backend JSON mengembalikan salinan lepas TransactionStore
+    (lihat TransactionStore.copy) yang dipakai ulang selama isi store
+    tidak berubah; store backend shard & SQLite mengunci sendiri per
+    operasi dan dikembalikan apa adanya.
+    """
+    with _journal_lock:
+        return get_backend().read_store()
+
+
+@timed("store.reload")
+def reload():
+    """Buang state di memori supaya get_store() membaca ulang dari disk."""
+    get_backend().reload()
+
+
+def drop_cache():
+    """Seperti reload(), ditambah membuang cache parse load_json (mis. untuk benchmark)."""
+    with _cache_lock:
+        _cache["key"] = _cache["data"] = None
+    reload()
+
+
+@timed("store.reload_changes")
+def reload_changes():
+    """Muat perubahan dari luar; mengembalikan ReloadDiff."""
+    return get_backend().reload_changes()
+
+
+def watched_files():
+    """Nama file yang perlu dipantau watchdog untuk backend aktif."""
+    return get_backend().watched_files()
+
+
+def files_signature():
+    """Identitas (mtime_ns, size, inode) file backend aktif; berubah bila datanya ditulis."""
+    return tuple(_signature(path) for path in watched_files())
+
+
+class ConflictError(Exception):
+    """Perubahan bertabrakan dengan tulisan instance lain pada data yang sama."""
+
+
+def _merge_fields(current, fields, expected):
+    """Field dari `fields` yang perlu ditulis, bila pemanggil melihat `expected`.
+
+    Field yang tidak diubah pemanggil (sama dengan `expected`) dibuang,
+    supaya perubahan instance lain pada field itu tetap ada. Field yang
+    diubah pemanggil padahal sudah diubah di tempat lain ke nilai lain
+    membuat ConflictError, begitu juga transaksi yang sudah dihapus.
+    """
+    if current is None:
+        raise ConflictError("Transaksi sudah dihapus dari instance lain")
+    tulis = {}
+    for key, value in fields.items():
+        if key in expected:
+            if value == expected[key]:
+                continue
+            if current[key] != expected[key] and current[key] != value:
+                raise ConflictError(
+                    f"{key} transaksi ini sudah diubah dari instance lain "
+                    f"(sekarang {current[key]!r})"
+                )
+        tulis[key] = value
+    return tulis
+
+
+class StorageBackend:
+    """Antarmuka penyimpanan ledger.
+
+    Selain load/save seluruh dokumen, backend menyediakan query rentang
+    waktu, get/insert/update/delete per baris lewat id transaksi, dan
+    agregasi SUM per tipe yang bisa dikelompokkan per "hari", "bulan",
+    "minggu_ke" atau "kategori".
+    """
+
+    def init(self):
+        raise NotImplementedError
+
+    def load(self):
+        raise NotImplementedError
+
+    def save(self, data):
+        raise NotImplementedError
+
+    def range(self, start_ts, end_ts):
+        """Transaksi (dict) dengan start_ts <= timestamp < end_ts."""
+        raise NotImplementedError
+
+    def get(self, trans_id):
+        raise NotImplementedError
+
+    def insert(self, trans):
+        raise NotImplementedError
+
+    def insert_many(self, rows):
+        for trans in rows:
+            self.insert(trans)
+
+    def update(self, trans_id, fields, expected=None):
+        raise NotImplementedError
+
+    def delete(self, trans_id):
+        raise NotImplementedError
+
+    def aggregate(self, start_ts=None, end_ts=None, by=None):
+        """{grup: {tipe: total}} untuk rentang waktu; grup None bila by=None.
+
+        Grup waktu memakai kunci integer dari datekeys (hari = ordinal,
+        bulan = tahun*12+bulan-1, minggu_ke = 1..5), kategori memakai
+        namanya. Urutan grup mengikuti kemunculan pertamanya menurut waktu.
+        """
+        raise NotImplementedError
+
+    def store(self):
+        raise NotImplementedError
+
+    def read_store(self):
+        """Store yang aman dibaca di thread lain tanpa kunci (lihat read_store)."""
+        return self.store()
+
+    def reload(self):
+        raise NotImplementedError
+
+    def reload_changes(self):
+        raise NotImplementedError
+
+    def watched_files(self):
+        raise NotImplementedError
+
+
+class JsonBackend(StorageBackend):
+    """Snapshot data_cash.json (atau data_cash.bin) + journal append-only data_cash.journal."""
+
+    def init(self):
+        _init_json_file()
+
+    def load(self):
+        return _load_json_file()
+
+    def save(self, data):
+        _save_json_file(data)
+
+    def range(self, start_ts, end_ts):
+        store = self.store()
+        return [
+            dict(t) for t in store.range(
+                datetime.fromtimestamp(start_ts), datetime.fromtimestamp(end_ts)
+            )
+        ]
+
+    def get(self, trans_id):
+        # disalin di bawah kunci: reload di worker bisa mengubah barisnya
+        with _journal_lock:
+            t = self.store().find(trans_id)
+            return None if t is None else dict(t)
+
+    def insert(self, trans):
+        _append_record("add", data=_with_id(trans))
+
+    def insert_many(self, rows):
+        # satu record journal untuk seluruh batch
+        _append_record("add_many", data=[_with_id(t) for t in rows])
+
+    def update(self, trans_id, fields, expected=None):
+        if expected is None:
+            _append_record("edit", id=trans_id, data=fields)
+            return
+        with _writing() as state:
+            _catch_up(state["versi"])
+            fields = _merge_fields(self.store().find(trans_id), fields, expected)
+            if fields:
+                _append_record("edit", id=trans_id, data=fields)
+
+    def delete(self, trans_id):
+        _append_record("delete", id=trans_id)
+
+    def aggregate(self, start_ts=None, end_ts=None, by=None):
+        return self.store().sum_by(start_ts, end_ts, by)
+
+    def store(self):
+        return _json_store()
+
+    def read_store(self):
+        return _json_store_copy()
+
+    def reload(self):
+        _json_reload()
+
+    def reload_changes(self):
+        return _json_reload_changes()
+
+    def watched_files(self):
+        return (snapshot_file(), FILE_JOURNAL)
+
+
+# -------------------------------------------------------------
+#   BACKEND JSON: SNAPSHOT
+# -------------------------------------------------------------
+def snapshot_file():
+    """Path snapshot sesuai SNAPSHOT_FORMAT."""
+    return FILE_BIN if SNAPSHOT_FORMAT == "bin" else FILE_JSON
+
+
+def _read_snapshot(path):
+    """Isi snapshot (JSON atau biner) tanpa journal, transaksi dalam bentuk kolom."""
+    if binary_snapshot.is_snapshot(path):
+        return binary_snapshot.load(path)
+    with open(path, "r") as f:
+        data = json.load(f)
+    # simpan dalam bentuk kolom; dict hasil parse dibuang setelah ini
+    data["transaksi"] = ColumnarTransactions(data["transaksi"])
+    return data
+
+
+def _snapshot_seq(path):
+    """journal_seq snapshot; header snapshot biner cukup dibaca sebagian."""
+    if binary_snapshot.is_snapshot(path):
+        return binary_snapshot.read_header(path)[0]["data"].get("journal_seq", 0)
+    with open(path, "r") as f:
+        return json.load(f).get("journal_seq", 0)
+
+
+def _init_json_file():
+    """Buat file snapshot awal jika belum ada.
+
+    File lama yang transaksinya belum punya id ditulis ulang sekali dengan
+    id yang diturunkan dari isinya (lihat _backfill_ids).
+    Snapshot dalam format lain (SNAPSHOT_FORMAT diganti) ditulis ulang ke
+    format saat ini; journal tetap berlaku karena journal_seq ikut disalin.
+    Data yang masih berupa folder shard per bulan (lihat shards.py)
+    digabung kembali ke file ini.
+    """
+    path = snapshot_file()
+    if not os.path.exists(path):
+        # sekali saja per data: kunci dipegang sampai file baru terpasang
+        with _writing():
+            if not os.path.exists(path):  # instance lain bisa lebih dulu
+                _create_snapshot(path)
+        return
+
+    data = _load_json_file()
+    if data.get("id_backfilled"):
+        del data["id_backfilled"]
+        try:
+            _save_json_file(data)
+        except ConflictError:
+            pass  # instance lain lebih dulu menulis ulang; id dibaca dari sana
+
+
+def _create_snapshot(path):
+    lama = FILE_JSON if path == FILE_BIN else FILE_BIN
+    if os.path.exists(lama):
+        _install(_write_snapshot(_read_snapshot(lama)))
+        os.replace(lama, lama + ".migrated")
+        return
+
+    data = {
+        "transaksi": [],
+        "kategori": []
+    }
+    if path == FILE_BIN:
+        _install(_write_snapshot(data))
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+
+    import shards
+    if shards.exists():
+        shards.export_json()
+
+
+def _load_json_file():
+    """Membaca snapshot JSON lalu memutar ulang journal di atasnya.
+
+    Hasil parse di-cache selama identitas kedua file tidak berubah, jadi
+    pemanggilan berulang tanpa perubahan di disk tidak mem-parse ulang.
+    Objek yang dikembalikan dipakai bersama: jangan diubah langsung,
+    gunakan add/edit/delete_transaction.
+    """
+    with _cache_lock:
+        key = _cache_key()
+        if key == _cache["key"]:
+            cache_stats["hits"] += 1
+            return _cache["data"]
+
+        cache_stats["misses"] += 1
+        while True:
+            # dibaca tanpa kunci: bila instance lain memasang snapshot baru
+            # di antara baca snapshot & journal, baca ulang keduanya
+            key = _cache_key()
+            data = _read_snapshot(snapshot_file())
+            records, offset = _read_journal_tail(0)
+            if _signature(snapshot_file()) == key[0]:
+                break
+
+        if _replay(data, records):
+            data["id_backfilled"] = True
+
+        _cache["key"] = key
+        _cache["data"] = data
+        _cache["journal_offset"] = offset
+        return data
+
+
+def read_ledger(path, journal=None):
+    """Snapshot `path` + journal-nya (default: nama yang sama, akhiran .journal).
+
+    Untuk membaca data di lokasi lain (mis. sumber migrasi) tanpa mengubah
+    FILE_JSON/FILE_JOURNAL maupun cache & state backend aktif.
+    """
+    if journal is None:
+        journal = os.path.splitext(path)[0] + ".journal"
+    data = _read_snapshot(path)
+    _replay(data, _read_journal_tail(0, journal)[0])
+    return data
+
+
+def _replay(data, records):
+    """Putar ulang `records` di atas snapshot `data`; True bila ada id yang diisi."""
+    # id diberikan sebelum journal diputar: record edit/delete menuju id ini
+    backfilled = _backfill_ids(data["transaksi"])
+    base_seq = data.get("journal_seq", 0)
+    for rec in records:
+        if rec["seq"] > base_seq:
+            _apply_record(data, rec)
+            data["journal_seq"] = rec["seq"]
+    return _backfill_ids(data["transaksi"]) or backfilled
+
+
+def _backfill_ids(cols):
+    """Beri id ke baris (dari file lama) yang belum punya; True bila ada.
+
+    Id diturunkan dari isi baris (plus urutan kemunculannya bila ada baris
+    kembar), bukan dari jam: proses lain, reload dari luar, atau restart
+    sebelum snapshot ditulis ulang menghasilkan id yang sama, jadi record
+    edit/delete journal yang memakai id ini tetap menemukan barisnya.
+    """
+    kemunculan = {}
+    ada = False
+    for row in cols:
+        if row["id"]:
+            continue
+        isi = json.dumps([row[k] for k in _CONTENT_FIELDS])
+        n = kemunculan[isi] = kemunculan.get(isi, 0) + 1
+        digest = hashlib.blake2b(f"{isi}#{n}".encode(), digest_size=8).digest()
+        # positif & muat di array("q") / INTEGER SQLite
+        row["id"] = (int.from_bytes(digest, "big") >> 1) or 1
+        ada = True
+    return ada
+
+
+def _cache_key():
+    path = snapshot_file()
+    key = (_signature(path), _signature(FILE_JOURNAL))
+    if VERIFY_HASH:
+        key += tuple(_content_hash(p) for p in (path, FILE_JOURNAL))
+    return key
+
+
+def _content_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _save_json_file(data):
+    """Tulis ulang seluruh data ke snapshot sebagai versi baru (compare-and-swap).
+
+    data["journal_seq"] adalah versi yang dibaca pemanggil. Bila sementara
+    itu instance lain menambah journal, record mereka diterapkan dulu ke
+    `data` lalu snapshot ditulis lagi; tanpa journal_seq (mis. impor) isi
+    disk saat ini ditimpa. Snapshot ditulis di luar kunci penulis; kunci
+    hanya dipegang untuk merge dan memasang file.
+    """
+    base = data.get("journal_seq")
+    while True:
+        with _writing() as state:
+            if base is not None and state["versi"] > base:
+                _merge_journal(data, base)
+            base = state["versi"]
+
+        data["journal_seq"] = base + 1
+        files = _write_snapshot(data)
+        with _writing() as state:
+            if state["versi"] == base:
+                _install(files, state, base + 1, state["baris"])
+                return
+        _discard(files)
+
+
+# -------------------------------------------------------------
+#   BACKEND JSON: JOURNAL (APPEND-ONLY)
+# -------------------------------------------------------------
+@timed("store.compact")
+def compact():
+    """Lipat journal ke snapshot.
+
+    State dibaca di bawah kunci penulis, snapshot ditulis tanpa kunci
+    supaya penulis lain (thread maupun instance lain) tetap bisa append,
+    lalu snapshot dipasang dan journal dipotong hanya sampai seq yang
+    sudah masuk snapshot. Bila instance lain sudah memasang snapshot yang
+    lebih baru selama itu, hasilnya dibuang.
+    """
+    with _writing() as state:
+        _catch_up(state["versi"])
+        # salin daftar supaya append/hapus berikutnya tidak ikut terserialisasi
+        data = dict(_load_json_file())
+        data["transaksi"] = data["transaksi"].copy()
+        data["kategori"] = list(data["kategori"])
+        seq = data.get("journal_seq", 0)
+        baris = state["baris"]  # nilai pada versi seq (memori sudah di-catch-up)
+
+    files = _write_snapshot(data)
+
+    with _writing() as state:
+        if state["snapshot_seq"] >= seq:
+            _discard(files)
+            return
+        with _cache_lock:
+            cache_fresh = _is_cache_fresh()
+        _install(files, state, seq, baris)
+
+        # snapshot + sisa journal == state di memori (record yang masuk
+        # selama compaction sudah diterapkan oleh _append_record)
+        if cache_fresh:
+            with _cache_lock:
+                _cache["key"] = _cache_key()
+                _cache["journal_offset"] = _file_size(FILE_JOURNAL)
+
+
+def _append_record(op, **fields):
+    with _writing() as state:
+        # compare-and-swap: tulisan instance lain yang belum dimuat
+        # diterapkan dulu, jadi record ini tepat di atas versi disk
+        _catch_up(state["versi"])
+        seq = state["versi"] + 1
+        rec = {"seq": seq, "op": op}
+        rec.update(fields)
+
+        # data di memori adalah data cache: bila cache masih segar, cukup
+        # geser kuncinya setelah record diterapkan, tanpa parse ulang
+        with _cache_lock:
+            cache_fresh = _is_cache_fresh()
+
+        with open(FILE_JOURNAL, "a") as f:
+            f.write(json.dumps(rec) + "\n")
+        _remember_write(FILE_JOURNAL)
+        state["versi"] = seq
+        state["baris"] += _record_rows(rec)
+        _save_state(state)
+
+        journal_rows = state["baris"] - state["baris_snapshot"]
+        snapshot_rows = len(_data["transaksi"]) - journal_rows if _data else 0
+        need_compact = journal_rows >= max(COMPACT_THRESHOLD, snapshot_rows)
+        _apply_memory(rec)
+
+        if cache_fresh:
+            with _cache_lock:
+                _cache["key"] = _cache_key()
+                _cache["journal_offset"] = _file_size(FILE_JOURNAL)
+
+    if need_compact:
+        _start_compaction()
+
+
+def _record_rows(rec):
+    return len(rec["data"]) if rec["op"] == "add_many" else 1
+
+
+def wait_for_compaction():
+    """Tunggu compaction di background selesai (mis. sebelum proses CLI keluar)."""
+    if _compact_thread is not None:
+        _compact_thread.join()
+
+
+def _start_compaction():
+    global _compact_thread
+    if _compact_thread is not None and _compact_thread.is_alive():
+        return
+    _compact_thread = threading.Thread(target=compact, daemon=True)
+    _compact_thread.start()
+
+
+def _target(cols, rec):
+    """Baris yang dituju record edit/delete (journal lama memakai "index")."""
+    if "id" in rec:
+        return cols.find(rec["id"])
+    return cols[rec["index"]]
+
+
+def _apply_record(data, rec):
+    op = rec["op"]
+    if op in ("add", "add_many"):
+        rows = rec["data"] if op == "add_many" else [rec["data"]]
+        data["transaksi"].extend(rows)
+        kategori = set(data["kategori"])
+        for trans in rows:
+            if trans["kategori"] and trans["kategori"] not in kategori:
+                kategori.add(trans["kategori"])
+                data["kategori"].append(trans["kategori"])
+        return
+
+    row = _target(data["transaksi"], rec)
+    if row is None:
+        return  # baris sudah dihapus proses lain
+    if op == "edit":
+        row.update(rec["data"])
+    elif op == "delete":
+        del data["transaksi"][data["transaksi"].index_of(row)]
+
+
+def _apply_memory(rec):
+    """Terapkan record journal ke state di memori (kalau sudah dimuat)."""
+    if _store is None:
+        return
+
+    _data["journal_seq"] = rec["seq"]
+    op = rec["op"]
+    if op == "add":
+        _apply_record(_data, rec)
+        _store.add(_data["transaksi"][-1])
+        return
+    if op == "add_many":
+        n = len(_data["transaksi"])
+        _apply_record(_data, rec)
+        _store.add_many(_data["transaksi"][n:])
+        return
+
+    cols = _data["transaksi"]
+    row = _target(cols, rec)
+    if row is None:
+        return
+    if op == "edit":
+        _store.update(row, rec["data"])
+    elif op == "delete":
+        _store.remove(row)
+        del cols[cols.index_of(row)]
+
+
+def _read_journal():
+    """Baca semua record journal; baris terakhir yang terpotong diabaikan."""
+    return _read_journal_tail(0)[0]
+
+
+def _read_journal_tail(offset, path=None):
+    """Baca record journal (default FILE_JOURNAL) mulai byte `offset`.
+
+    Mengembalikan (records, offset_akhir); offset_akhir menunjuk ke akhir
+    baris utuh terakhir, jadi baris yang masih ditulis dibaca lain kali.
+    """
+    path = FILE_JOURNAL if path is None else path
+    if not os.path.exists(path):
+        return [], 0
+
+    records = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            offset += len(line)
+    return records, offset
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _is_cache_fresh():
+    """Data di memori == data cache == isi disk saat ini (panggil di bawah _cache_lock)."""
+    return (
+        _data is not None
+        and _cache["data"] is _data
+        and _cache["key"] == _cache_key()
+    )
+
+
+def _write_snapshot(data):
+    """Tulis snapshot & rollup `data` ke file sementara milik thread ini.
+
+    Mengembalikan [(file sementara, tujuan)] untuk _install / _discard;
+    nama file sementara unik per proses & thread, jadi penulisan panjang
+    ini tidak perlu kunci.
+    """
+    cols = data["transaksi"]
+    if not isinstance(cols, ColumnarTransactions):
+        cols = ColumnarTransactions(cols)
+
+    path = snapshot_file()
+    suffix = f".{os.getpid()}-{threading.get_ident()}.tmp"
+    tmp = path + suffix
+    if path == FILE_BIN:
+        with open(tmp, "wb") as f:
+            binary_snapshot.dump(dict(data, transaksi=cols), f)
+    else:
+        with open(tmp, "w") as f:
+            _dump_snapshot(data, f)
+
+    # rollup ikut ditulis untuk state yang sama (lihat python -m rollups)
+    rollup_tmp = FILE_ROLLUPS + suffix
+    rollups.save(rollups.from_columns(cols), data.get("journal_seq", 0), rollup_tmp)
+    return [(tmp, path), (rollup_tmp, FILE_ROLLUPS)]
+
+
+def _install(files, state=None, seq=None, baris=0):
+    """Pasang hasil _write_snapshot (panggil di bawah _writing).
+
+    Dengan `state`: journal dipotong sampai `seq` (sudah ada di snapshot);
+    `baris` adalah state["baris"] saat data versi `seq` diambil.
+    """
+    for tmp, path in files:
+        os.replace(tmp, path)
+        _remember_write(path)
+    if state is None:
+        return
+    _truncate_journal(seq)
+    state["versi"] = max(state["versi"], seq)
+    state["snapshot_seq"] = seq
+    state["baris_snapshot"] = baris
+    _save_state(state)
+
+
+def _discard(files):
+    for tmp, _ in files:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _dump_snapshot(data, f):
+    """Seperti json.dump(indent=4), tetapi satu transaksi per baris.
+
+    json hanya memakai encoder C bila tanpa indent; dengan menulis per
+    baris file tetap mudah dibaca/diedit manual dan jauh lebih cepat
+    untuk riwayat besar.
+    """
+    transaksi = data["transaksi"]
+    if isinstance(transaksi, ColumnarTransactions):
+        lines = transaksi.json_rows()
+    else:
+        lines = map(json.dumps, transaksi)
+
+    f.write('{\n    "transaksi": [')
+    sep = "\n        "
+    for line in lines:
+        f.write(sep)
+        f.write(line)
+        sep = ",\n        "
+    f.write("\n    ]" if sep != "\n        " else "]")
+
+    for key, value in data.items():
+        if key != "transaksi":
+            f.write(f",\n    {json.dumps(key)}: {json.dumps(value)}")
+    f.write("\n}\n")
+
+
+def _record_seq(line):
+    # record ditulis oleh _append_record dengan "seq" sebagai kunci pertama,
+    # jadi baris besar (add_many) tidak perlu di-parse seluruhnya
+    if line.startswith(b'{"seq": '):
+        end = line.find(b",", 8)
+        if end > 0:
+            return int(line[8:end])
+    return json.loads(line)["seq"]
+
+
+def _truncate_journal(seq):
+    """Buang record dengan seq <= `seq`, simpan sisanya apa adanya."""
+    sisa = []
+    if os.path.exists(FILE_JOURNAL):
+        with open(FILE_JOURNAL, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    if _record_seq(line) > seq:
+                        sisa.append(line)
+                except ValueError:
+                    break
+    if not sisa:
+        if os.path.exists(FILE_JOURNAL):
+            os.remove(FILE_JOURNAL)
+    else:
+        tmp = FILE_JOURNAL + ".tmp"
+        with open(tmp, "wb") as f:
+            f.writelines(sisa)
+        os.replace(tmp, FILE_JOURNAL)
+    _remember_write(FILE_JOURNAL)
+
+
+# -------------------------------------------------------------
+#   BACKEND JSON: KOORDINASI ANTAR-INSTANCE
+# -------------------------------------------------------------
+# Versi data = seq record journal terakhir: naik satu setiap tulisan dan
+# ikut tersimpan di snapshot (journal_seq). Penulis mengambil kunci file,
+# membawa state di memorinya ke versi disk (merge record instance lain),
+# lalu append tepat di atasnya; snapshot ditulis ulang di luar kunci dan
+# hanya dipasang bila versinya masih berlaku.
+@contextlib.contextmanager
+def _writing():
+    """Kunci penulis (thread & antar-proses); menghasilkan _disk_state()."""
+    with _journal_lock, _file_lock:
+        yield _disk_state()
+
+
+def _disk_state():
+    """{"versi", "snapshot_seq", "baris", "baris_snapshot"} data di disk.
+
+    Dipanggil di bawah _writing. baris = jumlah kumulatif transaksi yang
+    ditulis ke journal, baris_snapshot = nilainya saat snapshot diambil;
+    selisihnya banyak transaksi journal yang belum dilipat ke snapshot
+    (tetap tepat walau compaction beberapa instance bersilangan).
+
+    State disimpan di file kunci bersama identitas snapshot & journal saat
+    ditulis; bila tidak cocok lagi (penulis versi lama, proses mati di
+    tengah tulisan, file diedit manual) state dihitung ulang dari disk.
+    """
+    state = _file_lock.read_state()
+    if state is not None and state.get("files") == _files_state():
+        return state
+
+    path = snapshot_file()
+    snapshot_seq = _snapshot_seq(path) if os.path.exists(path) else 0
+    records = [rec for rec in _read_journal() if rec["seq"] > snapshot_seq]
+    return {
+        "versi": records[-1]["seq"] if records else snapshot_seq,
+        "snapshot_seq": snapshot_seq,
+        "baris": sum(_record_rows(rec) for rec in records),
+        "baris_snapshot": 0,
+    }
+
+
+def _files_state():
+    # identitas snapshot & journal dalam bentuk yang sama setelah bolak-balik JSON
+    return [
+        None if sig is None else list(sig)
+        for sig in (_signature(snapshot_file()), _signature(FILE_JOURNAL))
+    ]
+
+
+def _save_state(state):
+    state["files"] = _files_state()
+    _file_lock.write_state(state)
+
+
+def _catch_up(versi):
+    """Bawa state di memori ke versi disk `versi` (tulisan instance lain).
+
+    Versi di memori yang lebih tinggi berarti data di disk diganti dari
+    luar (mis. impor atau pindah backend): dimuat ulang penuh.
+    """
+    if _store is None or _data.get("journal_seq", 0) == versi:
+        return
+    if _reload_tail() is None or _data.get("journal_seq", 0) != versi:
+        _reload_full()
+
+
+def _merge_journal(data, base):
+    """Terapkan record journal setelah versi `base` ke dokumen `data`."""
+    records = [rec for rec in _read_journal() if rec["seq"] > base]
+    if not records or records[0]["seq"] != base + 1:
+        # record sesudah `base` sudah dilipat ke snapshot instance lain
+        raise ConflictError("Data sudah diubah instance lain; muat ulang lalu simpan lagi")
+    if not isinstance(data["transaksi"], ColumnarTransactions):
+        data["transaksi"] = ColumnarTransactions(data["transaksi"])
+    for rec in records:
+        _apply_record(data, rec)
+
+
+# -------------------------------------------------------------
+#   DETEKSI ECHO TULISAN SENDIRI
+# -------------------------------------------------------------
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _remember_write(path):
+    global write_generation
+    with _own_lock:
+        write_generation += 1
+        _own_writes[os.path.abspath(path)] = (write_generation, _signature(path))
+
+
+def is_own_write(path):
+    """True bila isi `path` saat ini persis hasil tulisan terakhir proses ini.
+
+    Dicek saat event akan diproses (bukan saat event datang), jadi tulisan
+    yang masih berjalan tidak salah dianggap perubahan dari luar.
+    """
+    own = _own_writes.get(os.path.abspath(path))
+    return own is not None and own[1] == _signature(path)
+
+
+# -------------------------------------------------------------
+#   BACKEND JSON: STATE DI MEMORI & RELOAD
+# -------------------------------------------------------------
+def _json_store():
+    """TransactionStore untuk data saat ini; dimuat dari disk sekali saja."""
+    global _data, _store
+    if _store is None:
+        with _journal_lock:
+            _data = _load_json_file()
+            _store = TransactionStore(_data["transaksi"])
+    _store.check_timezone()
+    return _store
+
+
+def _json_store_copy():
+    """Salinan _store untuk read_store(); disalin ulang hanya bila isinya berubah.
+
+    Dipanggil di bawah _journal_lock. version() store berbeda setiap kali
+    ada baris ditambah/diubah/dihapus (epoch unik per store), jadi salinan
+    yang versinya sama pasti masih sama isinya.
+    """
+    global _store_copy
+    store = _json_store()
+    versi = store.version()
+    if _store_copy is None or _store_copy[0] != versi:
+        _store_copy = (versi, store.copy())
+    return _store_copy[1]
+
+
+def _json_reload():
+    global _data, _store, _store_copy
+    with _journal_lock:
+        _data = _store = _store_copy = None
+
+
+ReloadDiff = namedtuple("ReloadDiff", ["added", "changed", "removed"])
+
+# field yang dibandingkan untuk menentukan baris "berubah"
+_CONTENT_FIELDS = ("tipe", "jumlah", "kategori", "keterangan", "timestamp")
+
+
+def _json_reload_changes():
+    """Muat perubahan dari luar secara inkremental.
+
+    Bila snapshot tidak berubah dan journal hanya bertambah, cukup ekor
+    journal yang dibaca dan diterapkan. Selain itu file di-parse ulang lalu
+    dibandingkan per transaksi dengan state di memori. Hanya baris yang
+    berbeda yang ditambal ke TransactionStore (dan agregatnya).
+
+    Mengembalikan ReloadDiff berisi baris yang ditambah, diubah, dihapus.
+    """
+    with _journal_lock:
+        if _store is None:
+            # belum pernah dimuat: _json_store() akan membaca penuh
+            return ReloadDiff([], [], [])
+
+        diff = _reload_tail()
+        if diff is None:
+            diff = _reload_full()
+        return diff
+
+
+def _reload_tail():
+    with _cache_lock:
+        key = _cache["key"]
+        if _cache["data"] is not _data or key is None:
+            return None
+        if _signature(snapshot_file()) != key[0]:
+            return None
+
+        journal = _signature(FILE_JOURNAL)
+        offset = _cache["journal_offset"]
+        if journal is None or journal[1] < offset:
+            return None
+        if key[1] is not None and journal[2] != key[1][2]:
+            return None  # journal diganti (mis. dipadatkan), bukan ditambah
+
+        records, offset = _read_journal_tail(offset)
+        after = _signature(FILE_JOURNAL)
+        if after is None or after[2] != journal[2]:
+            return None  # journal diganti saat dibaca
+
+    # record milik sendiri sudah diterapkan; sisanya harus menyambung
+    # versi di memori (celah: journal sudah dipadatkan instance lain)
+    seq = _data.get("journal_seq", 0)
+    records = [rec for rec in records if rec["seq"] > seq]
+    if any(rec["seq"] != seq + i for i, rec in enumerate(records, 1)):
+        return None
+
+    diff = ReloadDiff([], [], [])
+    for rec in records:
+        if rec["op"] not in ("add", "add_many"):
+            row = _target(_data["transaksi"], rec)
+            if row is not None:
+                (diff.changed if rec["op"] == "edit" else diff.removed).append(row)
+        n = len(_data["transaksi"])
+        _apply_memory(rec)
+        if rec["op"] in ("add", "add_many"):
+            diff.added.extend(_data["transaksi"][n:])
+
+    with _cache_lock:
+        _cache["journal_offset"] = offset
+        if offset == _file_size(FILE_JOURNAL):
+            _cache["key"] = _cache_key()
+    return diff
+
+
+def _reload_full():
+    global _data
+
+    new = _load_json_file()
+    if new is _data:
+        return ReloadDiff([], [], [])
+
+    # pasangkan baris lama & baru lewat id transaksi
+    cols = _data["transaksi"]
+    lama = {t["id"]: t for t in cols}
+
+    diff = ReloadDiff([], [], [])
+    order = []
+    for t in new["transaksi"]:
+        old = lama.pop(t["id"], None)
+        if old is None:
+            row = cols.new_row(t)
+            _store.add(row)
+            diff.added.append(row)
+            order.append(row.rid)
+            continue
+
+        isi = {k: t[k] for k in _CONTENT_FIELDS}
+        if any(old[k] != v for k, v in isi.items()):
+            _store.update(old, isi)
+            diff.changed.append(old)
+        order.append(old.rid)
+
+    for old in lama.values():
+        _store.remove(old)
+        cols.release(old.rid)
+        diff.removed.append(old)
+
+    # baris lama dipakai ulang supaya identitas baris di store tetap sama
+    cols.set_order(order)
+    new["transaksi"] = cols
+    _data = new
+    return diff
+
+
+def _day_start(d):
+    return datetime(d.year, d.month, d.day)
+
+
+def _month_start(d):
+    return datetime(d.year, d.month, 1)
+
+
+def _next_month(d):
+    if d.month == 12:
+        return datetime(d.year + 1, 1, 1)
+    return datetime(d.year, d.month + 1, 1)
+
+
+_store_epochs = itertools.count(1)
+
+
+class TransactionStore:
+    """Transaksi terurut berdasar timestamp.
+
+    Query per hari/minggu/bulan dijawab dengan bisect pada daftar
+    timestamp, jadi biayanya sebanding dengan jumlah baris hasil, bukan
+    jumlah seluruh riwayat. Indeks bucket hari & bulan (key -> jumlah
+    baris) dipakai untuk daftar tanggal pada filter, dan `aggregates`
+    menyimpan total berjalan untuk ringkasan. Semua bucket memakai kunci
+    tanggal integer yang sudah tersimpan di kolom (lihat datekeys).
+
+    Baris disimpan di ColumnarTransactions; indeks waktu hanya memegang
+    array timestamp & rid, dan query mengembalikan RowView.
+
+    Setiap hari punya penghitung versi yang naik bila ada baris di hari
+    itu ditambah/diubah/dihapus; version() dipakai sebagai kunci cache
+    (mis. cache grafik) yang hanya basi bila periodenya berubah.
+
+    `rollups` menyimpan total per hari/pekan/bulan/tahun per kategori &
+    tipe (lihat rollups.py), diperbarui bersama bucket.
+
+    query() menjalankan Query multi-kriteria (lihat query.py): plan()
+    memilih indeks waktu atau posting list kategori/tipe (terurut waktu,
+    dibangun saat pertama dibutuhkan lalu dijaga bersama bucket), dan teks
+    dicari lewat indeks token (lihat search.py).
+    """
+
+    def __init__(self, transaksi=()):
+        if not isinstance(transaksi, ColumnarTransactions):
+            transaksi = ColumnarTransactions(transaksi)
+        self.cols = transaksi
+
+        ts = transaksi.timestamp
+        self._rids = array("q", sorted(transaksi.order, key=ts.__getitem__))
+        self._keys = array("d", (ts[rid] for rid in self._rids))
+        self._search = None
+        self._build_buckets()
+
+    def __len__(self):
+        return len(self._rids)
+
+    def __getitem__(self, index):
+        # dipakai VirtualTable untuk mengambil potongan baris yang terlihat
+        if isinstance(index, slice):
+            return [RowView(self.cols, rid) for rid in self._rids[index]]
+        return RowView(self.cols, self._rids[index])
+
+    # ----------------------------- mutasi -----------------------------
+    def add(self, t):
+        """Masukkan baris ke indeks; dict biasa disimpan dulu ke kolom."""
+        if not isinstance(t, RowView):
+            t = self.cols.append(t)
+        pos = bisect.bisect_right(self._keys, t["timestamp"])
+        self._keys.insert(pos, t["timestamp"])
+        self._rids.insert(pos, t.rid)
+        self._count(t, 1)
+        self._touch(self.cols.hari[t.rid])
+        for field, per_id in self._postings.items():
+            keys, rids = per_id.setdefault(
+                getattr(self.cols, field)[t.rid], (array("d"), array("q"))
+            )
+            pos = bisect.bisect_right(keys, t["timestamp"])
+            keys.insert(pos, t["timestamp"])
+            rids.insert(pos, t.rid)
+        return t
+
+    def add_many(self, rows):
+        """Seperti add() untuk banyak baris; indeks waktu digabung sekali saja."""
+        rows = list(rows)
+        if rows and not isinstance(rows[0], RowView):
+            rows = [self.cols.row(rid) for rid in self.cols.extend(rows)]
+        if not rows:
+            return rows
+
+        ts = self.cols.timestamp
+        baru = sorted((t.rid for t in rows), key=ts.__getitem__)
+        if not self._keys or ts[baru[0]] >= self._keys[-1]:
+            self._keys.extend(ts[rid] for rid in baru)
+            self._rids.extend(baru)
+        else:
+            # dua deret yang sudah terurut: sort bawaan cukup menggabungkannya
+            rids = sorted(list(self._rids) + baru, key=ts.__getitem__)
+            self._rids = array("q", rids)
+            self._keys = array("d", (ts[rid] for rid in rids))
+
+        self._count_many(baru)
+        self._postings = {}  # dibangun ulang saat query berikutnya
+        return rows
+
+    def remove(self, t):
+        pos = self._position(t)
+        del self._keys[pos]
+        del self._rids[pos]
+        self._count(t, -1)
+        self._touch(self.cols.hari[t.rid])
+        for field, per_id in self._postings.items():
+            keys, rids = per_id[getattr(self.cols, field)[t.rid]]
+            pos = self._position(t, keys, rids)
+            del keys[pos]
+            del rids[pos]
+
+    def update(self, t, fields):
+        """Ubah field `t` di tempat; posisi ikut digeser bila timestamp berubah."""
+        self.remove(t)
+        t.update(fields)
+        self.add(t)
+
+    def copy(self):
+        """Salinan lepas yang bisa di-query di thread lain tanpa kunci.
+
+        Kolom dan indeks waktu disalin (memcpy), bucket, agregat, rollup
+        dan posting list disalin per entri, jadi tambah/edit/hapus
+        berikutnya tidak terlihat di salinan. Epoch & versi ikut disalin
+        supaya cache berbasis version() tetap berlaku. Indeks token
+        pencarian dipakai bersama: tabel string hanya pernah ditambah, jadi
+        id string yang sama berarti string yang sama di keduanya.
+        """
+        if self._search is None:
+            self._search = search.SearchIndex(self.cols)
+        new = TransactionStore.__new__(TransactionStore)
+        new.__dict__.update(self.__dict__)
+        new.cols = self.cols.copy(by_id=False)
+        new._rids = self._rids[:]
+        new._keys = self._keys[:]
+        for name in ("_versi", "_hari", "_bulan", "_kategori", "_tipe"):
+            setattr(new, name, dict(getattr(self, name)))
+        new._postings = {
+            field: {key: (keys[:], rids[:]) for key, (keys, rids) in per_id.items()}
+            for field, per_id in self._postings.items()
+        }
+        new.aggregates = self.aggregates.copy()
+        new.rollups = self.rollups.copy()
+        return new
+
+    # ----------------------------- query ------------------------------
+    def all(self):
+        return self[:]
+
+    def find(self, trans_id):
+        """RowView transaksi dengan id `trans_id`, atau None."""
+        return self.cols.find(trans_id)
+
+    def range(self, start, end):
+        """Transaksi dengan start <= waktu < end (datetime lokal)."""
+        lo = bisect.bisect_left(self._keys, start.timestamp())
+        hi = bisect.bisect_left(self._keys, end.timestamp())
+        return self[lo:hi]
+
+    def day(self, d):
+        if day_of(d) not in self._hari:
+            return []
+        start = _day_start(d)
+        return self.range(start, start + timedelta(days=1))
+
+    def month(self, d):
+        if month_of(d) not in self._bulan:
+            return []
+        start = _month_start(d)
+        return self.range(start, _next_month(start))
+
+    def plan(self, q):
+        """query.Plan untuk Query `q`: indeks sumber kandidat termurah."""
+        lo = 0 if q.start_ts is None else bisect.bisect_left(self._keys, q.start_ts)
+        hi = len(self._keys) if q.end_ts is None else bisect.bisect_left(self._keys, q.end_ts)
+        hi = max(lo, hi)
+
+        # posting list: total baris kategori/tipe itu, diskalakan dengan
+        # porsi rentang waktu terhadap seluruh riwayat
+        porsi = (hi - lo) / len(self._keys) if self._keys else 0
+        estimates = {"waktu": hi - lo}
+        if q.kategori is not None:
+            estimates["kategori"] = porsi * sum(self._kategori.get(k, 0) for k in q.kategori)
+        if q.tipe is not None:
+            estimates["tipe"] = porsi * self._tipe.get(q.tipe, 0)
+        index, estimate = query.choose(estimates)
+        return query.Plan(index, round(estimate), lo, hi)
+
+    def query(self, q, limit=None):
+        """Baris (urut waktu) yang memenuhi Query `q`.
+
+        Mengembalikan (baris, timestamp lanjutan). Dengan `limit` dan
+        indeks waktu sebagai sumber kandidat, hanya sekitar `limit` baris
+        pertama rentang yang diperiksa; sisanya dicari dengan memanggil
+        lagi memakai q.start_ts = timestamp lanjutan (None bila rentang
+        sudah habis). Kandidat dari posting list diperiksa sekaligus.
+        """
+        p = self.plan(q)
+        lanjut = None
+        if p.index == "waktu":
+            lo, hi = p.lo, p.hi
+            keys = self._keys
+            if limit is not None and hi - lo > limit:
+                # potong di pergantian timestamp supaya lanjutan tidak mengulang baris
+                lanjut = keys[lo + limit]
+                cut = bisect.bisect_left(keys, lanjut, lo)
+                if cut == lo:
+                    cut = bisect.bisect_right(keys, lanjut, lo)
+                    lanjut = keys[cut] if cut < hi else None
+                hi = cut
+            candidates = self._rids[lo:hi]
+        else:
+            names = q.kategori if p.index == "kategori" else (q.tipe,)
+            candidates = self._posting_range(p.index, names, q.start_ts, q.end_ts)
+
+        terms = None
+        if search.tokens(q.teks):
+            if self._search is None:
+                self._search = search.SearchIndex(self.cols)
+            terms = self._search.terms(q.teks)
+        rids = query.filter_rids(self.cols, candidates, q, terms, skip=(p.index,))
+        return search.Matches(self.cols, rids), lanjut
+
+    def query_sum(self, q, by=None):
+        """Seperti sum_by, untuk baris yang memenuhi Query `q`."""
+        if not q.filtered:
+            return self.sum_by(q.start_ts, q.end_ts, by)
+        rids = self.query(q)[0].rids
+        if aggregation.available():
+            return aggregation.sum_rids(rids, self.cols, by)
+        return self._sum_rids(rids, by)
+
+    def dates(self):
+        """Daftar tanggal "YYYY-MM-DD" yang punya transaksi, terurut."""
+        return [day_label(hari) for hari in sorted(self._hari)]
+
+    def categories(self):
+        return sorted(self._kategori)
+
+    def sum_by(self, start_ts=None, end_ts=None, by=None):
+        """{grup: {tipe: total}} seperti StorageBackend.aggregate."""
+        if aggregation.available():
+            return aggregation.sum_by(
+                self._keys, self._rids, self.cols, start_ts, end_ts, by
+            )
+
+        lo = 0 if start_ts is None else bisect.bisect_left(self._keys, start_ts)
+        hi = len(self._keys) if end_ts is None else bisect.bisect_left(self._keys, end_ts)
+        return self._sum_rids(self._rids[lo:hi], by)
+
+    def _sum_rids(self, rids, by):
+        cols = self.cols
+        kunci = {"hari": cols.hari, "bulan": cols.bulan, "minggu_ke": cols.minggu_ke}
+
+        hasil = {}
+        for rid in rids:
+            if by in kunci:
+                grup = kunci[by][rid]
+            elif by == "kategori":
+                grup = cols.get(rid, "kategori")
+            else:
+                grup = None
+            tipe = cols.get(rid, "tipe")
+            total = hasil.setdefault(grup, {})
+            total[tipe] = total.get(tipe, 0) + cols.jumlah[rid]
+        return hasil
+
+    def version(self, start_ts=None, end_ts=None):
+        """Versi data pada rentang waktu; berbeda setiap kali isinya berubah.
+
+        (epoch store, jumlah penghitung versi hari di rentang); epoch baru
+        setiap store/bucket dibangun ulang, penghitung hanya pernah naik.
+        """
+        if start_ts is None or end_ts is None:
+            return self.epoch, sum(self._versi.values())
+        lo = date_keys(start_ts)[0]
+        hi = date_keys(end_ts)[0]  # ikut dihitung: aman bila end bukan tengah malam
+        versi = self._versi
+        if hi - lo > len(versi):
+            return self.epoch, sum(v for h, v in versi.items() if lo <= h <= hi)
+        return self.epoch, sum(versi.get(h, 0) for h in range(lo, hi + 1))
+
+    def check_timezone(self):
+        """Bangun ulang bucket bila kunci tanggal dihitung ulang karena zona waktu berubah."""
+        if self.cols.refresh_date_keys():
+            self._build_buckets()
+
+    # ---------------------------- internal ----------------------------
+    def _position(self, t, keys=None, rids=None):
+        if keys is None:
+            keys, rids = self._keys, self._rids
+        pos = bisect.bisect_left(keys, t["timestamp"])
+        while rids[pos] != t.rid:
+            pos += 1
+        return pos
+
+    def _posting_range(self, field, names, start_ts, end_ts):
+        """rid (urut waktu) dari posting list `field` untuk `names`, dipotong ke rentang."""
+        table = self.cols.kategori_names if field == "kategori" else self.cols.tipe_names
+        per_id = self._posting(field)
+        potongan = []
+        for name in names:
+            entry = per_id.get(table.find(name))
+            if entry is None:
+                continue
+            keys, rids = entry
+            lo = 0 if start_ts is None else bisect.bisect_left(keys, start_ts)
+            hi = len(keys) if end_ts is None else bisect.bisect_left(keys, end_ts)
+            potongan.append(rids[lo:hi])
+        if len(potongan) == 1:
+            return potongan[0]
+        ts = self.cols.timestamp
+        return array("q", sorted(itertools.chain(*potongan), key=ts.__getitem__))
+
+    def _posting(self, field):
+        """{id kategori/tipe: (timestamp, rid)} terurut waktu, dibangun sekali."""
+        per_id = self._postings.get(field)
+        if per_id is None:
+            col = getattr(self.cols, field)
+            per_id = {}
+            for ts, rid in zip(self._keys, self._rids):
+                entry = per_id.get(col[rid])
+                if entry is None:
+                    entry = per_id[col[rid]] = (array("d"), array("q"))
+                entry[0].append(ts)
+                entry[1].append(rid)
+            # dipasang setelah lengkap: salinan store bisa di-query dua worker sekaligus
+            self._postings[field] = per_id
+        return per_id
+
+    def _touch(self, hari):
+        self._versi[hari] = self._versi.get(hari, 0) + 1
+
+    def _build_buckets(self):
+        self.epoch = next(_store_epochs)
+        self._versi = {}  # kunci hari -> penghitung versi
+        self._hari = {}
+        self._bulan = {}
+        self._kategori = {}
+        self._tipe = {}
+        self._postings = {}  # field -> posting list, lihat _posting()
+        self.aggregates = RunningAggregates()
+        self.rollups = rollups.Rollups()
+        self._count_many(self._rids, touch=False)
+
+    def _count(self, t, delta):
+        hari, bulan, pekan, _ = self.cols.date_keys(t.rid)
+        for index, key in (
+            (self._hari, hari),
+            (self._bulan, bulan),
+            (self._kategori, t["kategori"]),
+            (self._tipe, t["tipe"]),
+        ):
+            index[key] = index.get(key, 0) + delta
+            if not index[key]:
+                del index[key]
+        self.aggregates.apply(t, delta, hari, bulan)
+        self.rollups.add(
+            hari, pekan, bulan, t["kategori"], t["tipe"], t["jumlah"] * delta, delta
+        )
+
+    def _count_many(self, rids, touch=True):
+        """_count(+1) untuk banyak baris: dijumlah per grup dulu, baru ke bucket."""
+        cols = self.cols
+        hari, bulan, pekan, kategori, tipe, jumlah = (
+            cols.hari, cols.bulan, cols.pekan, cols.kategori, cols.tipe, cols.jumlah
+        )
+        grup = {}
+        for rid in rids:
+            key = (hari[rid], pekan[rid], bulan[rid], kategori[rid], tipe[rid])
+            g = grup.get(key)
+            if g is None:
+                grup[key] = [1, jumlah[rid]]
+            else:
+                g[0] += 1
+                g[1] += jumlah[rid]
+
+        for (h, p, b, k, tp), (n, total) in grup.items():
+            if touch:
+                self._touch(h)
+            k = cols.kategori_names[k]
+            tp = cols.tipe_names[tp]
+            for index, key in (
+                (self._hari, h), (self._bulan, b), (self._kategori, k), (self._tipe, tp)
+            ):
+                index[key] = index.get(key, 0) + n
+            self.aggregates.add(tp, total, h, b, n)
+            self.rollups.add(h, p, b, k, tp, total, n)
+
+
+class RunningAggregates:
+    """Total pemasukan/pengeluaran keseluruhan, per bulan dan per hari.
+
+    Diperbarui secara delta: tambah = +jumlah, hapus = -jumlah, edit =
+    nilai lama keluar lalu nilai baru masuk. Ringkasan cukup membaca dict.
+    """
+
+    def __init__(self):
+        self.total = {}
+        self.per_bulan = {}  # kunci bulan -> {tipe: jumlah, "n": banyak baris}
+        self.per_hari = {}   # kunci hari -> {tipe: jumlah, "n": banyak baris}
+
+    def apply(self, t, sign=1, hari=None, bulan=None):
+        if hari is None or bulan is None:
+            hari, bulan, _, _ = date_keys(t["timestamp"])
+
+        self.add(t["tipe"], t["jumlah"] * sign, hari, bulan, sign)
+
+    def add(self, tipe, jumlah, hari, bulan, n):
+        """Tambahkan total `jumlah` dari `n` baris (n negatif = baris keluar)."""
+        self.total[tipe] = self.total.get(tipe, 0) + jumlah
+
+        for buckets, key in ((self.per_bulan, bulan), (self.per_hari, hari)):
+            bucket = buckets.setdefault(key, {"n": 0})
+            bucket[tipe] = bucket.get(tipe, 0) + jumlah
+            bucket["n"] += n
+            if not bucket["n"]:
+                del buckets[key]
+
+    def copy(self):
+        new = RunningAggregates()
+        new.total = dict(self.total)
+        new.per_bulan = {key: dict(bucket) for key, bucket in self.per_bulan.items()}
+        new.per_hari = {key: dict(bucket) for key, bucket in self.per_hari.items()}
+        return new
+
+    def saldo(self):
+        return self.total.get("pemasukan", 0) - self.total.get("pengeluaran", 0)
+
+    def month_total(self, d, tipe):
+        return self.per_bulan.get(month_of(d), {}).get(tipe, 0)
+
+    def day_total(self, d, tipe):
+        return self.per_hari.get(day_of(d), {}).get(tipe, 0)
+
+    def verify(self, transaksi):
+        """Hitung ulang dari nol dan kembalikan selisihnya.
 
-    with open(FILE_JSON, "w") as f:
-        json.dump(data, f, indent=4)
+        Hasil berupa dict {(bagian, key, tipe): (seharusnya, tersimpan)};
+        dict kosong berarti tidak ada drift.
+        """
+        fresh = RunningAggregates()
+        for t in transaksi:
+            fresh.apply(t)
 
-    refresh_lock = False
+        drift = {}
+        for bagian in ("total", "per_bulan", "per_hari"):
+            expected = getattr(fresh, bagian)
+            actual = getattr(self, bagian)
+            if bagian == "total":
+                expected, actual = {None: expected}, {None: actual}
+            for key in set(expected) | set(actual):
+                exp = expected.get(key, {})
+                act = actual.get(key, {})
+                for tipe in set(exp) | set(act):
+                    a, b = exp.get(tipe, 0), act.get(tipe, 0)
+                    if abs(a - b) > 1e-6:
+                        drift[(bagian, key, tipe)] = (a, b)
+        return drift
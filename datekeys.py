@@ -0,0 +1,55 @@
+# datekeys.py
+"""Kunci tanggal lokal berbentuk integer untuk tiap transaksi.
+
+Dihitung sekali saat baris dimuat/ditambah (satu kali localtime per baris),
+lalu filter, ringkasan dan grafik cukup membandingkan integer:
+
+- hari     : ordinal tanggal lokal (date.toordinal())
+- bulan    : tahun * 12 + (bulan - 1)
+- pekan    : minggu ISO, tahun_iso * 100 + minggu_iso
+- minggu_ke: minggu ke-berapa dalam bulan, 1..5 (tanggal 1-7 = 1, dst.)
+
+Kunci bergantung pada zona waktu lokal; bandingkan tz_signature() dengan
+nilai saat kunci dihitung untuk tahu kapan harus dihitung ulang.
+"""
+import time
+from datetime import date
+
+# instan acuan musim dingin & musim panas untuk mendeteksi aturan DST
+_TZ_PROBES = (946_684_800, 962_409_600)  # 2000-01-01, 2000-07-01 UTC
+
+
+def date_keys(ts):
+    """(hari, bulan, pekan, minggu_ke) untuk timestamp `ts` di zona lokal."""
+    lt = time.localtime(ts)
+    d = date(lt.tm_year, lt.tm_mon, lt.tm_mday)
+    iso_year, iso_week, _ = d.isocalendar()
+    return (
+        d.toordinal(),
+        lt.tm_year * 12 + lt.tm_mon - 1,
+        iso_year * 100 + iso_week,
+        (lt.tm_mday - 1) // 7 + 1,
+    )
+
+
+def tz_signature():
+    """Sidik zona waktu lokal; berubah bila TZ / aturan DST berubah."""
+    return (time.tzname,) + tuple(time.localtime(t).tm_gmtoff for t in _TZ_PROBES)
+
+
+def day_of(d):
+    """Kunci hari untuk date/datetime `d`."""
+    return d.toordinal()
+
+
+def month_of(d):
+    """Kunci bulan untuk date/datetime `d`."""
+    return d.year * 12 + d.month - 1
+
+
+def day_label(hari):
+    return date.fromordinal(hari).isoformat()
+
+
+def month_label(bulan):
+    return f"{bulan // 12:04d}-{bulan % 12 + 1:02d}"
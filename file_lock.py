@@ -0,0 +1,105 @@
+# file_lock.py
+"""Kunci file advisory antar-proses untuk penulis ledger.
+
+Beberapa instance aplikasi boleh membuka data yang sama. Penulis memegang
+kunci ini hanya selama append journal, merge tulisan instance lain, atau
+memasang file yang sudah selesai ditulis (os.replace), jadi penulis lain
+cukup menunggu sebentar. POSIX memakai fcntl.flock, Windows msvcrt.locking;
+kunci dilepas sendiri oleh OS bila prosesnya mati.
+
+File kunci sekaligus menyimpan state kecil (JSON) milik pemakainya, yang
+hanya boleh dibaca/ditulis selama kunci dipegang (read_state/write_state).
+"""
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Windows mengunci rentang byte: dipakai satu byte jauh di luar isi state,
+# supaya state tetap bisa ditulis ulang & dipotong selama kunci dipegang
+_WIN_OFFSET = 1 << 30
+
+
+def _lock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(_WIN_OFFSET)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            pass  # LK_LOCK menyerah setelah ~10 detik; tunggu lagi
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return
+    f.seek(_WIN_OFFSET)
+    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Kunci eksklusif atas `path`, reentran di dalam satu proses.
+
+    Thread lain di proses yang sama menunggu lewat threading.RLock; kunci
+    file baru diambil pada `with` terluar dan dilepas saat keluar darinya.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._f = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+                f = os.fdopen(fd, "r+b")
+                try:
+                    _lock(f)
+                except BaseException:
+                    f.close()
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._f = f
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            f, self._f = self._f, None
+            try:
+                _unlock(f)
+            finally:
+                f.close()
+        self._thread_lock.release()
+
+    def read_state(self):
+        """State yang disimpan di file kunci, atau None bila kosong/rusak."""
+        f = self._f
+        f.seek(0)
+        raw = f.read()
+        try:
+            return json.loads(raw) if raw else None
+        except ValueError:
+            return None
+
+    def write_state(self, state):
+        f = self._f
+        f.seek(0)
+        f.write(json.dumps(state).encode())
+        f.truncate()
+        f.flush()
@@ -0,0 +1,436 @@
+# importer.py
+"""Impor massal transaksi dari file CSV / mutasi rekening.
+
+    python -m importer data.csv
+    python -m importer mutasi.csv --mapping bank.json
+    python -m importer mutasi.csv --map tanggal=Tanggal --map debit=Debet \\
+        --map kredit=Kredit --map keterangan=Keterangan --kategori-default Bank
+
+File dibaca sebagai stream lewat rangkaian generator:
+baca CSV -> normalisasi & validasi -> buang duplikat -> batch -> tulis.
+Yang ditahan di memori hanya satu batch, berapa pun panjang filenya, dan
+setiap batch ditulis ke store dengan satu operasi (add_transactions).
+
+File mapping berupa JSON {field: nama kolom CSV}, boleh ditambah opsi
+"delimiter", "encoding", "format_tanggal" dan "kategori_default".
+Field yang dikenal: tanggal, waktu, timestamp, tipe, jumlah, debit,
+kredit, kategori, keterangan. Tanpa kolom tipe, tipe ditentukan dari
+tanda jumlah (negatif = pengeluaran) atau dari kolom debit/kredit.
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+from datetime import datetime
+from itertools import islice
+
+import data_store
+
+BATCH_SIZE = 10_000
+MAX_ERRORS = 100  # baris gagal yang dicatat alasannya
+
+TIPE = ("pemasukan", "pengeluaran")
+TIPE_ALIAS = {
+    "pemasukan": "pemasukan",
+    "masuk": "pemasukan",
+    "kredit": "pemasukan",
+    "credit": "pemasukan",
+    "cr": "pemasukan",
+    "in": "pemasukan",
+    "pengeluaran": "pengeluaran",
+    "keluar": "pengeluaran",
+    "debit": "pengeluaran",
+    "debet": "pengeluaran",
+    "db": "pengeluaran",
+    "out": "pengeluaran",
+}
+
+# format bagian tanggal; jam ("HH:MM" / "HH:MM:SS") setelah spasi dibaca terpisah
+FORMAT_TANGGAL = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+
+FIELDS = (
+    "tanggal", "waktu", "timestamp", "tipe", "jumlah",
+    "debit", "kredit", "kategori", "keterangan",
+)
+OPTIONS = ("delimiter", "encoding", "format_tanggal", "kategori_default")
+
+
+class RowError(ValueError):
+    """Baris CSV yang tidak lolos validasi."""
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.errors = []  # (nomor baris, alasan), maksimal MAX_ERRORS
+
+    def reject(self, line, reason):
+        self.rejected += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, reason))
+
+    def summary(self):
+        lines = [
+            f"Diimpor   : {self.imported}",
+            f"Duplikat  : {self.duplicates}",
+            f"Ditolak   : {self.rejected}",
+        ]
+        lines += [f"  baris {line}: {reason}" for line, reason in self.errors[:10]]
+        return "\n".join(lines)
+
+
+# -------------------------------------------------------------
+#   TAHAP PIPELINE
+# -------------------------------------------------------------
+def read_rows(path, delimiter=None, encoding="utf-8-sig"):
+    """Yield (nomor baris, list kolom) dari file CSV; baris pertama adalah header."""
+    with open(path, newline="", encoding=encoding) as f:
+        if delimiter is None:
+            try:
+                delimiter = csv.Sniffer().sniff(f.read(64 * 1024), ",;\t|").delimiter
+            except csv.Error:
+                delimiter = ","
+            f.seek(0)
+
+        reader = csv.reader(f, delimiter=delimiter)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def parse_jumlah(text):
+    """"Rp 1.250.000", "-50,000.00", "(7.500)" -> int bertanda."""
+    s = text.strip().replace("Rp", "").replace("IDR", "").replace(" ", "")
+    negatif = s.startswith("-") or (s.startswith("(") and s.endswith(")"))
+    s = s.strip("+-()")
+
+    if "," in s and "." in s:
+        # pemisah desimal adalah yang muncul paling akhir
+        if s.rfind(",") > s.rfind("."):
+            s = s.replace(".", "").replace(",", ".")
+        else:
+            s = s.replace(",", "")
+    elif "," in s:
+        bagian = s.split(",")
+        if len(bagian) > 2 or len(bagian[-1]) == 3:
+            s = s.replace(",", "")
+        else:
+            s = s.replace(",", ".")
+    elif s.count(".") > 1 or (s.count(".") == 1 and len(s.split(".")[-1]) == 3):
+        s = s.replace(".", "")  # 1.250.000 gaya Indonesia
+
+    try:
+        value = float(s)
+    except ValueError:
+        raise RowError(f"Jumlah bukan angka: {text!r}") from None
+    if not math.isfinite(value):
+        # "nan", "inf", "1e309": float() menerimanya, JSON standar tidak
+        raise RowError(f"Jumlah bukan angka: {text!r}")
+    if not value.is_integer():
+        # form hanya menerima rupiah bulat (int()); pecahan tidak dibulatkan diam-diam
+        raise RowError(f"Jumlah harus bilangan bulat: {text!r}")
+    value = int(value)
+    return -value if negatif else value
+
+
+class Normalizer:
+    """Ubah satu baris CSV menjadi dict transaksi seperti yang dibuat tambah_data.
+
+    Aturannya sama dengan form: tipe pemasukan/pengeluaran, jumlah angka,
+    kategori dan keterangan tidak boleh kosong.
+    """
+
+    def __init__(self, mapping, format_tanggal=None, kategori_default=""):
+        self.mapping = mapping
+        self.formats = [format_tanggal] if format_tanggal else list(FORMAT_TANGGAL)
+        self.kategori_default = kategori_default
+        self.columns = None  # field -> indeks kolom CSV
+        # cache kecil: satu tanggal / nominal biasanya muncul di banyak baris
+        self._tanggal = {}  # teks tanggal -> (tahun, bulan, hari)
+        self._nominal = {}  # teks jumlah -> float
+
+    def resolve(self, header):
+        """Cocokkan mapping dengan header CSV (tanpa membedakan huruf besar/kecil).
+
+        ValueError bila kolom wajib tidak ada.
+        """
+        posisi = {}
+        for i, name in enumerate(header or ()):
+            posisi.setdefault(name.strip().lower(), i)
+        self.columns = {
+            field: posisi[column.strip().lower()]
+            for field, column in self.mapping.items()
+            if column.strip().lower() in posisi
+        }
+        if not {"tanggal", "timestamp"} & self.columns.keys():
+            raise ValueError("Kolom tanggal / timestamp tidak ditemukan di CSV")
+        if not {"jumlah", "debit", "kredit"} & self.columns.keys():
+            raise ValueError("Kolom jumlah / debit / kredit tidak ditemukan di CSV")
+        self._index = [self.columns.get(field) for field in FIELDS]
+
+    def __call__(self, row):
+        n = len(row)
+        (tanggal, waktu, timestamp, tipe, jumlah,
+         debit, kredit, kategori, keterangan) = [
+            row[i].strip() if i is not None and i < n else "" for i in self._index
+        ]
+
+        ts = self._timestamp(tanggal, waktu, timestamp)
+        tipe, jumlah = self._jumlah(tipe, jumlah, debit, kredit)
+
+        kategori = kategori or self.kategori_default
+        if not kategori:
+            raise RowError("Kategori tidak boleh kosong")
+        if not keterangan:
+            raise RowError("Keterangan tidak boleh kosong")
+
+        return {
+            "id": data_store.new_id(),
+            "tipe": tipe,
+            "jumlah": jumlah,
+            "kategori": kategori,
+            "keterangan": keterangan,
+            # "waktu" tidak perlu: store menurunkannya dari timestamp
+            "timestamp": ts,
+        }
+
+    def _timestamp(self, tanggal, waktu, raw):
+        if raw:
+            try:
+                ts = float(raw)
+            except ValueError:
+                raise RowError(f"Timestamp tidak valid: {raw!r}") from None
+            if not math.isfinite(ts):
+                raise RowError(f"Timestamp tidak valid: {raw!r}")
+            return ts
+
+        teks = f"{tanggal} {waktu}" if waktu else tanggal
+        if not teks:
+            raise RowError("Tanggal kosong")
+
+        if "%H" in self.formats[0]:
+            # format dari pengguna sudah memuat jam
+            try:
+                return datetime.strptime(teks, self.formats[0]).timestamp()
+            except ValueError:
+                raise RowError(f"Format tanggal tidak dikenal: {teks!r}") from None
+
+        tanggal, _, jam = teks.partition(" ")
+        ymd = self._tanggal.get(tanggal)
+        if ymd is None:
+            ymd = self._parse_tanggal(tanggal)
+            if len(self._tanggal) < 100_000:
+                self._tanggal[tanggal] = ymd
+
+        try:
+            hms = [int(x) for x in jam.split(":")] if jam else []
+            return datetime(*ymd, *hms).timestamp()
+        except (TypeError, ValueError):
+            raise RowError(f"Jam tidak valid: {teks!r}") from None
+
+    def _parse_tanggal(self, teks):
+        for i, fmt in enumerate(self.formats):
+            try:
+                d = datetime.strptime(teks, fmt)
+            except ValueError:
+                continue
+            if i:
+                # format yang cocok dicoba pertama untuk baris berikutnya
+                self.formats.insert(0, self.formats.pop(i))
+            return d.year, d.month, d.day
+        raise RowError(f"Format tanggal tidak dikenal: {teks!r}")
+
+    def _parse_jumlah(self, teks):
+        value = self._nominal.get(teks)
+        if value is None:
+            value = parse_jumlah(teks)
+            if len(self._nominal) < 100_000:
+                self._nominal[teks] = value
+        return value
+
+    def _jumlah(self, tipe, raw, debit, kredit):
+        if tipe:
+            if tipe.lower() not in TIPE_ALIAS:
+                raise RowError(f"Tipe tidak dikenal: {tipe!r}")
+            tipe = TIPE_ALIAS[tipe.lower()]
+
+        if raw:
+            jumlah = self._parse_jumlah(raw)
+            if not jumlah:
+                raise RowError(f"Jumlah harus lebih dari 0: {raw!r}")
+            if not tipe:
+                tipe = "pengeluaran" if jumlah < 0 else "pemasukan"
+            return tipe, abs(jumlah)
+
+        jumlah = self._parse_jumlah(debit) if debit else 0
+        if jumlah:
+            return tipe or "pengeluaran", abs(jumlah)
+        jumlah = self._parse_jumlah(kredit) if kredit else 0
+        if jumlah:
+            return tipe or "pemasukan", abs(jumlah)
+        raise RowError("Jumlah kosong")
+
+
+def normalize(rows, normalizer, result):
+    """Yield transaksi valid; baris gagal dicatat di `result`."""
+    rows = iter(rows)
+    _, header = next(rows, (0, None))
+    normalizer.resolve(header)
+
+    for line, row in rows:
+        if not row:
+            continue  # baris kosong
+        try:
+            yield normalizer(row)
+        except RowError as e:
+            result.reject(line, str(e))
+
+
+def content_key(t):
+    return (t["tipe"], float(t["jumlah"]), t["kategori"], t["keterangan"],
+            float(t["timestamp"]))
+
+
+def existing_keys(store):
+    """{kunci isi: banyak baris} untuk transaksi yang sudah ada di store."""
+    cols = getattr(store, "cols", None)
+    if cols is not None:
+        # langsung dari kolom, tanpa membuat RowView per baris
+        tipe = cols.tipe_names.strings
+        kategori = cols.kategori_names.strings
+        keterangan = cols.keterangan_strings.strings
+        keys = (
+            (tipe[cols.tipe[rid]], cols.jumlah[rid], kategori[cols.kategori[rid]],
+             keterangan[cols.keterangan[rid]], cols.timestamp[rid])
+            for rid in cols.order
+        )
+    else:
+        keys = (content_key(t) for t in store.all())
+
+    counts = {}
+    for key in keys:
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def dedupe(transaksi, existing, result):
+    """Lewati baris yang isinya sudah ada.
+
+    Dihitung per kemunculan: bila store sudah punya dua baris identik, dua
+    baris pertama yang sama di file dianggap duplikat, sisanya tetap masuk.
+    Jadi mengimpor ulang file yang sama tidak menggandakan data, tetapi
+    transaksi kembar yang sah di dalam satu file tetap tercatat.
+    """
+    for t in transaksi:
+        key = content_key(t)
+        sisa = existing.get(key)
+        if sisa:
+            existing[key] = sisa - 1
+            result.duplicates += 1
+            continue
+        yield t
+
+
+def batched(iterable, size):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+# -------------------------------------------------------------
+#   API
+# -------------------------------------------------------------
+def import_csv(
+    path,
+    mapping=None,
+    delimiter=None,
+    encoding="utf-8-sig",
+    format_tanggal=None,
+    kategori_default="",
+    batch_size=BATCH_SIZE,
+    dry_run=False,
+):
+    """Impor file CSV ke store aktif; mengembalikan ImportResult.
+
+    ValueError bila kolom wajib tidak ada, OSError bila file tidak bisa dibaca.
+    """
+    kolom = {field: field for field in FIELDS}
+    kolom.update(mapping or {})
+    normalizer = Normalizer(kolom, format_tanggal, kategori_default)
+
+    result = ImportResult()
+    existing = existing_keys(data_store.get_store())
+
+    rows = read_rows(path, delimiter, encoding)
+    transaksi = dedupe(normalize(rows, normalizer, result), existing, result)
+    for batch in batched(transaksi, batch_size):
+        if not dry_run:
+            data_store.add_transactions(batch)
+        result.imported += len(batch)
+    return result
+
+
+def load_mapping(path):
+    """Baca file mapping JSON -> (mapping kolom, opsi)."""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    options = {k: config.pop(k) for k in OPTIONS if k in config}
+    unknown = set(config) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Field mapping tidak dikenal: {', '.join(sorted(unknown))}")
+    return config, options
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Impor massal transaksi dari CSV")
+    parser.add_argument("path")
+    parser.add_argument("--mapping", help="file JSON {field: kolom CSV}")
+    parser.add_argument(
+        "--map", action="append", default=[], metavar="FIELD=KOLOM",
+        help="mapping satu field (boleh berulang)",
+    )
+    parser.add_argument("--delimiter")
+    parser.add_argument("--encoding")
+    parser.add_argument("--format-tanggal", help='mis. "%%d/%%m/%%Y"')
+    parser.add_argument("--kategori-default")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="validasi saja")
+    args = parser.parse_args(argv)
+
+    mapping, options = {}, {}
+    if args.mapping:
+        mapping, options = load_mapping(args.mapping)
+    for item in args.map:
+        field, _, column = item.partition("=")
+        if field not in FIELDS or not column:
+            parser.error(f"--map tidak valid: {item!r}")
+        mapping[field] = column
+    for name in OPTIONS:
+        value = getattr(args, name)
+        if value is not None:
+            options[name] = value
+
+    data_store.init_json()
+    try:
+        result = import_csv(
+            args.path, mapping, batch_size=args.batch_size,
+            dry_run=args.dry_run, **options,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Gagal import: {e}", file=sys.stderr)
+        return 1
+    finally:
+        # compaction berjalan di thread daemon; jangan tinggalkan .tmp
+        data_store.wait_for_compaction()
+
+    print(result.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
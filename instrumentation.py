@@ -0,0 +1,175 @@
+# instrumentation.py
+"""Pengukur waktu ringan per tahap refresh dan per operasi store.
+
+    with instrumentation.timed("refresh_table"):
+        ...
+
+    @instrumentation.timed("store.load_json")
+    def load_json(): ...
+
+Setiap tahap menyimpan durasi terakhir di jendela bergulir (WINDOW
+sampel), jadi stats() memberi p50/p95/maks dari pemakaian terbaru.
+Biaya per pengukuran hanya dua perf_counter dan satu append.
+
+Profiler opt-in: CASH_TRACKER_PROFILE=1 atau `python main.py --profile`
+menjalankan cProfile (thread utama) dan tracemalloc selama sesi, lalu
+menulis laporannya saat aplikasi ditutup.
+"""
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+WINDOW = 256  # sampel terakhir per tahap
+LOG_FILE = "cash_tracker_timing.log"
+PROFILE_PREFIX = "cash_tracker_profile"
+
+_lock = threading.Lock()
+_histograms = {}
+
+
+class Histogram:
+    """Durasi (ms) terakhir satu tahap dalam jendela bergulir."""
+
+    def __init__(self, size=WINDOW):
+        self.samples = deque(maxlen=size)
+        self.count = 0  # total sejak start, tidak ikut bergulir
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+
+    def stats(self):
+        data = sorted(self.samples)
+        if not data:
+            return {"count": self.count}
+        return {
+            "count": self.count,
+            "last": round(self.samples[-1], 3),
+            "p50": round(_percentile(data, 0.50), 3),
+            "p95": round(_percentile(data, 0.95), 3),
+            "max": round(data[-1], 3),
+        }
+
+
+def _percentile(data, q):
+    return data[min(len(data) - 1, int(q * len(data)))]
+
+
+# -------------------------------------------------------------
+#   PENGUKURAN
+# -------------------------------------------------------------
+def record(stage, ms):
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = Histogram()
+        hist.add(ms)
+
+
+@contextlib.contextmanager
+def timed(stage):
+    """Context manager / decorator yang mencatat durasi ke tahap `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, (time.perf_counter() - start) * 1000)
+
+
+def wrap_method(obj, name, stage):
+    """Ukur setiap pemanggilan obj.name (mis. canvas.draw yang dipanggil Tk)."""
+    method = getattr(obj, name)
+
+    def wrapper(*args, **kwargs):
+        with timed(stage):
+            return method(*args, **kwargs)
+
+    setattr(obj, name, wrapper)
+
+
+def stats():
+    """{tahap: {count, last, p50, p95, max}}, diurutkan menurut nama."""
+    with _lock:
+        return {stage: _histograms[stage].stats() for stage in sorted(_histograms)}
+
+
+def last(stage):
+    with _lock:
+        hist = _histograms.get(stage)
+        return hist.samples[-1] if hist and hist.samples else None
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def format_report(data=None):
+    """Tabel teks dari stats() untuk panel diagnostik / log."""
+    data = stats() if data is None else data
+    lines = [f"{'tahap':<28}{'n':>7}{'terakhir':>10}{'p50':>10}{'p95':>10}{'maks':>10}"]
+    for stage, s in data.items():
+        if "last" not in s:
+            continue
+        lines.append(
+            f"{stage:<28}{s['count']:>7}{s['last']:>10.1f}{s['p50']:>10.1f}"
+            f"{s['p95']:>10.1f}{s['max']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def dump(path=LOG_FILE):
+    """Tambahkan satu baris JSON {waktu, tahap: stats} ke file log."""
+    entry = {"waktu": time.strftime("%Y-%m-%d %H:%M:%S"), "tahap": stats()}
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return path
+
+
+# -------------------------------------------------------------
+#   PROFILER OPT-IN
+# -------------------------------------------------------------
+def profiling_requested(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    return "--profile" in argv or os.environ.get("CASH_TRACKER_PROFILE") == "1"
+
+
+def start_profiling(prefix=PROFILE_PREFIX):
+    """Jalankan cProfile + tracemalloc sampai proses selesai.
+
+    Saat exit ditulis <prefix>.prof (pstats), <prefix>.txt (30 fungsi
+    teratas menurut waktu kumulatif), <prefix>_memory.txt (30 baris kode
+    dengan alokasi terbesar) dan satu entri timing di LOG_FILE.
+    """
+    import cProfile
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+
+    def write_reports():
+        import pstats
+
+        profiler.disable()
+        profiler.dump_stats(prefix + ".prof")
+        with open(prefix + ".txt", "w") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(30)
+
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with open(prefix + "_memory.txt", "w") as f:
+            f.write(f"saat ini {current / 1e6:.1f} MB, puncak {peak / 1e6:.1f} MB\n\n")
+            for stat in snapshot.statistics("lineno")[:30]:
+                f.write(f"{stat}\n")
+
+        dump()
+
+    atexit.register(write_reports)
+    return profiler
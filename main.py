@@ -1,20 +1,34 @@
 # main.py
-import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
 import time
-from datetime import datetime
 
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+# diambil sebelum import lain supaya timer startup ikut menghitung import
+STARTUP_T0 = time.perf_counter()
 
-import matplotlib
-matplotlib.use("TkAgg")
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+import json
+import os
+import sys
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
 
+# matplotlib (TkAgg) diimpor saat panel grafik pertama kali tampil dan
+# watchdog setelah first paint, lihat create_charts / on_first_paint
 import data_store
-from charts import update_charts
+import importer
+import instrumentation
+import search
+import startup
+from instrumentation import timed
+from charts import apply_charts, chart_data
+from query import Query
+from refresh_scheduler import RefreshScheduler
+from refresh_worker import RefreshWorker
+from table_view import VirtualTable
+
+timer = startup.StartupTimer(STARTUP_T0)
+timer.mark("import")
 
 
 # -------------------------------------------------------------
@@ -101,128 +115,325 @@ def get_selected_date():
         return datetime.now()
 
 
+# -------------------------------------------------------------
+#   HELPER QUERY (BERDASAR KONTROL FILTER RIWAYAT)
+# -------------------------------------------------------------
+def _parse_jumlah(text):
+    try:
+        return int(text)
+    except ValueError:
+        return None  # kosong / bukan angka: tanpa batas
+
+
+def current_query():
+    """Query dari kontrol filter riwayat, tanpa filter tanggal (lihat compute_rows).
+
+    Objek yang sama dipakai tabel, ringkasan dan grafik.
+    """
+    tipe = cmb_filter_tipe.get()
+    kategori = cmb_filter_kategori.get()
+    return Query(
+        tipe=None if tipe == "Semua" else tipe,
+        kategori=None if kategori == "Semua" else kategori,
+        min_jumlah=_parse_jumlah(entry_min_jumlah.get()),
+        max_jumlah=_parse_jumlah(entry_max_jumlah.get()),
+        teks=search_var.get(),
+    )
+
+
 # -------------------------------------------------------------
 #   GUI UPDATE FUNCTIONS
 # -------------------------------------------------------------
+# Refresh dibagi dua: compute_* (baca store, filter, agregasi) berjalan di
+# RefreshWorker tanpa menyentuh widget; apply_* / refresh_* menerapkan
+# hasilnya ke widget di main loop Tk. Permintaan baru menggantikan yang
+# lama, jadi hasil yang sudah basi tidak pernah digambar.
+RefreshResult = namedtuple(
+    "RefreshResult",
+    ["inputs", "dates", "rows", "summary", "categories", "charts", "submitted"],
+)
+
+# diset watchdog: perubahan dari luar dimuat oleh refresh berikutnya
+reload_pending = threading.Event()
+
+
+def _refresh_inputs():
+    # dibaca di main loop; worker hanya menerima nilainya
+    return cmb_filter_tanggal.get(), get_selected_date(), view_mode.get(), current_query()
+
+
 def refresh_all():
-    data = data_store.load_json()
-
-    update_filter_options(data)
-    refresh_table(data)
-    refresh_summary(data)
-    refresh_category_list(data)
-
-    selected_date = get_selected_date()
-    mode = view_mode.get()
-    update_charts(
-        data,
-        selected_date,
-        mode,
-        figure_weekly,
-        canvas_weekly,
-        lbl_bulan,
-        figure_pie,
-        canvas_pie,
+    inputs = _refresh_inputs()
+    submitted = time.perf_counter()
+    worker.submit(
+        "all",
+        lambda: compute_refresh(inputs, submitted),
+        apply_refresh,
+    )
+    update_status_bar()
+
+
+def startup_refresh():
+    # refresh pertama: init (bisa mem-parse seluruh file) juga di worker
+    inputs = _refresh_inputs()
+    submitted = time.perf_counter()
+
+    def compute():
+        data_store.init_json()
+        return compute_refresh(inputs, submitted)
+
+    worker.submit("all", compute, apply_refresh)
+    update_status_bar()
+
+
+def compute_refresh(inputs, submitted):
+    tanggal_filter, selected_date, mode, q = inputs
+
+    if reload_pending.is_set():
+        reload_pending.clear()
+        data_store.reload_changes()
+
+    with timed("refresh.compute"):
+        store = data_store.read_store()
+        with timed("update_filter_options"):
+            dates = ["Semua"] + store.dates()
+        with timed("refresh_table"):
+            rows = compute_rows(store, tanggal_filter, selected_date, q)
+        with timed("refresh_summary"):
+            summary = compute_summary(store, q)
+        with timed("refresh_category_list"):
+            categories = store.categories()
+        with timed("refresh_charts"):
+            charts = chart_data(store, selected_date, mode, q)
+
+    if not q.filtered:
+        # identitas file diambil dulu; bila read_store() (di bawah kunci
+        # penulis) masih store yang sama, belum ada tulisan sejak disalin
+        signature = data_store.files_signature()
+        if data_store.read_store() is store:
+            try:
+                startup.save_summary(signature, summary)
+            except OSError:
+                pass  # cache hanya mempercepat startup berikutnya
+    return RefreshResult(inputs, dates, rows, summary, categories, charts, submitted)
+
+
+def apply_refresh(result):
+    tanggal_filter, selected_date, mode, q = result.inputs
+
+    with timed("refresh.apply"):
+        update_filter_options(result.dates)
+        refresh_table(result.rows, (tanggal_filter, q))
+        refresh_summary(result.summary, q.filtered)
+        refresh_category_list(result.categories)
+
+        # grafik dilewati bila belum dibangun atau filter/mode sudah
+        # berganti; create_charts / refresh_charts yang menyusul menggambarnya
+        if bar_chart is not None and (
+            (cmb_filter_tanggal.get(), view_mode.get(), current_query())
+            == (tanggal_filter, mode, q)
+        ):
+            apply_charts(
+                result.charts, selected_date, mode, bar_chart, lbl_bulan, pie_chart
+            )
+
+    # latensi yang dirasakan pengguna: dari permintaan sampai widget terisi
+    instrumentation.record(
+        "refresh_all", (time.perf_counter() - result.submitted) * 1000
     )
+    timer.mark("first_interactive")
+    check_startup_done()
+    update_status_bar()
+
+
+def refresh_charts():
+    if bar_chart is None:
+        return  # grafik belum dibangun; create_charts akan memanggil lagi
+    _, selected_date, mode, q = _refresh_inputs()
+
+    def compute():
+        with timed("refresh.compute_charts"):
+            return chart_data(data_store.read_store(), selected_date, mode, q)
+
+    worker.submit(
+        "charts",
+        compute,
+        lambda data: apply_charts(
+            data, selected_date, mode, bar_chart, lbl_bulan, pie_chart
+        ),
+    )
+
+
+def refresh_table(transaksi, key):
+    # hasil untuk filter yang sudah berganti dilewati; refresh berikutnya
+    # yang mengisi tabel
+    if key != (cmb_filter_tanggal.get(), current_query()):
+        return
+    tabel.set_rows(transaksi, key=key)
+    continue_query(transaksi, key)
 
 
-def refresh_table(data):
-    tabel.delete(*tabel.get_children())
-    tanggal_filter = cmb_filter_tanggal.get()
+def compute_rows(store, tanggal_filter, selected_date, q):
+    """Baris tabel untuk filter tanggal & Query `q` (dipanggil di worker).
 
-    transaksi = data["transaksi"]
+    Hasil query berupa SearchResult yang baru berisi langkah pertama;
+    sisanya diisi continue_query setelah tabel tampil.
+    """
     if tanggal_filter != "Semua":
-        transaksi = [
-            t
-            for t in transaksi
-            if datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m-%d")
-            == tanggal_filter
-        ]
-
-    for i, t in enumerate(transaksi, start=1):
-        waktu = datetime.fromtimestamp(t["timestamp"]).strftime("%H:%M:%S")
-        tag = "odd" if i % 2 else "even"
-        tabel.insert(
-            "",
-            "end",
-            values=(
-                i,
-                t["tipe"],
-                t["jumlah"],
-                t["kategori"],
-                t["keterangan"],
-                waktu,
-                t["timestamp"],  # kolom TS tersembunyi
-            ),
-            tags=(tag,),
-        )
+        start = datetime(selected_date.year, selected_date.month, selected_date.day)
+        q = q.within(start.timestamp(), (start + timedelta(days=1)).timestamp())
+    if not q.filtered:
+        return store if tanggal_filter == "Semua" else store.day(selected_date)
 
+    result = search.SearchResult(store, q)
+    result.extend(*store.query(q, limit=search.CHUNK))
+    return result
 
-def refresh_summary(data):
-    pemasukan = sum(
-        t["jumlah"] for t in data["transaksi"] if t["tipe"] == "pemasukan"
-    )
-    pengeluaran = sum(
-        t["jumlah"] for t in data["transaksi"] if t["tipe"] == "pengeluaran"
+
+def continue_query(rows, key):
+    """Periksa sisa rentang query selangkah demi selangkah di worker.
+
+    Setiap langkah menambah baris ke tabel tanpa mengubah posisi scroll;
+    refresh baru menggantikan rantai ini (submit dengan kunci yang sama).
+    """
+    if not isinstance(rows, search.SearchResult) or rows.next_ts is None:
+        return
+
+    def compute():
+        with timed("refresh.query"):
+            if data_store.read_store() is not rows.store:
+                return None  # data sudah berubah; refresh_all menyusul
+            return rows.store.query(
+                rows.q._replace(start_ts=rows.next_ts), limit=search.CHUNK
+            )
+
+    def apply(step):
+        if step is None:
+            return
+        rows.extend(*step)
+        refresh_table(rows, key)
+
+    worker.submit("table", compute, apply)
+
+
+def format_row(i, t):
+    return (
+        i,
+        t["tipe"],
+        t["jumlah"],
+        t["kategori"],
+        t["keterangan"],
+        t["waktu"],
+        t["id"],  # kolom ID tersembunyi
     )
 
-    lbl_saldo.config(text=f"Saldo : Rp {pemasukan - pengeluaran:,.0f}")
 
+def compute_summary(store, q=None):
+    """(saldo, pengeluaran bulan ini, pengeluaran hari ini).
+
+    Dengan Query filter `q`, hanya baris hasil query yang dihitung.
+    """
     now = datetime.now()
-    this_month = [
-        t
-        for t in data["transaksi"]
-        if datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m")
-        == now.strftime("%Y-%m")
-    ]
-
-    pengeluaran_bulan = sum(
-        t["jumlah"] for t in this_month if t["tipe"] == "pengeluaran"
-    )
-    lbl_pengeluaran_bulan.config(
-        text=f"Pengeluaran bulan ini : Rp {pengeluaran_bulan:,.0f}"
+    if q is None or not q.filtered:
+        agg = store.aggregates
+        return (
+            agg.saldo(),
+            agg.month_total(now, "pengeluaran"),
+            agg.day_total(now, "pengeluaran"),
+        )
+
+    hari = datetime(now.year, now.month, now.day)
+    bulan = datetime(now.year, now.month, 1)
+    bulan_depan = datetime(now.year + now.month // 12, now.month % 12 + 1, 1)
+
+    def total(q):
+        return store.query_sum(q).get(None, {})
+
+    semua = total(q)
+    bulan_ini = total(q.within(bulan.timestamp(), bulan_depan.timestamp()))
+    hari_ini = total(q.within(hari.timestamp(), (hari + timedelta(days=1)).timestamp()))
+    return (
+        semua.get("pemasukan", 0) - semua.get("pengeluaran", 0),
+        bulan_ini.get("pengeluaran", 0),
+        hari_ini.get("pengeluaran", 0),
     )
 
-    today = datetime.now().strftime("%Y-%m-%d")
-    today_data = [
-        t
-        for t in data["transaksi"]
-        if datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m-%d")
-        == today
-        and t["tipe"] == "pengeluaran"
-    ]
 
-    total_today = sum(t["jumlah"] for t in today_data)
+def refresh_summary(summary, filtered=False):
+    saldo, pengeluaran_bulan, total_today = summary
+    # ringkasan dari query filter riwayat diberi penanda
+    tanda = " (filter)" if filtered else ""
+
+    lbl_saldo.config(text=f"Saldo{tanda} : Rp {saldo:,.0f}")
+    lbl_pengeluaran_bulan.config(
+        text=f"Pengeluaran bulan ini{tanda} : Rp {pengeluaran_bulan:,.0f}"
+    )
     lbl_pengeluaran_hari.config(
-        text=f"Pengeluaran hari ini : Rp {total_today:,.0f}"
+        text=f"Pengeluaran hari ini{tanda} : Rp {total_today:,.0f}"
     )
 
 
-def refresh_category_list(data):
-    kategori = list({t["kategori"] for t in data["transaksi"]})
-    kategori.sort()
-    cmb_kategori["values"] = kategori
+def refresh_category_list(categories):
+    cmb_kategori["values"] = categories
+    cmb_filter_kategori["values"] = ["Semua"] + categories
 
 
-def update_filter_options(data=None):
-    if data is None:
-        data = data_store.load_json()
+def update_filter_options(dates):
+    cmb_filter_tanggal["values"] = dates
 
-    dates = sorted(
-        {
-            datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m-%d")
-            for t in data["transaksi"]
-        }
+
+# -------------------------------------------------------------
+#   DIAGNOSTIK (TIMING PER TAHAP)
+# -------------------------------------------------------------
+def update_status_bar():
+    if worker.busy():
+        lbl_status.config(text="Memuat data...")
+        return
+    s = instrumentation.stats().get("refresh_all")
+    if not s or "last" not in s:
+        return
+    lbl_status.config(
+        text=f"Refresh terakhir {s['last']:.0f} ms  ·  p95 {s['p95']:.0f} ms  "
+             f"·  {s['count']}x  (F12: diagnostik)"
+    )
+
+
+def show_diagnostics(event=None):
+    win = tk.Toplevel(root)
+    win.title("Diagnostik")
+    win.geometry("720x420")
+
+    text = tk.Text(win, font=("Consolas", 10), wrap="none")
+    text.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+
+    def isi():
+        text.config(state="normal")
+        text.delete("1.0", tk.END)
+        text.insert("1.0", instrumentation.format_report() + "\n\n(ms, "
+                    f"{instrumentation.WINDOW} sampel terakhir per tahap)")
+        text.config(state="disabled")
+
+    def simpan():
+        path = instrumentation.dump()
+        messagebox.showinfo("Diagnostik", f"Ditambahkan ke {path}", parent=win)
+
+    bar = tk.Frame(win)
+    bar.pack(fill="x", padx=10, pady=(0, 10))
+    ttk.Button(bar, text="Segarkan", style="Secondary.TButton", command=isi).pack(side="left")
+    ttk.Button(bar, text="Simpan ke log", style="Secondary.TButton", command=simpan).pack(
+        side="left", padx=(8, 0)
     )
-    cmb_filter_tanggal["values"] = ["Semua"] + list(dates)
+    ttk.Button(
+        bar, text="Reset", style="Secondary.TButton",
+        command=lambda: (instrumentation.reset(), isi()),
+    ).pack(side="left", padx=(8, 0))
+    isi()
 
 
 # -------------------------------------------------------------
 #   ADD / EDIT / DELETE
 # -------------------------------------------------------------
 def tambah_data():
-    data = data_store.load_json()
-
     tipe = cmb_tipe.get()
     jumlah_str = entry_jumlah.get()
     kategori = cmb_kategori.get()
@@ -257,12 +468,7 @@ def tambah_data():
         "timestamp": ts,
     }
 
-    data["transaksi"].append(new_trans)
-
-    if kategori and kategori not in data["kategori"]:
-        data["kategori"].append(kategori)
-
-    data_store.save_json(data)
+    data_store.add_transaction(new_trans)
     refresh_all()
 
     entry_jumlah.delete(0, tk.END)
@@ -270,25 +476,20 @@ def tambah_data():
 
 
 def edit_data():
-    selected = tabel.selection()
-    if not selected:
+    values = tabel.selected_values()
+    if not values:
         messagebox.showwarning("Error", "Pilih data")
         return
 
-    values = tabel.item(selected[0], "values")
-    ts_selected = float(values[6])
-
-    data = data_store.load_json()
-
-    idx = next(
-        (i for i, t in enumerate(data["transaksi"])
-         if t["timestamp"] == ts_selected),
-        None,
-    )
+    trans_id = int(values[6])
+    old = data_store.get_transaction(trans_id)
 
-    if idx is None:
+    if old is None:
         messagebox.showerror("Error", "Data tidak ditemukan")
         return
+    # isi saat form dibuka; dipakai untuk menggabung edit dengan perubahan
+    # dari instance lain yang masuk selama form terbuka
+    old = {k: old[k] for k in ("tipe", "jumlah", "kategori", "keterangan")}
 
     win = tk.Toplevel(root)
     win.title("Edit Data")
@@ -321,8 +522,6 @@ def edit_data():
     ket_e = tk.Entry(win)
     ket_e.pack(fill="x", padx=10)
 
-    old = data["transaksi"][idx]
-
     tipe_e.set(old["tipe"])
     jumlah_e.insert(0, old["jumlah"])
     kategori_e.insert(0, old["kategori"])
@@ -346,12 +545,19 @@ def edit_data():
             messagebox.showwarning("Error", "Keterangan tidak boleh kosong")
             return
 
-        data["transaksi"][idx]["tipe"] = tipe_e.get()
-        data["transaksi"][idx]["jumlah"] = jumlah_val
-        data["transaksi"][idx]["kategori"] = kategori_baru
-        data["transaksi"][idx]["keterangan"] = ket_baru
-
-        data_store.save_json(data)
+        try:
+            data_store.edit_transaction(
+                trans_id,
+                {
+                    "tipe": tipe_e.get(),
+                    "jumlah": jumlah_val,
+                    "kategori": kategori_baru,
+                    "keterangan": ket_baru,
+                },
+                expected=old,
+            )
+        except data_store.ConflictError as e:
+            messagebox.showerror("Edit", f"{e}.\nPerubahan tidak disimpan.")
         refresh_all()
         win.destroy()
 
@@ -361,53 +567,166 @@ def edit_data():
 
 
 def hapus_data():
-    selected = tabel.selection()
-    if not selected:
+    values = tabel.selected_values()
+    if not values:
         messagebox.showwarning("Error", "Pilih data")
         return
 
-    values = tabel.item(selected[0], "values")
-    ts_selected = float(values[6])
+    trans_id = int(values[6])
 
-    data = data_store.load_json()
+    if data_store.get_transaction(trans_id) is None:
+        messagebox.showerror("Error", "Data tidak ditemukan")
+        return
 
-    idx = next(
-        (i for i, t in enumerate(data["transaksi"])
-         if t["timestamp"] == ts_selected),
-        None,
-    )
+    data_store.delete_transaction(trans_id)
+    refresh_all()
 
-    if idx is None:
-        messagebox.showerror("Error", "Data tidak ditemukan")
+
+def import_csv():
+    path = filedialog.askopenfilename(
+        title="Import CSV",
+        filetypes=[("CSV", "*.csv"), ("Semua file", "*.*")],
+    )
+    if not path:
         return
 
-    del data["transaksi"][idx]
+    # parse, dedupe & tulis bisa makan puluhan detik untuk file besar:
+    # dikerjakan di worker supaya jendela tetap responsif
+    def compute():
+        try:
+            return importer.import_csv(path, kategori_default="Lainnya"), None
+        except Exception as e:
+            # error apa pun harus sampai ke apply: tombol & kursor dipulihkan di sana
+            return None, e
+
+    def apply(hasil):
+        result, error = hasil
+        btn_import.state(["!disabled"])
+        root.config(cursor="")
+        if error is not None:
+            messagebox.showerror("Import", f"Gagal import: {error}")
+            return
+        # satu refresh untuk seluruh file, bukan per baris
+        refresh_all()
+        messagebox.showinfo("Import", result.summary())
 
-    data_store.save_json(data)
-    refresh_all()
+    btn_import.state(["disabled"])
+    root.config(cursor="watch")
+    worker.submit("import", compute, apply)
+    update_status_bar()
 
 
 # -------------------------------------------------------------
 #   WATCHDOG (REALTIME JSON)
 # -------------------------------------------------------------
-class JSONEventHandler(FileSystemEventHandler):
-    def on_modified(self, event):
-        if data_store.refresh_lock:
-            return
-        if data_store.FILE_JSON in event.src_path:
-            refresh_all()
+def on_file_changed():
+    # hanya baris yang berubah yang ditambal ke store (oleh worker, lihat
+    # compute_refresh); tabel virtual, ringkasan dan grafik lalu membaca
+    # ulang dari store
+    reload_pending.set()
+    refresh_all()
 
 
 def start_watchdog():
+    # diimpor di sini: watchdog baru dibutuhkan setelah first paint
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    class JSONEventHandler(FileSystemEventHandler):
+        def on_modified(self, event):
+            self._handle(event.src_path)
+
+        def on_moved(self, event):
+            # snapshot ditulis atomik (tmp lalu rename)
+            self._handle(event.dest_path)
+
+        def _handle(self, path):
+            # dipanggil dari thread observer: cukup beri tahu scheduler
+            if path.endswith(data_store.watched_files()):
+                scheduler.notify(path)
+
     handler = JSONEventHandler()
     observer = Observer()
-    observer.schedule(handler, ".", recursive=False)
+    # backend shard menyimpan file per bulan di subfolder
+    for folder in {os.path.dirname(p) or "." for p in data_store.watched_files()}:
+        observer.schedule(handler, folder, recursive=False)
     observer.start()
 
 
+# -------------------------------------------------------------
+#   STARTUP BERTAHAP
+# -------------------------------------------------------------
+def create_charts():
+    """Impor matplotlib dan bangun kedua grafik saat panel grafik tampil."""
+    global bar_chart, pie_chart
+    if bar_chart is not None:
+        return
+
+    with timed("startup.matplotlib"):
+        import matplotlib
+        matplotlib.use("TkAgg")
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from charts import BarChart, PieChart
+
+    chart_placeholder.destroy()
+
+    figure_weekly = Figure(figsize=(4, 3), dpi=100)
+    canvas_weekly = FigureCanvasTkAgg(figure_weekly, right)
+    canvas_weekly.get_tk_widget().pack(
+        fill="both", expand=True, padx=10, pady=(0, 10)
+    )
+
+    figure_pie = Figure(figsize=(4, 3), dpi=100)
+    canvas_pie = FigureCanvasTkAgg(figure_pie, right)
+    canvas_pie.get_tk_widget().pack(
+        fill="both", expand=True, padx=10, pady=(0, 10)
+    )
+
+    # draw sesungguhnya terjadi saat Tk idle (draw_idle), jadi diukur di sini
+    instrumentation.wrap_method(canvas_weekly, "draw", "chart.draw_bar")
+    instrumentation.wrap_method(canvas_pie, "draw", "chart.draw_pie")
+
+    bar_chart = BarChart(figure_weekly, canvas_weekly)
+    pie_chart = PieChart(figure_pie, canvas_pie)
+    timer.mark("charts_ready")
+    check_startup_done()
+
+    refresh_charts()
+
+
+def on_first_paint(event):
+    if event.widget is not root or "first_paint" in timer.marks:
+        return
+    # after_idle: jalankan setelah Tk selesai menggambar jendela
+    root.after_idle(_after_first_paint)
+
+
+def _after_first_paint():
+    timer.mark("first_paint")
+    root.after_idle(create_charts)
+    threading.Thread(target=start_watchdog, daemon=True).start()
+
+
+def check_startup_done():
+    if timer.reported or not timer.done("first_interactive", "charts_ready"):
+        return
+    try:
+        timer.dump()
+    except OSError:
+        timer.reported = True
+    if "--startup-timer" in sys.argv:
+        # mode ukur: cetak hasil lalu tutup (untuk melacak regresi cold start)
+        print(json.dumps(timer.marks, indent=4))
+        root.after(0, root.destroy)
+
+
 # -------------------------------------------------------------
 #   GUI TKINTER
 # -------------------------------------------------------------
+if instrumentation.profiling_requested():
+    instrumentation.start_profiling()
+
 root = tk.Tk()
 root.title("Cash Tracker")
 
@@ -422,6 +741,14 @@ root.configure(bg=WINDOW_BG)
 
 setup_styles()
 
+# STATUS BAR (dipack lebih dulu supaya tetap terlihat saat jendela mengecil)
+lbl_status = tk.Label(
+    root, text="", anchor="w", font=("Segoe UI", 9), bg=WINDOW_BG, fg=TEXT_SUB
+)
+lbl_status.pack(side="bottom", fill="x", padx=10, pady=(0, 4))
+lbl_status.bind("<Button-1>", show_diagnostics)
+root.bind("<F12>", show_diagnostics)
+
 main_container = tk.Frame(root, bg=WINDOW_BG)
 main_container.pack(fill="both", expand=True, padx=10, pady=10)
 
@@ -578,18 +905,64 @@ cmb_filter_tanggal.set("Semua")
 cmb_filter_tanggal.pack(side="left")
 cmb_filter_tanggal.bind("<<ComboboxSelected>>", lambda e: refresh_all())
 
-columns = ("No", "Tipe", "Jumlah", "Kategori", "Keterangan", "Waktu", "TS")
-tabel = ttk.Treeview(history_card, columns=columns, show="headings", height=10)
+tk.Label(filter_frame, text="Cari:", bg=CARD_BG, fg=TEXT_MAIN).pack(
+    side="left", padx=(15, 5)
+)
+
+# cari di keterangan & kategori; tabel diperbarui setiap ketikan
+search_var = tk.StringVar()
+entry_cari = tk.Entry(filter_frame, textvariable=search_var, width=28)
+entry_cari.pack(side="left")
+search_var.trace_add("write", lambda *args: refresh_all())
+
+# filter lain; bersama tanggal & teks membentuk satu Query (current_query)
+query_frame = tk.Frame(history_card, bg=CARD_BG)
+query_frame.pack(anchor="w", padx=10, pady=(0, 4))
+
+tk.Label(query_frame, text="Tipe:", bg=CARD_BG, fg=TEXT_MAIN).pack(
+    side="left", padx=(0, 5)
+)
+cmb_filter_tipe = ttk.Combobox(
+    query_frame, values=["Semua", "pemasukan", "pengeluaran"], state="readonly", width=12
+)
+cmb_filter_tipe.set("Semua")
+cmb_filter_tipe.pack(side="left")
+cmb_filter_tipe.bind("<<ComboboxSelected>>", lambda e: refresh_all())
+
+tk.Label(query_frame, text="Kategori:", bg=CARD_BG, fg=TEXT_MAIN).pack(
+    side="left", padx=(15, 5)
+)
+cmb_filter_kategori = ttk.Combobox(
+    query_frame, values=["Semua"], state="readonly", width=18
+)
+cmb_filter_kategori.set("Semua")
+cmb_filter_kategori.pack(side="left")
+cmb_filter_kategori.bind("<<ComboboxSelected>>", lambda e: refresh_all())
+
+tk.Label(query_frame, text="Jumlah:", bg=CARD_BG, fg=TEXT_MAIN).pack(
+    side="left", padx=(15, 5)
+)
+entry_min_jumlah = tk.Entry(query_frame, width=10)
+entry_min_jumlah.pack(side="left")
+tk.Label(query_frame, text="-", bg=CARD_BG, fg=TEXT_MAIN).pack(side="left", padx=3)
+entry_max_jumlah = tk.Entry(query_frame, width=10)
+entry_max_jumlah.pack(side="left")
+for entry in (entry_min_jumlah, entry_max_jumlah):
+    entry.bind("<Return>", lambda e: refresh_all())
+    entry.bind("<FocusOut>", lambda e: refresh_all())
+
+columns = ("No", "Tipe", "Jumlah", "Kategori", "Keterangan", "Waktu", "ID")
+tabel = VirtualTable(history_card, columns, format_row, bg=CARD_BG)
 
 for col in columns:
-    tabel.heading(col, text=col)
-    if col == "TS":
-        tabel.column(col, width=0, stretch=False)
+    tabel.tree.heading(col, text=col)
+    if col == "ID":
+        tabel.tree.column(col, width=0, stretch=False)
     else:
-        tabel.column(col, width=120, anchor="w")
+        tabel.tree.column(col, width=120, anchor="w")
 
-tabel.tag_configure("odd", background="#fafafa")
-tabel.tag_configure("even", background="#ffffff")
+tabel.tree.tag_configure("odd", background="#fafafa")
+tabel.tree.tag_configure("even", background="#ffffff")
 
 tabel.pack(fill="both", expand=True, padx=10, pady=(0, 5))
 
@@ -604,6 +977,11 @@ ttk.Button(
     btn_bar, text="Hapus", style="Danger.TButton", command=hapus_data
 ).pack(side="left", padx=(8, 0))
 
+btn_import = ttk.Button(
+    btn_bar, text="Import CSV", style="Secondary.TButton", command=import_csv
+)
+btn_import.pack(side="right")
+
 # RIGHT PANEL (GRAFIK)
 right_header = tk.Frame(right, bg="#fafafa")
 right_header.pack(fill="x", pady=(10, 0))
@@ -629,7 +1007,7 @@ btn_week = tk.Radiobutton(
     value="mingguan",
     bg="#fafafa",
     fg=TEXT_MAIN,
-    command=refresh_all,
+    command=refresh_charts,
 )
 btn_week.pack(side="left", padx=10)
 
@@ -640,26 +1018,48 @@ btn_month = tk.Radiobutton(
     value="bulanan",
     bg="#fafafa",
     fg=TEXT_MAIN,
-    command=refresh_all,
+    command=refresh_charts,
 )
 btn_month.pack(side="left", padx=10)
 
-figure_weekly = Figure(figsize=(4, 3), dpi=100)
-canvas_weekly = FigureCanvasTkAgg(figure_weekly, right)
-canvas_weekly.get_tk_widget().pack(
-    fill="both", expand=True, padx=10, pady=(0, 10)
-)
-
-figure_pie = Figure(figsize=(4, 3), dpi=100)
-canvas_pie = FigureCanvasTkAgg(figure_pie, right)
-canvas_pie.get_tk_widget().pack(
-    fill="both", expand=True, padx=10, pady=(0, 10)
+# mode jangka panjang, dibaca dari rollup (lihat rollups.py)
+for text, value in (
+    ("Kuartalan", "kuartalan"),
+    ("Tahunan", "tahunan"),
+    ("5 Tahun", "multi_tahun"),
+):
+    tk.Radiobutton(
+        mode_frame,
+        text=text,
+        variable=view_mode,
+        value=value,
+        bg="#fafafa",
+        fg=TEXT_MAIN,
+        command=refresh_charts,
+    ).pack(side="left", padx=10)
+
+# grafik dibangun oleh create_charts setelah panel ini tampil
+bar_chart = pie_chart = None
+chart_placeholder = tk.Label(
+    right, text="Memuat grafik...", bg="#fafafa", fg=TEXT_SUB, width=48
 )
+chart_placeholder.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
 # START
-data_store.init_json()
-refresh_all()
+# ringkasan dari cache ditampilkan sebelum data selesai dimuat
+cached_summary = startup.load_summary(data_store.files_signature())
+if cached_summary is not None:
+    refresh_summary(cached_summary)
+
+worker = RefreshWorker(root)
+startup_refresh()
+
+scheduler = RefreshScheduler(
+    root, on_file_changed, is_echo=data_store.is_own_write
+)
 
-threading.Thread(target=start_watchdog, daemon=True).start()
+root.bind("<Map>", on_first_paint, add="+")
+timer.mark("window")
 
 root.mainloop()
+worker.shutdown()
@@ -0,0 +1,171 @@
+# query.py
+"""Query multi-kriteria atas riwayat transaksi + planner berbasis indeks.
+
+Query menggabungkan rentang waktu, tipe, satu atau lebih kategori, rentang
+jumlah dan teks (lihat search.py). Tabel riwayat, ringkasan dan grafik
+memakai objek Query yang sama: tabel lewat store.query(), ringkasan &
+grafik lewat store.query_sum() dengan rentang waktu periodenya
+(Query.within).
+
+TransactionStore memilih satu indeks sebagai sumber kandidat: rentang
+waktu (bisect pada indeks waktu), posting list kategori, atau posting
+list tipe, yaitu yang perkiraan banyak barisnya paling kecil (plan()).
+Posting list terurut waktu, jadi rentang waktu tetap dipotong dengan
+bisect. Kriteria lain diperiksa langsung pada kolom kandidat (id
+kategori/tipe, jumlah, id string teks) dengan filter_rids, tanpa
+memindai seluruh riwayat. Backend SQLite menerjemahkan Query ke WHERE dan
+menyerahkan pemilihan indeks ke planner SQLite; backend shard melewati
+file bulan yang menurut manifest tidak punya kategori/tipe yang dicari.
+"""
+from array import array
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy ikut terpasang bersama matplotlib
+    np = None
+
+import search
+
+# indeks sumber kandidat yang bisa dipilih planner
+INDEXES = ("waktu", "kategori", "tipe")
+
+# biaya relatif satu kandidat dari posting list dibanding dari indeks
+# waktu (potongan beberapa posting list perlu digabung & diurutkan lagi)
+POSTING_COST = 2
+
+# index: salah satu INDEXES; estimate: perkiraan banyak kandidat;
+# lo/hi: posisi rentang waktu query pada indeks waktu
+Plan = namedtuple("Plan", ["index", "estimate", "lo", "hi"])
+
+_FIELDS = ("start_ts", "end_ts", "tipe", "kategori", "min_jumlah", "max_jumlah", "teks")
+
+
+class Query(namedtuple("Query", _FIELDS)):
+    """Kriteria filter riwayat; None berarti tanpa batas untuk field itu.
+
+    start_ts <= timestamp < end_ts; `kategori` berupa himpunan nama (satu
+    nama string juga boleh); min_jumlah <= jumlah <= max_jumlah; `teks`
+    dicari di keterangan & kategori seperti kotak Cari (tiap kata =
+    prefix). Query bisa di-hash, jadi bisa dipakai sebagai kunci cache.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, start_ts=None, end_ts=None, tipe=None, kategori=None,
+                min_jumlah=None, max_jumlah=None, teks=""):
+        if isinstance(kategori, str):
+            kategori = frozenset((kategori,))
+        elif kategori is not None:
+            kategori = frozenset(kategori)
+        return super().__new__(
+            cls, start_ts, end_ts, tipe, kategori, min_jumlah, max_jumlah, teks or ""
+        )
+
+    @property
+    def filtered(self):
+        """True bila ada kriteria selain rentang waktu."""
+        return (
+            self.tipe is not None
+            or self.kategori is not None
+            or self.min_jumlah is not None
+            or self.max_jumlah is not None
+            or bool(search.tokens(self.teks))
+        )
+
+    def within(self, start_ts, end_ts):
+        """Query yang sama, dibatasi juga ke start_ts <= timestamp < end_ts."""
+        if self.start_ts is not None and (start_ts is None or self.start_ts > start_ts):
+            start_ts = self.start_ts
+        if self.end_ts is not None and (end_ts is None or self.end_ts < end_ts):
+            end_ts = self.end_ts
+        return self._replace(start_ts=start_ts, end_ts=end_ts)
+
+    def match(self, t):
+        """True bila baris `t` (dict / RowView) memenuhi query."""
+        ts = t["timestamp"]
+        if self.start_ts is not None and ts < self.start_ts:
+            return False
+        if self.end_ts is not None and ts >= self.end_ts:
+            return False
+        if self.tipe is not None and t["tipe"] != self.tipe:
+            return False
+        if self.kategori is not None and t["kategori"] not in self.kategori:
+            return False
+        if self.min_jumlah is not None and t["jumlah"] < self.min_jumlah:
+            return False
+        if self.max_jumlah is not None and t["jumlah"] > self.max_jumlah:
+            return False
+        toks = search.tokens(self.teks)
+        if toks:
+            words = search.tokens(t["keterangan"]) + search.tokens(t["kategori"])
+            return all(any(w.startswith(tok) for w in words) for tok in toks)
+        return True
+
+
+def choose(estimates):
+    """(indeks, perkiraan) termurah dari {indeks: perkiraan banyak kandidat}.
+
+    Bila sama murah, indeks waktu yang dipakai (potongannya sudah terurut).
+    """
+    best = None
+    for index in INDEXES:
+        if index not in estimates:
+            continue
+        cost = estimates[index] * (1 if index == "waktu" else POSTING_COST)
+        if best is None or cost < best[0]:
+            best = (cost, index, estimates[index])
+    return best[1], best[2]
+
+
+def filter_rids(cols, rids, q, terms=None, skip=()):
+    """rid di `rids` (urutan dipertahankan) yang memenuhi `q`.
+
+    Rentang waktu dianggap sudah dijamin oleh sumber kandidat; field di
+    `skip` (indeks yang menghasilkan kandidat) juga tidak diperiksa ulang.
+    `terms` hasil SearchIndex.terms(q.teks), None bila tanpa teks.
+    """
+    kategori = tipe = None
+    if q.kategori is not None and "kategori" not in skip:
+        kategori = {cols.kategori_names.find(k) for k in q.kategori} - {None}
+        if not kategori:
+            return array("q")
+    if q.tipe is not None and "tipe" not in skip:
+        tipe = cols.tipe_names.find(q.tipe)
+        if tipe is None:
+            return array("q")
+    if terms and any(not ket and not kat for ket, kat in terms):
+        return array("q")
+    lo_j, hi_j = q.min_jumlah, q.max_jumlah
+    if kategori is None and tipe is None and lo_j is None and hi_j is None and not terms:
+        return array("q", rids)
+
+    if np is not None and len(rids):
+        rid = np.frombuffer(rids, dtype=rids.typecode)
+        mask = np.ones(len(rid), dtype=bool)
+        if kategori is not None:
+            mask &= np.isin(_view(cols.kategori)[rid], list(kategori))
+        if tipe is not None:
+            mask &= _view(cols.tipe)[rid] == tipe
+        if lo_j is not None or hi_j is not None:
+            jumlah = _view(cols.jumlah)[rid]
+            if lo_j is not None:
+                mask &= jumlah >= lo_j
+            if hi_j is not None:
+                mask &= jumlah <= hi_j
+        rids = array("q", rid[mask].tobytes())
+    else:
+        kat_col, tipe_col, jumlah = cols.kategori, cols.tipe, cols.jumlah
+        rids = array("q", (
+            r for r in rids
+            if (kategori is None or kat_col[r] in kategori)
+            and (tipe is None or tipe_col[r] == tipe)
+            and (lo_j is None or jumlah[r] >= lo_j)
+            and (hi_j is None or jumlah[r] <= hi_j)
+        ))
+    return search.filter_terms(cols, rids, terms) if terms else rids
+
+
+def _view(arr):
+    # view tanpa salinan; hanya dipakai selama satu pemanggilan
+    return np.frombuffer(arr, dtype=arr.typecode)
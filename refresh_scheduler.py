@@ -0,0 +1,69 @@
+# refresh_scheduler.py
+import threading
+import time
+
+
+class RefreshScheduler:
+    """Kumpulkan notifikasi perubahan lalu jalankan satu refresh di main loop Tk.
+
+    `notify()` aman dipanggil dari thread mana pun (mis. thread observer
+    watchdog). Notifikasi yang datang beruntun dalam jendela `debounce_ms`
+    digabung menjadi satu pemanggilan `callback`. Callback selalu
+    dijalankan dari main loop Tk lewat `root.after`, karena Tk tidak boleh
+    disentuh dari thread lain.
+
+    `is_echo(path)` opsional: path yang ternyata hasil tulisan aplikasi
+    sendiri dibuang saat jendela debounce selesai.
+
+    Poll hanya dijadwalkan selama ada notifikasi yang menunggu: notify()
+    pertama menjadwalkannya, poll menjadwalkan ulang dirinya sampai jendela
+    debounce selesai, lalu berhenti. Tanpa perubahan file main loop tidak
+    dibangunkan sama sekali. root.after dari thread lain diteruskan
+    tkinter ke thread Tk (Tcl ber-thread).
+    """
+
+    def __init__(self, root, callback, debounce_ms=200, poll_ms=50, is_echo=None):
+        self.root = root
+        self.callback = callback
+        self.debounce = debounce_ms / 1000.0
+        self.poll_ms = poll_ms
+        self.is_echo = is_echo
+
+        self._lock = threading.Lock()
+        self._paths = set()
+        self._pending = False
+        self._last = 0.0
+        self._armed = False  # poll sudah dijadwalkan
+
+    def notify(self, path=None):
+        with self._lock:
+            self._pending = True
+            self._last = time.monotonic()
+            if path is not None:
+                self._paths.add(path)
+            arm, self._armed = not self._armed, True
+        if arm:
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        try:
+            self._flush()
+        finally:
+            with self._lock:
+                # notifikasi masih menunggu jendela debounce: poll lagi
+                arm = self._armed = self._pending
+            if arm:
+                self.root.after(self.poll_ms, self._poll)
+
+    def _flush(self):
+        with self._lock:
+            if not self._pending or time.monotonic() - self._last < self.debounce:
+                return
+            paths, self._paths = self._paths, set()
+            self._pending = False
+
+        if paths and self.is_echo is not None:
+            if all(self.is_echo(p) for p in paths):
+                return
+
+        self.callback()
@@ -0,0 +1,86 @@
+# refresh_worker.py
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RefreshWorker:
+    """Jalankan komputasi refresh di thread pool, terapkan hasilnya di main loop Tk.
+
+    `submit(key, compute, apply)`: `compute()` berjalan di worker (boleh
+    baca file & agregasi, tidak boleh menyentuh widget), lalu
+    `apply(hasil)` dipanggil dari main loop Tk. Hasil diserahkan lewat
+    antrean yang dipoll dengan `root.after`, karena Tk tidak boleh
+    dipanggil dari thread lain. Poll hanya berjalan selama ada permintaan
+    yang belum diterapkan: submit() menjadwalkannya dan poll berhenti
+    menjadwalkan ulang dirinya begitu semua hasil sudah diterapkan.
+
+    Setiap submit dengan `key` yang sama menggantikan permintaan
+    sebelumnya: yang belum mulai dibatalkan, yang sedang berjalan tetap
+    selesai tetapi hasilnya dibuang. Pengecualian dari `compute` dilempar
+    ulang di main loop supaya terlihat seperti error callback Tk biasa.
+    """
+
+    def __init__(self, root, max_workers=2, poll_ms=15):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="refresh")
+
+        self._lock = threading.Lock()
+        self._generation = {}  # key -> generasi terbaru
+        self._futures = {}     # key -> future terbaru
+        self._done = queue.SimpleQueue()
+        self._armed = False  # poll sudah dijadwalkan; hanya disentuh thread Tk
+
+    def submit(self, key, compute, apply):
+        with self._lock:
+            gen = self._generation[key] = self._generation.get(key, 0) + 1
+            old = self._futures.get(key)
+            if old is not None:
+                old.cancel()
+            self._futures[key] = self.executor.submit(self._run, key, gen, compute, apply)
+        if not self._armed:
+            self._armed = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def busy(self, key=None):
+        """True bila masih ada permintaan (untuk `key`) yang belum diterapkan."""
+        with self._lock:
+            futures = self._futures.values() if key is None else [self._futures.get(key)]
+            return any(f is not None and not f.done() for f in futures)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_current(self, key, gen):
+        with self._lock:
+            return self._generation.get(key) == gen
+
+    def _run(self, key, gen, compute, apply):
+        if not self._is_current(key, gen):
+            return
+        try:
+            result, error = compute(), None
+        except Exception as e:  # diteruskan ke main loop
+            result, error = None, e
+        self._done.put((key, gen, apply, result, error))
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    key, gen, apply, result, error = self._done.get_nowait()
+                except queue.Empty:
+                    break
+                # hasil dari permintaan yang sudah digantikan dibuang
+                if not self._is_current(key, gen):
+                    continue
+                if error is not None:
+                    raise error
+                apply(result)
+        finally:
+            # _run menaruh hasil sebelum future-nya selesai: bila tidak ada
+            # yang sibuk lagi, semua hasil sudah ada di antrean
+            self._armed = self.busy() or not self._done.empty()
+            if self._armed:
+                self.root.after(self.poll_ms, self._poll)
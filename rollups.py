@@ -0,0 +1,214 @@
+# rollups.py
+"""Total pra-agregasi per hari / pekan / bulan / tahun, per tipe & kategori.
+
+Dipakai grafik jangka panjang (kuartalan, tahunan, 5 tahun): total satu
+tahun cukup dibaca dari beberapa entri rollup, bukan dijumlah ulang dari
+baris mentah. TransactionStore memperbarui rollup secara inkremental
+setiap ada baris ditambah/diubah/dihapus; backend JSON menulisnya ke
+data_cash.rollups.json setiap snapshot ditulis, supaya bisa diperiksa
+atau dibangun ulang:
+
+    python -m rollups verify
+    python -m rollups rebuild
+
+Kunci periode memakai kunci tanggal integer dari datekeys; tahun = bulan // 12.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+
+LEVELS = ("hari", "pekan", "bulan", "tahun")
+FILE_ROLLUPS = "data_cash.rollups.json"
+
+
+class Rollups:
+    """{level: {kunci periode: {(kategori, tipe): [total, banyak baris]}}}."""
+
+    def __init__(self):
+        self.levels = {level: {} for level in LEVELS}
+
+    # ----------------------------- mutasi -----------------------------
+    def add(self, hari, pekan, bulan, kategori, tipe, jumlah, n=1):
+        """Tambahkan `n` baris berjumlah total `jumlah` (n negatif = hapus)."""
+        for level, key in (
+            ("hari", hari), ("pekan", pekan), ("bulan", bulan), ("tahun", bulan // 12)
+        ):
+            per_periode = self.levels[level]
+            grup = per_periode.get(key)
+            if grup is None:
+                grup = per_periode[key] = {}
+            entry = grup.get((kategori, tipe))
+            if entry is None:
+                grup[(kategori, tipe)] = [jumlah, n]
+                continue
+            entry[0] += jumlah
+            entry[1] += n
+            if not entry[1]:
+                del grup[(kategori, tipe)]
+                if not grup:
+                    del per_periode[key]
+
+    def copy(self):
+        new = Rollups()
+        new.levels = {
+            level: {
+                key: {kt: entry[:] for kt, entry in grup.items()}
+                for key, grup in per_periode.items()
+            }
+            for level, per_periode in self.levels.items()
+        }
+        return new
+
+    # ------------------------------ query -----------------------------
+    def totals(self, level, lo, hi):
+        """{kunci: {tipe: total}} untuk lo <= kunci <= hi."""
+        hasil = {}
+        for key, grup in self._range(level, lo, hi):
+            total = hasil.setdefault(key, {})
+            for (_, tipe), (jumlah, _) in grup.items():
+                total[tipe] = total.get(tipe, 0) + jumlah
+        return hasil
+
+    def by_kategori(self, level, lo, hi):
+        """{kategori: {tipe: total}} untuk periode lo..hi (inklusif)."""
+        hasil = {}
+        for _, grup in self._range(level, lo, hi):
+            for (kategori, tipe), (jumlah, _) in grup.items():
+                total = hasil.setdefault(kategori, {})
+                total[tipe] = total.get(tipe, 0) + jumlah
+        return hasil
+
+    def _range(self, level, lo, hi):
+        per_periode = self.levels[level]
+        if hi - lo + 1 <= len(per_periode):
+            for key in range(lo, hi + 1):
+                if key in per_periode:
+                    yield key, per_periode[key]
+        else:
+            for key in sorted(per_periode):
+                if lo <= key <= hi:
+                    yield key, per_periode[key]
+
+    # ------------------------- simpan / periksa ------------------------
+    def to_json(self):
+        return {
+            level: {
+                str(key): [[k, t, jumlah, n] for (k, t), (jumlah, n) in grup.items()]
+                for key, grup in per_periode.items()
+            }
+            for level, per_periode in self.levels.items()
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        rollups = cls()
+        for level in LEVELS:
+            rollups.levels[level] = {
+                int(key): {(k, t): [jumlah, n] for k, t, jumlah, n in entries}
+                for key, entries in data.get(level, {}).items()
+            }
+        return rollups
+
+    def diff(self, other, tol=0.005):
+        """Daftar (level, kunci, kategori, tipe, nilai_ini, nilai_lain) yang berbeda."""
+        beda = []
+        for level in LEVELS:
+            a, b = self.levels[level], other.levels[level]
+            for key in a.keys() | b.keys():
+                ga, gb = a.get(key, {}), b.get(key, {})
+                for kt in ga.keys() | gb.keys():
+                    va, vb = ga.get(kt, [0, 0]), gb.get(kt, [0, 0])
+                    if va[1] != vb[1] or not math.isclose(va[0], vb[0], abs_tol=tol):
+                        beda.append((level, key) + kt + (tuple(va), tuple(vb)))
+        return beda
+
+
+def from_columns(cols, rids=None):
+    """Bangun Rollups dari ColumnarTransactions (default: semua baris).
+
+    Baris dikelompokkan dulu per (hari, pekan, bulan, kategori, tipe), jadi
+    biaya per baris hanya satu lookup dict.
+    """
+    rollups = Rollups()
+    hari, pekan, bulan = cols.hari, cols.pekan, cols.bulan
+    kategori, tipe, jumlah = cols.kategori, cols.tipe, cols.jumlah
+
+    grup = {}
+    for rid in cols.order if rids is None else rids:
+        key = (hari[rid], pekan[rid], bulan[rid], kategori[rid], tipe[rid])
+        g = grup.get(key)
+        if g is None:
+            grup[key] = [jumlah[rid], 1]
+        else:
+            g[0] += jumlah[rid]
+            g[1] += 1
+
+    for (h, p, b, k, t), (total, n) in grup.items():
+        rollups.add(h, p, b, cols.kategori_names[k], cols.tipe_names[t], total, n)
+    return rollups
+
+
+def save(rollups, journal_seq, path=FILE_ROLLUPS):
+    """Tulis rollup (state pada `journal_seq`) secara atomik."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"journal_seq": journal_seq, "levels": rollups.to_json()}, f)
+    os.replace(tmp, path)
+
+
+def load(path=FILE_ROLLUPS):
+    """(Rollups, journal_seq) dari file, atau (None, None) bila tidak ada/rusak."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return Rollups.from_json(data["levels"]), data["journal_seq"]
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+
+# -------------------------------------------------------------
+#   CLI
+# -------------------------------------------------------------
+def main(argv=None):
+    import data_store
+
+    parser = argparse.ArgumentParser(description="Periksa / bangun ulang rollup ledger")
+    parser.add_argument("cmd", choices=("verify", "rebuild"))
+    args = parser.parse_args(argv)
+
+    path = data_store.FILE_ROLLUPS
+    data = data_store.load_json()
+    seq = data.get("journal_seq", 0)
+    fresh = from_columns(data["transaksi"])
+
+    if args.cmd == "rebuild":
+        save(fresh, seq, path)
+        print(f"{path} ditulis ulang ({len(data['transaksi'])} transaksi)")
+        return 0
+
+    ok = True
+    beda = data_store.get_store().rollups.diff(fresh)
+    print(f"rollup di memori  : {'cocok' if not beda else f'{len(beda)} entri beda'}")
+    ok &= not beda
+
+    saved, saved_seq = load(path)
+    if saved is None:
+        print(f"{path}: tidak ada")
+    elif saved_seq != seq:
+        # file ditulis bersama snapshot; journal sesudahnya belum masuk
+        print(f"{path}: tertinggal (seq {saved_seq}, data seq {seq})")
+    else:
+        beda_file = saved.diff(fresh)
+        print(f"{path}: {'cocok' if not beda_file else f'{len(beda_file)} entri beda'}")
+        beda += beda_file
+        ok &= not beda_file
+
+    for entry in beda[:20]:
+        print("  ", entry)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
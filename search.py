@@ -0,0 +1,209 @@
+# search.py
+"""Pencarian teks atas keterangan & kategori untuk tabel riwayat.
+
+Indeks terbalik memetakan token (huruf kecil, dipisah di luar huruf/angka)
+ke id string di StringTable kolom keterangan / kategori, bukan ke baris:
+string yang dipakai banyak baris cukup diindeks sekali, dan string baru
+(dari tambah/edit) diindeks pada pencarian berikutnya. Token disimpan
+terurut sehingga prefix dicari dengan bisect.
+
+Baris yang cocok didapat dengan mencocokkan kolom id keterangan/kategori
+terhadap id hasil indeks (NumPy bila ada), mengikuti urutan indeks waktu
+TransactionStore. Karena yang dibaca adalah kolom saat itu, edit & hapus
+langsung terlihat tanpa memperbarui postingan per baris.
+
+Setiap kata di query diperlakukan sebagai prefix dan semuanya harus cocok
+("mak sia" menemukan "makan siang").
+"""
+import bisect
+import re
+import threading
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy ikut terpasang bersama matplotlib
+    np = None
+
+from columnar import RowView
+
+# banyak baris indeks waktu yang dipindai per langkah pencarian bertahap
+CHUNK = 200_000
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokens(text):
+    """Token pencarian dari `text`: kata huruf kecil."""
+    return _TOKEN.findall(text.lower())
+
+
+class TokenIndex:
+    """Indeks terbalik token -> id string untuk satu StringTable."""
+
+    def __init__(self, table):
+        self.table = table
+        self.n = 0          # banyak string yang sudah diindeks
+        self.tokens = []    # token unik, terurut
+        self.postings = {}  # token -> [id string]
+
+    def sync(self):
+        """Indeks string yang ditambahkan ke tabel sejak sync terakhir."""
+        table = self.table
+        n = len(table)
+        if n == self.n:
+            return
+        baru = []
+        for sid in range(self.n, n):
+            for tok in set(tokens(table[sid])):
+                ids = self.postings.get(tok)
+                if ids is None:
+                    self.postings[tok] = [sid]
+                    baru.append(tok)
+                else:
+                    ids.append(sid)
+        if baru:
+            # sort bawaan cukup menggabungkan ekor baru ke daftar yang sudah terurut
+            self.tokens.extend(baru)
+            self.tokens.sort()
+        self.n = n
+
+    def match(self, prefix):
+        """Himpunan id string yang punya token berawalan `prefix`."""
+        self.sync()
+        hasil = set()
+        toks = self.tokens
+        i = bisect.bisect_left(toks, prefix)
+        while i < len(toks) and toks[i].startswith(prefix):
+            hasil.update(self.postings[toks[i]])
+            i += 1
+        return hasil
+
+
+class SearchIndex:
+    """Indeks token keterangan & kategori milik satu ColumnarTransactions.
+
+    Salinan store (TransactionStore.copy) memakai indeks yang sama dari
+    thread worker, jadi terms() dijalankan di bawah kunci. Id hasilnya bisa
+    menunjuk string yang ditambahkan setelah salinan dibuat; baris salinan
+    tidak pernah memakai id itu.
+    """
+
+    def __init__(self, cols):
+        self.cols = cols
+        self._keterangan = TokenIndex(cols.keterangan_strings)
+        self._kategori = TokenIndex(cols.kategori_names)
+        self._lock = threading.Lock()
+
+    def terms(self, query):
+        """[(id keterangan, id kategori)] untuk tiap kata di `query`."""
+        with self._lock:
+            if self._keterangan.table is not self.cols.keterangan_strings:
+                self._keterangan = TokenIndex(self.cols.keterangan_strings)
+            if self._kategori.table is not self.cols.kategori_names:
+                self._kategori = TokenIndex(self.cols.kategori_names)
+            return [
+                (self._keterangan.match(tok), self._kategori.match(tok))
+                for tok in tokens(query)
+            ]
+
+    def filter(self, rids, terms):
+        """rid di `rids` (urutan dipertahankan) yang cocok dengan semua term."""
+        return filter_terms(self.cols, rids, terms)
+
+
+def filter_terms(cols, rids, terms):
+    """rid di `rids` yang cocok dengan `terms` (hasil SearchIndex.terms)."""
+    if not terms or not rids:
+        return array("q", rids)
+    if any(not ket and not kat for ket, kat in terms):
+        return array("q")
+
+    if np is not None:
+        rid = np.frombuffer(rids, dtype=rids.typecode)
+        ket = np.frombuffer(cols.keterangan, dtype=cols.keterangan.typecode)[rid]
+        kat = np.frombuffer(cols.kategori, dtype=cols.kategori.typecode)[rid]
+        mask = np.ones(len(rid), dtype=bool)
+        for ket_ids, kat_ids in terms:
+            mask &= _lookup(ket_ids, len(cols.keterangan_strings))[ket] | _lookup(
+                kat_ids, len(cols.kategori_names)
+            )[kat]
+        return array("q", rid[mask].tobytes())
+
+    ket, kat = cols.keterangan, cols.kategori
+    return array("q", (
+        r for r in rids
+        if all(ket[r] in ket_ids or kat[r] in kat_ids for ket_ids, kat_ids in terms)
+    ))
+
+
+def _lookup(ids, size):
+    # tabel boolean id string -> cocok, supaya pencocokan per baris O(1);
+    # id >= size (string yang lebih baru dari salinan store) dilewati
+    table = np.zeros(size, dtype=bool)
+    if ids:
+        ids = np.fromiter(ids, dtype=np.intp, count=len(ids))
+        table[ids[ids < size]] = True
+    return table
+
+
+class Matches:
+    """Baris hasil TransactionStore.query(): rid + kolomnya, RowView dibuat saat dibaca."""
+
+    def __init__(self, cols, rids):
+        self.cols = cols
+        self.rids = rids
+
+    def __len__(self):
+        return len(self.rids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RowView(self.cols, rid) for rid in self.rids[index]]
+        return RowView(self.cols, self.rids[index])
+
+
+class SearchResult:
+    """Hasil query untuk VirtualTable, diisi bertahap.
+
+    Cukup mendukung len() & slicing seperti TransactionStore; isinya
+    potongan hasil `store.query()` tiap langkah, berurutan. `next_ts`
+    adalah timestamp awal langkah berikutnya (None: selesai).
+    """
+
+    def __init__(self, store, q):
+        self.store = store
+        self.q = q
+        self.next_ts = None
+        self._parts = []
+        self._n = 0
+
+    def extend(self, rows, next_ts):
+        if len(rows):
+            self._parts.append(rows)
+            self._n += len(rows)
+        self.next_ts = next_ts
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            if index < 0:
+                index += self._n
+            rows = self[index:index + 1] if index >= 0 else []
+            if not rows:
+                raise IndexError(index)
+            return rows[0]
+
+        start, stop, step = index.indices(self._n)
+        rows = []
+        offset = 0
+        for part in self._parts:
+            if offset >= stop:
+                break
+            n = len(part)
+            if offset + n > start:
+                rows.extend(part[max(0, start - offset):stop - offset])
+            offset += n
+        return rows[::step]
@@ -0,0 +1,723 @@
+# shards.py
+"""Backend JSON terpartisi: satu file per bulan + manifest kecil.
+
+Dipilih dengan environment variable CASH_TRACKER_BACKEND=shard. Transaksi
+disimpan di data_cash.shards/YYYY-MM.json (format sama dengan
+data_cash.json, satu transaksi per baris) dan data_cash.shards/manifest.json
+mencatat untuk tiap bulan: banyak baris, tanggal yang punya transaksi dan
+total per kategori & tipe. Saldo, total bulan, daftar tanggal/kategori dan
+grafik jangka panjang dibaca dari manifest; file bulan baru dibuka saat
+barisnya diperlukan (hari/minggu/bulan yang tampil, halaman tabel yang
+terlihat).
+
+Tambah/edit/hapus hanya menulis ulang file bulan yang terkena plus
+manifest, dan reload dari luar hanya membaca ulang file bulan yang
+berubah.
+
+Perpindahan format berjalan sendiri: backend ini memecah data_cash.json
+(+ journal) saat pertama dipakai, dan backend JSON menggabungkan kembali
+folder shard bila data_cash.json belum ada. File/folder format lama
+disisihkan dengan akhiran .migrated.
+"""
+import contextlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+import data_store
+import rollups
+from columnar import ColumnarTransactions
+from data_store import ReloadDiff, TransactionStore
+from datekeys import date_keys, day_label, month_label, month_of, tz_signature
+
+SHARD_DIR = "data_cash.shards"
+MANIFEST = "manifest.json"
+MIGRATED = ".migrated"
+
+# banyak file bulan yang dipegang di memori; yang paling lama tidak
+# dipakai dilepas dan dibaca ulang dari disk bila diperlukan lagi
+SHARDS_IN_MEMORY = 36
+
+
+def _month_key(label):
+    tahun, bulan = label.split("-")
+    return int(tahun) * 12 + int(bulan) - 1
+
+
+def _split(transaksi):
+    """{kunci bulan: ColumnarTransactions} menurut bulan lokal tiap baris."""
+    if not isinstance(transaksi, ColumnarTransactions):
+        transaksi = ColumnarTransactions(transaksi)
+    per_bulan = {}
+    for rid in transaksi.order:
+        per_bulan.setdefault(transaksi.bulan[rid], []).append(transaksi.row(rid))
+    return {bulan: ColumnarTransactions(rows) for bulan, rows in per_bulan.items()}
+
+
+def _entry(cols, bulan, rev):
+    """Ringkasan satu file bulan untuk manifest."""
+    r = rollups.from_columns(cols)
+    per_bulan = r.levels["bulan"].get(bulan, {})
+    return {
+        "rev": rev,
+        "n": len(cols),
+        "hari": sorted(r.levels["hari"]),
+        "total": sorted([k, t, jumlah, n] for (k, t), (jumlah, n) in per_bulan.items()),
+    }
+
+
+def _write_atomic(path, write):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        write(f)
+    os.replace(tmp, path)
+    data_store._remember_write(path)
+
+
+def _retire(path):
+    """Sisihkan file/folder format lama (menimpa sisa .migrated sebelumnya)."""
+    target = path + MIGRATED
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    os.replace(path, target)
+
+
+def _merge(hasil, per_grup):
+    for grup, total in per_grup.items():
+        gabung = hasil.setdefault(grup, {})
+        for tipe, jumlah in total.items():
+            gabung[tipe] = gabung.get(tipe, 0) + jumlah
+    return hasil
+
+
+class ShardBackend(data_store.StorageBackend):
+    """Ledger berupa file JSON per bulan di `folder` (lihat docstring modul)."""
+
+    def __init__(self, folder=SHARD_DIR):
+        self.folder = folder
+        self.manifest_path = os.path.join(folder, MANIFEST)
+        self._manifest = None      # {"tz", "kategori", "shards": {bulan: entri}}
+        self._manifest_sig = None
+        self._shards = OrderedDict()  # bulan -> TransactionStore, urut LRU
+        self._sigs = {}               # bulan -> identitas file saat dimuat/ditulis
+        self._store = None
+        self._epoch = 0
+
+    def _shard_path(self, bulan):
+        return os.path.join(self.folder, month_label(bulan) + ".json")
+
+    # ---------------------------- manifest ----------------------------
+    def _manifest_data(self):
+        if self._manifest is None:
+            self._read_manifest()
+        return self._manifest
+
+    def _read_manifest(self):
+        sig = data_store._signature(self.manifest_path)
+        with open(self.manifest_path) as f:
+            raw = json.load(f)
+        self._manifest = {
+            "tz": raw.get("tz"),
+            "kategori": raw.get("kategori", []),
+            "shards": {_month_key(label): e for label, e in raw["shards"].items()},
+        }
+        self._manifest_sig = sig
+        self._invalidate()
+
+    def _write_manifest(self):
+        m = self._manifest
+        raw = {
+            "tz": m["tz"],
+            "kategori": m["kategori"],
+            "shards": {month_label(b): m["shards"][b] for b in sorted(m["shards"])},
+        }
+        _write_atomic(self.manifest_path, lambda f: json.dump(raw, f))
+        self._manifest_sig = data_store._signature(self.manifest_path)
+        self._invalidate()
+
+    def _invalidate(self):
+        if self._store is not None:
+            self._store.invalidate()
+
+    def _add_kategori(self, names):
+        kategori = self._manifest_data()["kategori"]
+        for name in names:
+            if name and name not in kategori:
+                kategori.append(name)
+
+    def _months_in(self, start_ts=None, end_ts=None, kosong=False):
+        """Kunci bulan (terurut) yang beririsan dengan start_ts <= waktu < end_ts."""
+        entries = self._manifest_data()["shards"]
+        lo = float("-inf") if start_ts is None else date_keys(start_ts)[1]
+        # akhir rentang eksklusif: bulan milik detik terakhir sebelum end_ts
+        hi = float("inf") if end_ts is None else date_keys(end_ts - 1e-6)[1]
+        return [
+            b for b in sorted(entries)
+            if lo <= b <= hi and (kosong or entries[b]["n"])
+        ]
+
+    # --------------------------- file bulan ---------------------------
+    def _load_shard(self, bulan):
+        """(TransactionStore, identitas file) langsung dari disk."""
+        path = self._shard_path(bulan)
+        sig = data_store._signature(path)
+        if sig is None:
+            return TransactionStore(), None
+        with open(path) as f:
+            cols = ColumnarTransactions(json.load(f)["transaksi"])
+        return TransactionStore(cols), sig
+
+    def _shard(self, bulan):
+        """TransactionStore bulan `bulan`, dimuat dari disk bila belum ada di memori."""
+        with data_store._journal_lock:
+            store = self._shards.get(bulan)
+            if store is not None:
+                self._shards.move_to_end(bulan)
+                return store
+            store, sig = self._load_shard(bulan)
+            self._keep(bulan, store, sig)
+            self._heal(bulan, store)
+            return store
+
+    def _keep(self, bulan, store, sig):
+        self._shards[bulan] = store
+        self._shards.move_to_end(bulan)
+        self._sigs[bulan] = sig
+        while len(self._shards) > SHARDS_IN_MEMORY:
+            lama, _ = self._shards.popitem(last=False)
+            self._sigs.pop(lama, None)
+
+    def _heal(self, bulan, store):
+        """Samakan entri manifest dengan isi file (mis. file diedit manual)."""
+        entries = self._manifest_data()["shards"]
+        if bulan not in entries and not len(store):
+            return  # bulan baru, file belum pernah ditulis
+        lama = entries.get(bulan, {"rev": 0})
+        baru = _entry(store.cols, bulan, lama["rev"])
+        if baru != lama:
+            baru["rev"] += 1
+            entries[bulan] = baru
+            self._write_manifest()
+
+    def _write_shard(self, bulan, cols):
+        """Tulis ulang satu file bulan dan perbarui entrinya (manifest ditulis pemanggil)."""
+        path = self._shard_path(bulan)
+        entries = self._manifest_data()["shards"]
+        if len(cols):
+            _write_atomic(path, lambda f: data_store._dump_snapshot(
+                {"transaksi": cols, "bulan": month_label(bulan)}, f
+            ))
+        elif os.path.exists(path):
+            os.remove(path)
+            data_store._remember_write(path)
+        # entri bulan kosong tetap disimpan supaya rev-nya tidak pernah turun
+        entries[bulan] = _entry(cols, bulan, entries.get(bulan, {}).get("rev", 0) + 1)
+        self._sigs[bulan] = data_store._signature(path)
+
+    def _write_all(self, transaksi, kategori):
+        """Pecah ulang seluruh transaksi per bulan dan tulis semua file."""
+        try:
+            lama = self._manifest_data()["shards"]
+        except OSError:
+            lama = {}
+        per_bulan = _split(transaksi)
+
+        self._manifest = {
+            "tz": repr(tz_signature()),
+            "kategori": list(kategori),
+            "shards": dict(lama),
+        }
+        self._shards.clear()
+        self._sigs.clear()
+        self._epoch += 1
+        for bulan in sorted(set(lama) | set(per_bulan)):
+            self._write_shard(bulan, per_bulan.get(bulan, ColumnarTransactions()))
+        self._write_manifest()
+
+    def _find(self, trans_id):
+        """(bulan, TransactionStore, RowView) untuk id transaksi, atau None.
+
+        File bulan yang sudah di memori dicek lebih dulu (baris yang tampil
+        di tabel selalu berasal dari sana), sisanya dari yang terbaru.
+        """
+        loaded = list(self._shards.items())
+        for bulan, store in reversed(loaded):
+            row = store.find(trans_id)
+            if row is not None:
+                return bulan, store, row
+        for bulan in reversed(self._months_in()):
+            if bulan in self._shards:
+                continue
+            store = self._shard(bulan)
+            row = store.find(trans_id)
+            if row is not None:
+                return bulan, store, row
+        return None
+
+    @staticmethod
+    def _remove_row(store, row):
+        store.remove(row)
+        del store.cols[store.cols.index_of(row)]
+
+    @contextlib.contextmanager
+    def _writing(self):
+        """Kunci penulis antar-proses (data_store._file_lock).
+
+        File bulan & manifest yang diubah instance lain dimuat ulang dulu,
+        jadi tulisan ini berada di atas isi disk terbaru, bukan menimpanya.
+        """
+        with data_store._journal_lock, data_store._file_lock:
+            self.reload_changes()
+            yield
+
+    # ------------------------- StorageBackend -------------------------
+    def init(self):
+        with self._writing():
+            if os.path.exists(self.manifest_path):
+                return
+            os.makedirs(self.folder, exist_ok=True)
+            if not os.path.exists(data_store.snapshot_file()):
+                self._write_all([], [])
+                return
+
+            # pindah dari format satu file: snapshot + journal dipecah per bulan
+            data = data_store.JsonBackend().load()
+            self._write_all(data["transaksi"], data["kategori"])
+            for path in (data_store.snapshot_file(), data_store.FILE_JOURNAL,
+                         data_store.FILE_ROLLUPS):
+                if os.path.exists(path):
+                    _retire(path)
+
+    def load(self):
+        with data_store._journal_lock:
+            cols = ColumnarTransactions()
+            for bulan in self._months_in():
+                cols.extend(self._shard(bulan).cols)
+            return {
+                "transaksi": cols,
+                "kategori": list(self._manifest_data()["kategori"]),
+            }
+
+    def save(self, data):
+        with self._writing():
+            self._write_all(data["transaksi"], data["kategori"])
+
+    def range(self, start_ts, end_ts):
+        return [
+            dict(t) for t in self.store().range(
+                datetime.fromtimestamp(start_ts), datetime.fromtimestamp(end_ts)
+            )
+        ]
+
+    def get(self, trans_id):
+        with data_store._journal_lock:
+            found = self._find(trans_id)
+            return None if found is None else dict(found[2])
+
+    def insert(self, trans):
+        self.insert_many([trans])
+
+    def insert_many(self, rows):
+        rows = [data_store._with_id(t) for t in rows]
+        per_bulan = {}
+        for t in rows:
+            per_bulan.setdefault(date_keys(t["timestamp"])[1], []).append(t)
+
+        with self._writing():
+            for bulan, baru in sorted(per_bulan.items()):
+                store = self._shard(bulan)
+                store.add_many(baru)
+                self._write_shard(bulan, store.cols)
+            self._add_kategori(t["kategori"] for t in rows)
+            self._write_manifest()
+
+    def update(self, trans_id, fields, expected=None):
+        with self._writing():
+            found = self._find(trans_id)
+            if expected is not None:
+                fields = data_store._merge_fields(
+                    None if found is None else found[2], fields, expected
+                )
+            if found is None or not fields:
+                return
+            bulan, store, row = found
+            baru = dict(row)
+            baru.update(fields)
+            tujuan = date_keys(baru["timestamp"])[1]
+
+            if tujuan == bulan:
+                store.update(row, fields)
+            else:
+                # timestamp pindah bulan: baris pindah file
+                self._remove_row(store, row)
+                target = self._shard(tujuan)
+                target.add(baru)
+                self._write_shard(tujuan, target.cols)
+            self._write_shard(bulan, store.cols)
+            self._add_kategori([baru["kategori"]])
+            self._write_manifest()
+
+    def delete(self, trans_id):
+        with self._writing():
+            found = self._find(trans_id)
+            if found is None:
+                return
+            bulan, store, row = found
+            self._remove_row(store, row)
+            self._write_shard(bulan, store.cols)
+            self._write_manifest()
+
+    def aggregate(self, start_ts=None, end_ts=None, by=None):
+        return self.store().sum_by(start_ts, end_ts, by)
+
+    def store(self):
+        with data_store._journal_lock:
+            if self._store is None:
+                self._store = ShardStore(self)
+            m = self._manifest_data()
+            if m["tz"] != repr(tz_signature()):
+                # kunci bulan bergantung zona waktu: pecah ulang sekali
+                self._write_all(self.load()["transaksi"], m["kategori"])
+        return self._store
+
+    def reload(self):
+        with data_store._journal_lock:
+            self._manifest = None
+            self._shards.clear()
+            self._sigs.clear()
+            self._epoch += 1
+            self._invalidate()
+
+    def reload_changes(self):
+        """Baca ulang manifest dan hanya file bulan di memori yang berubah di disk."""
+        with data_store._journal_lock:
+            diff = ReloadDiff([], [], [])
+            if self._manifest is None:
+                return diff
+
+            if data_store._signature(self.manifest_path) != self._manifest_sig:
+                self._read_manifest()
+
+            for bulan, lama in list(self._shards.items()):
+                sig = data_store._signature(self._shard_path(bulan))
+                if sig == self._sigs.get(bulan):
+                    continue
+                store, sig = self._load_shard(bulan)
+                ids = {t["id"]: t for t in lama.cols}
+                for t in store.cols:
+                    old = ids.pop(t["id"], None)
+                    if old is None:
+                        diff.added.append(t)
+                    elif any(old[k] != t[k] for k in data_store._CONTENT_FIELDS):
+                        diff.changed.append(t)
+                diff.removed.extend(ids.values())
+                self._keep(bulan, store, sig)
+                self._heal(bulan, store)
+
+            if any(diff):
+                self._invalidate()
+            return diff
+
+    def watched_files(self):
+        try:
+            months = self._months_in()
+        except OSError:
+            months = []  # belum di-init
+        return (self.manifest_path,) + tuple(self._shard_path(b) for b in months)
+
+
+class ShardStore:
+    """Permukaan query TransactionStore di atas ShardBackend.
+
+    Panjang, daftar tanggal/kategori dan total ringkasan dihitung dari
+    manifest (di-cache sampai manifest berubah); query baris membuka file
+    bulan yang beririsan dengan rentangnya saja.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.aggregates = ShardAggregates(self)
+        self.rollups = ShardRollups(self)
+        self._cache = {}
+
+    def invalidate(self):
+        self._cache.clear()
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _entries(self):
+        return self.backend._manifest_data()["shards"]
+
+    def version(self, start_ts=None, end_ts=None):
+        # rev tiap file bulan hanya pernah naik, jadi jumlahnya berubah
+        # setiap ada bulan di rentang yang ditulis ulang
+        entries = self._entries()
+        months = self.backend._months_in(start_ts, end_ts, kosong=True)
+        return id(self), self.backend._epoch, sum(entries[b]["rev"] for b in months)
+
+    def __len__(self):
+        return self._cached("len", lambda: sum(e["n"] for e in self._entries().values()))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            rows = []
+            offset = 0
+            with data_store._journal_lock:
+                entries = self._entries()
+                for bulan in self.backend._months_in():
+                    if offset >= stop:
+                        break
+                    n = entries[bulan]["n"]
+                    if offset + n > start:
+                        store = self.backend._shard(bulan)
+                        rows.extend(store[max(0, start - offset):stop - offset])
+                    offset += n
+            return rows[::step]
+
+        if index < 0:
+            index += len(self)
+        rows = self[index:index + 1] if index >= 0 else []
+        if not rows:
+            raise IndexError(index)
+        return rows[0]
+
+    def all(self):
+        return self[:]
+
+    def find(self, trans_id):
+        with data_store._journal_lock:
+            found = self.backend._find(trans_id)
+            return None if found is None else found[2]
+
+    def range(self, start, end):
+        rows = []
+        with data_store._journal_lock:
+            for bulan in self.backend._months_in(start.timestamp(), end.timestamp()):
+                rows.extend(self.backend._shard(bulan).range(start, end))
+        return rows
+
+    def _months_for(self, q):
+        """Bulan di rentang q yang menurut manifest punya kategori/tipe q."""
+        entries = self._entries()
+        months = self.backend._months_in(q.start_ts, q.end_ts)
+        if q.kategori is None and q.tipe is None:
+            return months
+        return [
+            b for b in months
+            if any(
+                (q.kategori is None or k in q.kategori) and (q.tipe is None or t == q.tipe)
+                for k, t, _, _ in entries[b]["total"]
+            )
+        ]
+
+    def query(self, q, limit=None):
+        """Seperti TransactionStore.query, per file bulan.
+
+        Bulan yang tidak punya kategori/tipe yang dicari dilewati tanpa
+        dibuka. Dengan `limit`, pemindaian berhenti di awal bulan pertama
+        setelah sekitar `limit` baris; timestamp lanjutan = awal bulan itu.
+        """
+        rows = []
+        dipindai = 0
+        with data_store._journal_lock:
+            entries = self._entries()
+            for bulan in self._months_for(q):
+                if limit is not None and dipindai >= limit:
+                    return rows, datetime(bulan // 12, bulan % 12 + 1, 1).timestamp()
+                matches, _ = self.backend._shard(bulan).query(q)
+                rows.extend(matches[:])
+                dipindai += entries[bulan]["n"]
+        return rows, None
+
+    def query_sum(self, q, by=None):
+        hasil = {}
+        with data_store._journal_lock:
+            for bulan in self._months_for(q):
+                _merge(hasil, self.backend._shard(bulan).query_sum(q, by))
+        return hasil
+
+    def _in_month(self, d, query):
+        bulan = month_of(d)
+        with data_store._journal_lock:
+            if not self._entries().get(bulan, {}).get("n"):
+                return []
+            return query(self.backend._shard(bulan), d)
+
+    def day(self, d):
+        return self._in_month(d, TransactionStore.day)
+
+    def month(self, d):
+        return self._in_month(d, TransactionStore.month)
+
+    def dates(self):
+        return self._cached("dates", lambda: [
+            day_label(hari) for hari in sorted(
+                {h for e in self._entries().values() for h in e["hari"]}
+            )
+        ])
+
+    def categories(self):
+        return self._cached("categories", lambda: sorted(
+            {k for e in self._entries().values() for k, _, _, _ in e["total"]}
+        ))
+
+    def sum_by(self, start_ts=None, end_ts=None, by=None):
+        hasil = {}
+        with data_store._journal_lock:
+            for bulan in self.backend._months_in(start_ts, end_ts):
+                _merge(hasil, self.backend._shard(bulan).sum_by(start_ts, end_ts, by))
+        return hasil
+
+
+class ShardAggregates:
+    """Saldo & total bulan dari manifest; total hari dari file bulannya."""
+
+    def __init__(self, store):
+        self.store = store
+
+    @staticmethod
+    def _sum(entries):
+        """{tipe: total} dari baris total beberapa entri manifest."""
+        total = {}
+        for entry in entries:
+            for _, tipe, jumlah, _ in entry["total"]:
+                total[tipe] = total.get(tipe, 0) + jumlah
+        return total
+
+    def saldo(self):
+        total = self.store._cached(
+            "total", lambda: self._sum(self.store._entries().values())
+        )
+        return total.get("pemasukan", 0) - total.get("pengeluaran", 0)
+
+    def month_total(self, d, tipe):
+        entry = self.store._entries().get(month_of(d))
+        return self._sum([entry] if entry else []).get(tipe, 0)
+
+    def day_total(self, d, tipe):
+        bulan = month_of(d)
+        if not self.store._entries().get(bulan, {}).get("n"):
+            return 0
+        return self.store.backend._shard(bulan).aggregates.day_total(d, tipe)
+
+    def verify(self, transaksi=None):
+        """Cocokkan total di manifest dengan isi tiap file bulan di disk.
+
+        Hasil berupa dict {("bulan", kunci, kategori, tipe): ((total, n)
+        seharusnya, (total, n) di manifest)}; dict kosong berarti manifest
+        sesuai dengan isi file.
+        """
+        backend = self.store.backend
+        seharusnya, tersimpan = rollups.Rollups(), rollups.Rollups()
+        # manifest & file dibaca langsung dari disk di bawah kunci penulis;
+        # _shard() tidak dipakai karena ia menyamakan manifest lebih dulu
+        with data_store._journal_lock, data_store._file_lock:
+            with open(backend.manifest_path) as f:
+                entries = json.load(f)["shards"]
+            for label, entry in sorted(entries.items()):
+                bulan = _month_key(label)
+                tersimpan.levels["bulan"][bulan] = {
+                    (k, t): [jumlah, n] for k, t, jumlah, n in entry["total"]
+                }
+                cols = backend._load_shard(bulan)[0].cols
+                for key, grup in rollups.from_columns(cols).levels["bulan"].items():
+                    gabung = seharusnya.levels["bulan"].setdefault(key, {})
+                    for kt, (jumlah, n) in grup.items():
+                        entry = gabung.setdefault(kt, [0, 0])
+                        entry[0] += jumlah
+                        entry[1] += n
+        return {entry[:4]: entry[4:] for entry in seharusnya.diff(tersimpan)}
+
+
+class ShardRollups:
+    """Permukaan query rollups.Rollups: bulan/tahun dari manifest, hari/pekan dari file bulan."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def _from_manifest(self, level, lo, hi):
+        """(kunci periode, baris total manifest) untuk level bulan / tahun."""
+        for bulan, entry in sorted(self.store._entries().items()):
+            key = bulan if level == "bulan" else bulan // 12
+            if lo <= key <= hi:
+                for row in entry["total"]:
+                    yield key, row
+
+    def _shards(self, level, lo, hi):
+        if level == "hari":
+            start, end = date.fromordinal(lo), date.fromordinal(hi)
+        else:
+            start = date.fromisocalendar(lo // 100, lo % 100, 1)
+            end = date.fromisocalendar(hi // 100, hi % 100, 7)
+        start = datetime(start.year, start.month, start.day)
+        end = datetime(end.year, end.month, end.day) + timedelta(days=1)
+        backend = self.store.backend
+        return [
+            backend._shard(b)
+            for b in backend._months_in(start.timestamp(), end.timestamp())
+        ]
+
+    def totals(self, level, lo, hi):
+        hasil = {}
+        if level in ("bulan", "tahun"):
+            for key, (_, tipe, jumlah, _) in self._from_manifest(level, lo, hi):
+                total = hasil.setdefault(key, {})
+                total[tipe] = total.get(tipe, 0) + jumlah
+            return hasil
+        with data_store._journal_lock:
+            for store in self._shards(level, lo, hi):
+                _merge(hasil, store.rollups.totals(level, lo, hi))
+        return hasil
+
+    def by_kategori(self, level, lo, hi):
+        hasil = {}
+        if level in ("bulan", "tahun"):
+            for _, (kategori, tipe, jumlah, _) in self._from_manifest(level, lo, hi):
+                total = hasil.setdefault(kategori, {})
+                total[tipe] = total.get(tipe, 0) + jumlah
+            return hasil
+        with data_store._journal_lock:
+            for store in self._shards(level, lo, hi):
+                _merge(hasil, store.rollups.by_kategori(level, lo, hi))
+        return hasil
+
+    def snapshot(self):
+        """Gabungan rollup semua file bulan sebagai rollups.Rollups (untuk verify)."""
+        hasil = rollups.Rollups()
+        backend = self.store.backend
+        with data_store._journal_lock:
+            for bulan in backend._months_in():
+                for level, per_periode in backend._shard(bulan).rollups.levels.items():
+                    tujuan = hasil.levels[level]
+                    for key, grup in per_periode.items():
+                        gabung = tujuan.setdefault(key, {})
+                        for kt, (jumlah, n) in grup.items():
+                            entry = gabung.setdefault(kt, [0, 0])
+                            entry[0] += jumlah
+                            entry[1] += n
+        return hasil
+
+    def diff(self, other, tol=0.005):
+        return self.snapshot().diff(other, tol)
+
+
+def exists(folder=SHARD_DIR):
+    return os.path.exists(os.path.join(folder, MANIFEST))
+
+
+def export_json(folder=SHARD_DIR):
+    """Gabungkan folder shard kembali ke data_cash.json lalu sisihkan foldernya.
+
+    Dipanggil backend JSON saat data_cash.json belum ada tetapi folder
+    shard ada (kembali dari CASH_TRACKER_BACKEND=shard).
+    """
+    data = ShardBackend(folder).load()
+    data_store._save_json_file(data)
+    _retire(folder)
+    return len(data["transaksi"])
@@ -0,0 +1,782 @@
+# sqlite_backend.py
+"""Backend SQLite untuk data_store.
+
+Dipilih dengan environment variable CASH_TRACKER_BACKEND=sqlite. Data lama
+bisa dipindahkan sekali jalan dengan:
+
+    python -m sqlite_backend migrate --json data_cash.json --db data_cash.db
+"""
+import argparse
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import data_store
+import rollups
+import search
+from query import Query
+from columnar import ColumnarTransactions
+from datekeys import date_keys, day_label, day_of, month_of, tz_signature
+
+FILE_DB = "data_cash.db"
+
+# berapa banyak entri log perubahan yang disimpan untuk reload inkremental
+CHANGELOG_KEEP = 10000
+
+# jarak (baris) antar-jangkar keyset untuk potongan tabel per posisi, lihat
+# SqliteStore._anchor
+KEYSET_PAGE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transaksi (
+    id INTEGER PRIMARY KEY,  -- id transaksi (data_store.new_id)
+    tipe TEXT NOT NULL,
+    jumlah REAL NOT NULL,
+    kategori TEXT NOT NULL,
+    keterangan TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    -- kunci tanggal lokal dari datekeys, dihitung saat baris ditulis
+    hari INTEGER NOT NULL,
+    bulan INTEGER NOT NULL,
+    pekan INTEGER NOT NULL,
+    minggu_ke INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transaksi_timestamp ON transaksi(timestamp);
+CREATE INDEX IF NOT EXISTS idx_transaksi_tipe ON transaksi(tipe);
+CREATE INDEX IF NOT EXISTS idx_transaksi_kategori ON transaksi(kategori);
+CREATE INDEX IF NOT EXISTS idx_transaksi_hari ON transaksi(hari);
+
+CREATE TABLE IF NOT EXISTS kategori (
+    nama TEXT PRIMARY KEY
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    kunci TEXT PRIMARY KEY,
+    nilai TEXT
+);
+
+-- log perubahan, diisi trigger, dipakai reload_changes()
+CREATE TABLE IF NOT EXISTS perubahan (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    row_id INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS trg_transaksi_add AFTER INSERT ON transaksi
+BEGIN
+    INSERT INTO perubahan (op, row_id) VALUES ('add', NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_transaksi_edit
+AFTER UPDATE OF tipe, jumlah, kategori, keterangan, timestamp ON transaksi
+BEGIN
+    INSERT INTO perubahan (op, row_id) VALUES ('edit', NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_transaksi_delete AFTER DELETE ON transaksi
+BEGIN
+    INSERT INTO perubahan (op, row_id) VALUES ('delete', OLD.id);
+END;
+
+-- total per periode (lihat rollups.py), dijaga trigger di bawah
+CREATE TABLE IF NOT EXISTS rollup (
+    level TEXT NOT NULL,     -- hari / pekan / bulan / tahun
+    kunci INTEGER NOT NULL,  -- kunci periode; tahun = bulan / 12
+    kategori TEXT NOT NULL,
+    tipe TEXT NOT NULL,
+    total REAL NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (level, kunci, kategori, tipe)
+) WITHOUT ROWID;
+"""
+
+# (level, ekspresi kunci atas baris transaksi; {r} = "NEW." / "OLD." / "")
+_ROLLUP_LEVELS = (
+    ("hari", "{r}hari"),
+    ("pekan", "{r}pekan"),
+    ("bulan", "{r}bulan"),
+    ("tahun", "{r}bulan / 12"),
+)
+
+
+def _rollup_sql(row, sign):
+    """Statement trigger yang menambah (sign=+1) / mengurangi baris `row` dari rollup."""
+    sql = []
+    for level, kunci in _ROLLUP_LEVELS:
+        kunci = kunci.format(r=row + ".")
+        sql.append(
+            "INSERT INTO rollup (level, kunci, kategori, tipe, total, n) "
+            f"VALUES ('{level}', {kunci}, {row}.kategori, {row}.tipe, "
+            f"{sign} * {row}.jumlah, {sign}) "
+            "ON CONFLICT (level, kunci, kategori, tipe) DO UPDATE SET "
+            "total = total + excluded.total, n = n + excluded.n;"
+        )
+        if sign < 0:
+            sql.append(
+                f"DELETE FROM rollup WHERE level = '{level}' AND kunci = {kunci} "
+                f"AND kategori = {row}.kategori AND tipe = {row}.tipe AND n = 0;"
+            )
+    return "\n    ".join(sql)
+
+
+ROLLUP_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS trg_rollup_add AFTER INSERT ON transaksi
+BEGIN
+    {_rollup_sql("NEW", 1)}
+END;
+CREATE TRIGGER IF NOT EXISTS trg_rollup_delete AFTER DELETE ON transaksi
+BEGIN
+    {_rollup_sql("OLD", -1)}
+END;
+CREATE TRIGGER IF NOT EXISTS trg_rollup_edit
+AFTER UPDATE OF tipe, jumlah, kategori, hari, pekan, bulan ON transaksi
+BEGIN
+    {_rollup_sql("OLD", -1)}
+    {_rollup_sql("NEW", 1)}
+END;
+"""
+
+# indeks teks keterangan & kategori untuk pencarian tabel riwayat
+# (external content: teksnya tetap hanya di tabel transaksi)
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS transaksi_fts USING fts5(
+    keterangan, kategori, content='transaksi', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS trg_fts_add AFTER INSERT ON transaksi
+BEGIN
+    INSERT INTO transaksi_fts (rowid, keterangan, kategori)
+    VALUES (NEW.id, NEW.keterangan, NEW.kategori);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fts_delete AFTER DELETE ON transaksi
+BEGIN
+    INSERT INTO transaksi_fts (transaksi_fts, rowid, keterangan, kategori)
+    VALUES ('delete', OLD.id, OLD.keterangan, OLD.kategori);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fts_edit
+AFTER UPDATE OF keterangan, kategori ON transaksi
+BEGIN
+    INSERT INTO transaksi_fts (transaksi_fts, rowid, keterangan, kategori)
+    VALUES ('delete', OLD.id, OLD.keterangan, OLD.kategori);
+    INSERT INTO transaksi_fts (rowid, keterangan, kategori)
+    VALUES (NEW.id, NEW.keterangan, NEW.kategori);
+END;
+"""
+
+# isi awal rollup untuk database yang dibuat sebelum tabel rollup ada
+_ROLLUP_BACKFILL = [
+    "INSERT INTO rollup (level, kunci, kategori, tipe, total, n) "
+    f"SELECT '{level}', {kunci.format(r='')} AS k, kategori, tipe, "
+    "SUM(jumlah), COUNT(*) FROM transaksi GROUP BY k, kategori, tipe"
+    for level, kunci in _ROLLUP_LEVELS
+]
+
+_COLUMNS = "id, tipe, jumlah, kategori, keterangan, timestamp"
+_GROUPS = {
+    None: "NULL",
+    "hari": "hari",
+    "bulan": "bulan",
+    "minggu_ke": "minggu_ke",
+    "kategori": "kategori",
+}
+_INSERT = (
+    "INSERT INTO transaksi (id, tipe, jumlah, kategori, keterangan, timestamp, "
+    "hari, bulan, pekan, minggu_ke) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+# penanda _anchor: posisi jangkar di luar tabel
+_END = object()
+
+
+def _after(key):
+    """(WHERE, params) untuk baris sesudah kunci keyset `key` (None: dari awal)."""
+    if key is None:
+        return "", ()
+    return "WHERE (timestamp, id) > (?, ?)", key
+
+
+def _row_dict(row):
+    trans_id, tipe, jumlah, kategori, keterangan, ts = row
+    return {
+        "id": trans_id,
+        "tipe": tipe,
+        "jumlah": int(jumlah) if jumlah.is_integer() else jumlah,
+        "kategori": kategori,
+        "keterangan": keterangan,
+        "waktu": datetime.fromtimestamp(ts).strftime("%H:%M:%S"),
+        "timestamp": ts,
+    }
+
+
+def _row_params(trans):
+    return (
+        trans["tipe"],
+        trans["jumlah"],
+        trans["kategori"],
+        trans["keterangan"],
+        trans["timestamp"],
+    ) + date_keys(trans["timestamp"])
+
+
+class SqliteBackend(data_store.StorageBackend):
+    """Ledger di database SQLite (mode WAL) dengan indeks waktu, tipe, kategori.
+
+    Query rentang dan agregasi (SUM ... GROUP BY) dikerjakan oleh SQLite,
+    jadi aplikasi tidak perlu memuat seluruh riwayat ke memori.
+    """
+
+    def __init__(self, path=FILE_DB):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._store = None
+        self._seen_seq = 0
+        self._own_seqs = set()
+        self._fts = False  # SQLite tanpa FTS5: pencarian memakai LIKE
+
+    # ---------------------------- koneksi ----------------------------
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._init_rollups()
+            self._init_search()
+            self._seen_seq = self._max_seq()
+            self._check_timezone()
+        return self._conn
+
+    def _init_rollups(self):
+        """Pasang trigger rollup; isi tabelnya sekali bila masih kosong."""
+        conn = self._conn
+        with conn:
+            conn.executescript(ROLLUP_TRIGGERS)
+        with conn:
+            # instance lain bisa membuka database baru bersamaan: cek & isi
+            # dalam satu transaksi tulis supaya tabel tidak diisi dua kali
+            conn.execute("BEGIN IMMEDIATE")
+            kosong = conn.execute("SELECT 1 FROM rollup LIMIT 1").fetchone() is None
+            if kosong:
+                for sql in _ROLLUP_BACKFILL:
+                    conn.execute(sql)
+
+    def _init_search(self):
+        """Pasang indeks FTS5 + triggernya; isi sekali untuk database lama."""
+        conn = self._conn
+        ada = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'transaksi_fts'"
+        ).fetchone() is not None
+        try:
+            with conn:
+                conn.executescript(SEARCH_SCHEMA)
+                if not ada:
+                    conn.execute(
+                        "INSERT INTO transaksi_fts (transaksi_fts) VALUES ('rebuild')"
+                    )
+        except sqlite3.OperationalError:
+            return  # modul fts5 tidak tersedia
+        self._fts = True
+
+    def _check_timezone(self):
+        """Hitung ulang kolom kunci tanggal bila zona waktu berubah sejak ditulis."""
+        tz = repr(tz_signature())
+        row = self._conn.execute("SELECT nilai FROM meta WHERE kunci = 'tz'").fetchone()
+        if row is not None and row[0] == tz:
+            return False
+
+        with self._conn:
+            rows = self._conn.execute("SELECT id, timestamp FROM transaksi").fetchall()
+            self._conn.executemany(
+                "UPDATE transaksi SET hari = ?, bulan = ?, pekan = ?, minggu_ke = ? "
+                "WHERE id = ?",
+                (date_keys(ts) + (row_id,) for row_id, ts in rows),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (kunci, nilai) VALUES ('tz', ?)", (tz,)
+            )
+        return True
+
+    def _max_seq(self):
+        return self._conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM perubahan"
+        ).fetchone()[0]
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db().execute(sql, params).fetchall()
+
+    def _write(self, fn):
+        """Jalankan `fn(conn)` dalam satu transaksi lalu tandai sebagai tulisan sendiri."""
+        with self._lock:
+            conn = self._db()
+            before = self._max_seq()
+            with conn:
+                result = fn(conn)
+            self._own_seqs.update(range(before + 1, self._max_seq() + 1))
+
+        for path in self.watched_files():
+            data_store._remember_write(path)
+        if self._store is not None:
+            self._store.invalidate()
+        return result
+
+    # ------------------------- StorageBackend -------------------------
+    def init(self):
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute(
+                    "DELETE FROM perubahan WHERE seq <= ?",
+                    (self._max_seq() - CHANGELOG_KEEP,),
+                )
+
+    def load(self):
+        rows = self._query(f"SELECT {_COLUMNS} FROM transaksi ORDER BY id")
+        kategori = [r[0] for r in self._query("SELECT nama FROM kategori")]
+        return {
+            "transaksi": ColumnarTransactions(_row_dict(r) for r in rows),
+            "kategori": kategori,
+        }
+
+    def save(self, data):
+        def tulis(conn):
+            conn.execute("DELETE FROM transaksi")
+            conn.execute("DELETE FROM kategori")
+            conn.executemany(
+                _INSERT, ((t["id"],) + _row_params(t) for t in data["transaksi"])
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO kategori (nama) VALUES (?)",
+                ((k,) for k in data["kategori"]),
+            )
+
+        self._write(tulis)
+
+    def range(self, start_ts, end_ts):
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM transaksi "
+            "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp, id",
+            (start_ts, end_ts),
+        )
+        return [_row_dict(r) for r in rows]
+
+    def _where(self, q):
+        """(klausa WHERE, parameter) untuk Query `q`; indeksnya dipilih planner SQLite."""
+        where, params = [], []
+        if q.start_ts is not None:
+            where.append("timestamp >= ?")
+            params.append(q.start_ts)
+        if q.end_ts is not None:
+            where.append("timestamp < ?")
+            params.append(q.end_ts)
+        if q.tipe is not None:
+            where.append("tipe = ?")
+            params.append(q.tipe)
+        if q.kategori is not None:
+            where.append(f"kategori IN ({', '.join('?' * len(q.kategori))})")
+            params += sorted(q.kategori)
+        if q.min_jumlah is not None:
+            where.append("jumlah >= ?")
+            params.append(q.min_jumlah)
+        if q.max_jumlah is not None:
+            where.append("jumlah <= ?")
+            params.append(q.max_jumlah)
+
+        toks = search.tokens(q.teks)
+        if toks and self._fts:
+            where.append(
+                "id IN (SELECT rowid FROM transaksi_fts WHERE transaksi_fts MATCH ?)"
+            )
+            params.append(" ".join(f'"{tok}"*' for tok in toks))
+        else:
+            for tok in toks:
+                where.append("(keterangan LIKE ? OR kategori LIKE ?)")
+                params += [f"%{tok}%"] * 2
+        return (f"WHERE {' AND '.join(where)}" if where else ""), params
+
+    def query(self, q):
+        """Baris yang memenuhi Query `q`, urut waktu."""
+        where_sql, params = self._where(q)
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM transaksi {where_sql} ORDER BY timestamp, id",
+            params,
+        )
+        return [_row_dict(r) for r in rows]
+
+    def get(self, trans_id):
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM transaksi WHERE id = ?", (trans_id,)
+        )
+        return _row_dict(rows[0]) if rows else None
+
+    def insert(self, trans):
+        self.insert_many([trans])
+
+    def insert_many(self, rows):
+        rows = [data_store._with_id(t) for t in rows]
+
+        def tulis(conn):
+            conn.executemany(_INSERT, ((t["id"],) + _row_params(t) for t in rows))
+            conn.executemany(
+                "INSERT OR IGNORE INTO kategori (nama) VALUES (?)",
+                {(t["kategori"],) for t in rows if t["kategori"]},
+            )
+
+        self._write(tulis)
+
+    def update(self, trans_id, fields, expected=None):
+        def tulis(conn):
+            # baca-ubah-tulis dalam satu transaksi tulis: instance lain tidak
+            # bisa menyelip di antara SELECT dan UPDATE
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM transaksi WHERE id = ?", (trans_id,)
+            ).fetchone()
+            trans = None if row is None else _row_dict(row)
+            ubah = fields
+            if expected is not None:
+                ubah = data_store._merge_fields(trans, fields, expected)
+            if trans is None or not ubah:
+                return
+            trans.update(ubah)
+            conn.execute(
+                "UPDATE transaksi SET tipe = ?, jumlah = ?, kategori = ?, "
+                "keterangan = ?, timestamp = ?, hari = ?, bulan = ?, pekan = ?, "
+                "minggu_ke = ? WHERE id = ?",
+                _row_params(trans) + (trans_id,),
+            )
+
+        self._write(tulis)
+
+    def delete(self, trans_id):
+        def tulis(conn):
+            conn.execute("DELETE FROM transaksi WHERE id = ?", (trans_id,))
+
+        self._write(tulis)
+
+    def aggregate(self, start_ts=None, end_ts=None, by=None):
+        return self.query_sum(Query(start_ts, end_ts), by)
+
+    def query_sum(self, q, by=None):
+        grup = _GROUPS[by]
+        where_sql, params = self._where(q)
+
+        rows = self._query(
+            f"SELECT {grup}, tipe, SUM(jumlah), MIN(timestamp) AS pertama "
+            f"FROM transaksi {where_sql} GROUP BY {grup}, tipe ORDER BY pertama",
+            params,
+        )
+        hasil = {}
+        for key, tipe, total, _ in rows:
+            hasil.setdefault(key, {})[tipe] = total
+        return hasil
+
+    def store(self):
+        if self._store is None:
+            self._store = SqliteStore(self)
+        with self._lock:
+            self._db()
+            changed = self._check_timezone()
+        if changed:
+            for path in self.watched_files():
+                data_store._remember_write(path)
+            self._store.invalidate()
+        return self._store
+
+    def reload(self):
+        if self._store is not None:
+            self._store.invalidate()
+
+    def reload_changes(self):
+        with self._lock:
+            conn = self._db()
+            entries = conn.execute(
+                "SELECT seq, op, row_id FROM perubahan WHERE seq > ? ORDER BY seq",
+                (self._seen_seq,),
+            ).fetchall()
+
+            diff = data_store.ReloadDiff([], [], [])
+            for seq, op, row_id in entries:
+                self._seen_seq = seq
+                if seq in self._own_seqs:
+                    self._own_seqs.discard(seq)
+                    continue
+                if op == "delete":
+                    diff.removed.append({"id": row_id})
+                    continue
+                row = conn.execute(
+                    f"SELECT {_COLUMNS} FROM transaksi WHERE id = ?", (row_id,)
+                ).fetchone()
+                if row is not None:
+                    (diff.added if op == "add" else diff.changed).append(_row_dict(row))
+
+        if any(diff):
+            self.reload()
+        return diff
+
+    def watched_files(self):
+        return (self.path, self.path + "-wal")
+
+
+class SqliteStore:
+    """Permukaan query TransactionStore di atas SqliteBackend.
+
+    Jumlah baris, daftar tanggal/kategori dan total ringkasan di-cache
+    sampai ada tulisan atau perubahan dari luar (invalidate()).
+
+    Potongan per posisi (tabel virtual) memakai keyset paging: kunci
+    (timestamp, id) setiap KEYSET_PAGE baris dicatat sebagai jangkar, lalu
+    potongan dibaca dengan WHERE (timestamp, id) > jangkar, jadi biayanya
+    tidak tumbuh dengan posisi scroll seperti OFFSET dari awal tabel.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.aggregates = SqliteAggregates(self)
+        self.rollups = SqliteRollups(self)
+        self._cache = {}
+        self._anchors = [None]  # jangkar ke-k: kunci baris ke-(k*KEYSET_PAGE - 1)
+        self._version = 0
+        # dipakai bersama thread worker refresh & main loop Tk
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+            self._anchors = [None]
+            self._version += 1
+
+    def version(self, start_ts=None, end_ts=None):
+        # kasar: setiap tulisan/perubahan dari luar mengganti versi semua periode
+        return id(self), self._version
+
+    def _cached(self, key, compute):
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            versi = self._version
+        # query dijalankan tanpa kunci; hasilnya dibuang bila sementara itu
+        # ada tulisan (invalidate), supaya nilai basi tidak masuk cache
+        value = compute()
+        with self._lock:
+            if self._version == versi:
+                self._cache[key] = value
+        return value
+
+    def __len__(self):
+        return self._cached(
+            "len", lambda: self.backend._query("SELECT COUNT(*) FROM transaksi")[0][0]
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if stop <= start:
+                return []
+            k, sisa = divmod(start, KEYSET_PAGE)
+            anchor = self._anchor(k)
+            if anchor is _END:
+                return []  # tabel memendek sejak len(); refresh menyusul
+            # OFFSET di sini < KEYSET_PAGE: hanya sisa baris dari jangkar
+            where, params = _after(anchor)
+            rows = self.backend._query(
+                f"SELECT {_COLUMNS} FROM transaksi {where} "
+                "ORDER BY timestamp, id LIMIT ? OFFSET ?",
+                params + (stop - start, sisa),
+            )
+            return [_row_dict(r) for r in rows][::step]
+
+        if index < 0:
+            index += len(self)
+        rows = self[index:index + 1] if index >= 0 else []
+        if not rows:
+            raise IndexError(index)
+        return rows[0]
+
+    def _anchor(self, k):
+        """Kunci (timestamp, id) baris sebelum posisi k*KEYSET_PAGE (None untuk k=0).
+
+        Jangkar dicari berurutan dari jangkar terakhir yang diketahui (satu
+        lompatan KEYSET_PAGE baris lewat indeks timestamp per jangkar) lalu
+        disimpan sampai invalidate(); _END bila tabel lebih pendek.
+        """
+        with self._lock:
+            versi = self._version
+            anchors = list(self._anchors)
+        while len(anchors) <= k:
+            where, params = _after(anchors[-1])
+            rows = self.backend._query(
+                f"SELECT timestamp, id FROM transaksi {where} "
+                "ORDER BY timestamp, id LIMIT 1 OFFSET ?",
+                params + (KEYSET_PAGE - 1,),
+            )
+            if not rows:
+                return _END
+            anchors.append(tuple(rows[0]))
+        with self._lock:
+            # seperti _cached: jangkar dari sebelum tulisan tidak disimpan
+            if self._version == versi and len(anchors) > len(self._anchors):
+                self._anchors = anchors
+        return anchors[k]
+
+    def all(self):
+        return self[:]
+
+    def find(self, trans_id):
+        return self.backend.get(trans_id)
+
+    def range(self, start, end):
+        return self.backend.range(start.timestamp(), end.timestamp())
+
+    def day(self, d):
+        start = datetime(d.year, d.month, d.day)
+        return self.range(start, start + timedelta(days=1))
+
+    def month(self, d):
+        start = datetime(d.year, d.month, 1)
+        end = datetime(d.year + d.month // 12, d.month % 12 + 1, 1)
+        return self.range(start, end)
+
+    def dates(self):
+        return self._cached("dates", lambda: [
+            day_label(r[0]) for r in self.backend._query(
+                "SELECT DISTINCT hari FROM transaksi ORDER BY hari"
+            )
+        ])
+
+    def categories(self):
+        return self._cached("categories", lambda: [
+            r[0] for r in self.backend._query(
+                "SELECT DISTINCT kategori FROM transaksi ORDER BY kategori"
+            )
+        ])
+
+    def sum_by(self, start_ts=None, end_ts=None, by=None):
+        return self.backend.aggregate(start_ts, end_ts, by)
+
+    def query(self, q, limit=None):
+        # SQLite + indeksnya cukup cepat: seluruh rentang dalam satu langkah
+        return self.backend.query(q), None
+
+    def query_sum(self, q, by=None):
+        return self.backend.query_sum(q, by)
+
+
+class SqliteAggregates:
+    """Ringkasan saldo & total per bulan/hari lewat SUM di SQL (hasil di-cache)."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def _total(self, by, key):
+        per_grup = self.store._cached(
+            ("sum", by), lambda: self.store.backend.aggregate(by=by)
+        )
+        return per_grup.get(key, {})
+
+    def saldo(self):
+        total = self._total(None, None)
+        return total.get("pemasukan", 0) - total.get("pengeluaran", 0)
+
+    def month_total(self, d, tipe):
+        return self._total("bulan", month_of(d)).get(tipe, 0)
+
+    def day_total(self, d, tipe):
+        return self._total("hari", day_of(d)).get(tipe, 0)
+
+    def verify(self, transaksi=None):
+        """Hitung ulang tabel rollup dengan SUM ... GROUP BY atas transaksi.
+
+        Hasil berupa dict {(level, kunci, kategori, tipe): ((total, n)
+        seharusnya, (total, n) tersimpan)}; dict kosong berarti tabel rollup
+        (dijaga trigger) sama dengan isi transaksi.
+        """
+        backend = self.store.backend
+        fresh = rollups.Rollups()
+        with backend._lock:
+            conn = backend._db()
+            with conn:
+                # kedua sisi dibaca dari satu snapshot database
+                conn.execute("BEGIN")
+                for level, kunci in _ROLLUP_LEVELS:
+                    for key, kategori, tipe, total, n in conn.execute(
+                        f"SELECT {kunci.format(r='')} AS k, kategori, tipe, "
+                        "SUM(jumlah), COUNT(*) FROM transaksi GROUP BY k, kategori, tipe"
+                    ):
+                        fresh.levels[level].setdefault(key, {})[(kategori, tipe)] = [total, n]
+                tersimpan = _rollup_snapshot(conn)
+        return {entry[:4]: entry[4:] for entry in fresh.diff(tersimpan)}
+
+
+class SqliteRollups:
+    """Permukaan query rollups.Rollups di atas tabel rollup (hasil di-cache)."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def _rows(self, level, lo, hi, grup):
+        return self.store._cached(("rollup", level, lo, hi, grup), lambda: (
+            self.store.backend._query(
+                f"SELECT {grup}, tipe, SUM(total) FROM rollup "
+                "WHERE level = ? AND kunci BETWEEN ? AND ? "
+                f"GROUP BY {grup}, tipe",
+                (level, lo, hi),
+            )
+        ))
+
+    def totals(self, level, lo, hi):
+        hasil = {}
+        for key, tipe, total in self._rows(level, lo, hi, "kunci"):
+            hasil.setdefault(key, {})[tipe] = total
+        return hasil
+
+    def by_kategori(self, level, lo, hi):
+        hasil = {}
+        for kategori, tipe, total in self._rows(level, lo, hi, "kategori"):
+            hasil.setdefault(kategori, {})[tipe] = total
+        return hasil
+
+    def snapshot(self):
+        """Isi tabel rollup sebagai rollups.Rollups (untuk diff / verify)."""
+        backend = self.store.backend
+        with backend._lock:
+            return _rollup_snapshot(backend._db())
+
+    def diff(self, other, tol=0.005):
+        return self.snapshot().diff(other, tol)
+
+
+def _rollup_snapshot(conn):
+    hasil = rollups.Rollups()
+    for level, key, kategori, tipe, total, n in conn.execute(
+        "SELECT level, kunci, kategori, tipe, total, n FROM rollup"
+    ):
+        hasil.levels[level].setdefault(key, {})[(kategori, tipe)] = [total, n]
+    return hasil
+
+
+def migrate(json_path=None, db_path=FILE_DB):
+    """Salin isi data_cash.json (+ journal) ke database SQLite sekali jalan."""
+    if json_path is None:
+        data = data_store.JsonBackend().load()
+    else:
+        data = data_store.read_ledger(json_path)
+    backend = SqliteBackend(db_path)
+    backend.init()
+    backend.save(data)
+    return len(data["transaksi"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alat backend SQLite Cash Tracker")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("migrate", help="pindahkan data_cash.json ke SQLite")
+    p.add_argument("--json", default=data_store.FILE_JSON)
+    p.add_argument("--db", default=FILE_DB)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "migrate":
+        n = migrate(args.json, args.db)
+        print(f"{n} transaksi dipindahkan ke {args.db}")
+
+
+if __name__ == "__main__":
+    main()
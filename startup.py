@@ -0,0 +1,90 @@
+# startup.py
+"""Timer startup dan cache ringkasan untuk tampilan pertama.
+
+Startup dibagi bertahap: jendela + label ringkasan (dari cache) tampil
+lebih dulu, data dimuat di worker, matplotlib baru diimpor saat panel
+grafik pertama kali digambar dan watchdog dijalankan setelah first paint.
+StartupTimer mencatat kapan tiap tahap tercapai, dihitung dari awal
+main.py, supaya regresi cold start bisa dilacak dari log.
+"""
+import json
+import os
+import time
+from datetime import date
+
+import instrumentation
+
+LOG_FILE = "cash_tracker_startup.log"
+SUMMARY_FILE = "data_cash.summary.json"
+
+
+class StartupTimer:
+    """Tandai tahap startup (ms sejak `t0`); tiap tahap hanya dicatat sekali."""
+
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.marks = {}
+        self.reported = False
+
+    def mark(self, stage):
+        if stage in self.marks:
+            return
+        ms = (time.perf_counter() - self.t0) * 1000
+        self.marks[stage] = round(ms, 1)
+        instrumentation.record(f"startup.{stage}", ms)
+
+    def done(self, *stages):
+        return all(stage in self.marks for stage in stages)
+
+    def dump(self, path=LOG_FILE):
+        """Tambahkan satu baris JSON {waktu, tahap: ms} ke log startup."""
+        entry = {"waktu": time.strftime("%Y-%m-%d %H:%M:%S"), "tahap": self.marks}
+        with open(path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self.reported = True
+        return entry
+
+
+# -------------------------------------------------------------
+#   CACHE RINGKASAN
+# -------------------------------------------------------------
+_saved = None  # isi terakhir yang ditulis proses ini
+
+
+def _jsonable(value):
+    return json.loads(json.dumps(value))
+
+
+def load_summary(signature, path=SUMMARY_FILE):
+    """(saldo, pengeluaran bulan ini, hari ini) dari cache, atau None.
+
+    Hanya dipakai bila file data belum berubah sejak cache ditulis dan
+    cache dibuat hari ini (total bulan/hari bergantung tanggal).
+    """
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("signature") != _jsonable(signature):
+        return None
+    if cached.get("tanggal") != date.today().isoformat():
+        return None
+    return tuple(cached["summary"])
+
+
+def save_summary(signature, summary, path=SUMMARY_FILE):
+    """Simpan ringkasan untuk startup berikutnya (hanya bila berubah)."""
+    global _saved
+    entry = {
+        "signature": _jsonable(signature),
+        "tanggal": date.today().isoformat(),
+        "summary": list(summary),
+    }
+    if entry == _saved:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+    _saved = entry
@@ -0,0 +1,167 @@
+# table_view.py
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(tk.Frame):
+    """Treeview dengan virtual scrolling.
+
+    Hanya baris yang terlihat (+ `buffer` baris) yang dibuat sebagai item
+    Treeview. Item-item itu dipakai ulang: saat di-scroll, cukup nilai dan
+    tag-nya yang diganti dengan baris lain dari sumber data. Sumber data
+    cukup mendukung len() dan slicing (list, TransactionStore, ...).
+    """
+
+    def __init__(self, parent, columns, format_row, buffer=5, bg=None):
+        super().__init__(parent, bg=bg)
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=10)
+        self.scroll = ttk.Scrollbar(
+            self, orient="vertical", command=self._on_scrollbar
+        )
+        self.tree.configure(yscrollcommand=self._on_tree_yview)
+
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scroll.pack(side="right", fill="y")
+
+        self.format_row = format_row  # (nomor, transaksi) -> values
+        self.buffer = buffer
+
+        self._rows = []
+        self._key = None
+        self._offset = 0      # indeks baris sumber pada item pertama
+        self._visible = 10    # banyak baris yang muat di layar
+        self._selected = None  # indeks baris sumber yang dipilih
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", self._on_wheel)
+        self.tree.bind("<Button-5>", self._on_wheel)
+        self.tree.bind("<Up>", lambda e: self._on_key(-1))
+        self.tree.bind("<Down>", lambda e: self._on_key(1))
+        self.tree.bind("<Prior>", lambda e: self._on_key(-self._visible))
+        self.tree.bind("<Next>", lambda e: self._on_key(self._visible))
+
+    # ----------------------------- API -----------------------------
+    def set_rows(self, rows, key=None):
+        """Ganti sumber data lalu gambar ulang jendela yang terlihat.
+
+        Posisi scroll & pilihan dipertahankan selama `key` (mis. filter
+        yang aktif) sama dengan pemanggilan sebelumnya.
+        """
+        if key != self._key:
+            self._offset = 0
+            self._selected = None
+        self._key = key
+        self._rows = rows
+        self._render()
+
+    def selected_values(self):
+        """Nilai kolom untuk baris yang dipilih, atau None."""
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        return self.tree.item(selection[0], "values")
+
+    # ---------------------------- render ----------------------------
+    def _render(self):
+        n = len(self._rows)
+        self._offset = max(0, min(self._offset, n - self._visible))
+
+        window = self._rows[self._offset:self._offset + self._visible + self.buffer]
+        items = list(self.tree.get_children())
+
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+            del items[len(window):]
+        while len(items) < len(window):
+            items.append(self.tree.insert("", "end"))
+
+        for pos, (iid, t) in enumerate(zip(items, window)):
+            i = self._offset + pos + 1
+            self.tree.item(
+                iid,
+                values=self.format_row(i, t),
+                tags=("odd" if i % 2 else "even",),
+            )
+
+        if self._selected is not None and 0 <= self._selected - self._offset < len(items):
+            iid = items[self._selected - self._offset]
+            self.tree.selection_set(iid)
+            self.tree.focus(iid)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        self.tree.yview_moveto(0)
+        if n:
+            self.scroll.set(self._offset / n, min(1.0, (self._offset + self._visible) / n))
+        else:
+            self.scroll.set(0.0, 1.0)
+
+    def _scroll_to(self, offset):
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    # ---------------------------- events ----------------------------
+    def _on_resize(self, event):
+        items = self.tree.get_children()
+        bbox = self.tree.bbox(items[0]) if items else None
+        if bbox:
+            header, row_h = bbox[1], bbox[3]
+        else:
+            header = 24
+            row_h = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+        visible = max(1, (event.height - header) // row_h)
+        if visible != self._visible:
+            self._visible = visible
+            self._render()
+
+    def _on_select(self, event):
+        # seleksi kosong diabaikan: itu terjadi saat baris terpilih
+        # keluar dari jendela, bukan karena pengguna membatalkan pilihan
+        selection = self.tree.selection()
+        if selection:
+            self._selected = self._offset + self.tree.index(selection[0])
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            step = -3
+        else:
+            step = 3
+        self._scroll_to(self._offset + step)
+        return "break"
+
+    def _on_key(self, step):
+        if not self._rows:
+            return "break"
+
+        current = self._selected if self._selected is not None else self._offset
+        self._selected = max(0, min(len(self._rows) - 1, current + step))
+
+        if self._selected < self._offset:
+            self._offset = self._selected
+        elif self._selected >= self._offset + self._visible:
+            self._offset = self._selected - self._visible + 1
+        self._render()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        n = len(self._rows)
+        if action == "moveto":
+            offset = int(float(amount) * n)
+        elif unit == "pages":
+            offset = self._offset + int(amount) * self._visible
+        else:
+            offset = self._offset + int(amount)
+        self._scroll_to(max(0, min(offset, n - self._visible)))
+
+    def _on_tree_yview(self, first, last):
+        # Treeview menggulir sendiri (mis. klik baris buffer di bawah):
+        # kembalikan ke atas dan geser offset sebanyak itu.
+        items = len(self.tree.get_children())
+        shift = round(float(first) * items)
+        if shift:
+            self._scroll_to(self._offset + shift)
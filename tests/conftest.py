@@ -0,0 +1,96 @@
+# tests/conftest.py
+"""Fixture bersama: setiap test berjalan di folder sementara sebagai cwd.
+
+Semua file ledger (data_cash.json, journal, shard, database) memakai path
+relatif, jadi cukup pindah cwd; state modul data_store (backend aktif,
+cache, store di memori) dikosongkan sebelum dan sesudah setiap test.
+"""
+import os
+import subprocess
+import sys
+import textwrap
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)  # modul aplikasi ada di level atas repo
+
+import data_store  # noqa: E402
+
+BACKENDS = ("json", "shard", "sqlite")
+CONTENT = ("tipe", "jumlah", "kategori", "keterangan", "timestamp")
+
+# awal data uji: 2024-01-01 waktu lokal, supaya kunci tanggal tidak bergeser
+START = datetime(2024, 1, 1).timestamp()
+
+
+def _reset():
+    data_store.wait_for_compaction()
+    backend = data_store._backend
+    if getattr(backend, "_conn", None) is not None:
+        backend._conn.close()  # SQLite
+    data_store._backend = None
+    data_store._journal_seq = None
+    data_store._journal_count = 0
+    data_store.drop_cache()
+
+
+@pytest.fixture
+def ledger_dir(tmp_path, monkeypatch):
+    """Folder kosong sebagai cwd, backend JSON dengan snapshot format JSON."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_store, "SNAPSHOT_FORMAT", "json")
+    monkeypatch.delenv("CASH_TRACKER_BACKEND", raising=False)
+    monkeypatch.delenv("CASH_TRACKER_SNAPSHOT", raising=False)
+    _reset()
+    yield tmp_path
+    _reset()
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, ledger_dir, monkeypatch):
+    """Nama backend aktif (json / shard / sqlite), sudah di-init di ledger_dir."""
+    monkeypatch.setenv("CASH_TRACKER_BACKEND", request.param)
+    data_store.use_backend(request.param)
+    data_store.init_json()
+    return request.param
+
+
+def trans(i, **fields):
+    """Transaksi uji ke-`i`: tipe, kategori & jumlah bervariasi, satu per 7 jam."""
+    ts = START + i * 7 * 3600
+    t = {
+        "tipe": "pemasukan" if i % 5 == 0 else "pengeluaran",
+        "jumlah": 1000 + 250 * (i % 13),
+        "kategori": ("Makan", "Transport", "Gaji", "Belanja")[i % 4],
+        "keterangan": f"transaksi {i} " + ("makan siang", "ojek kantor", "bulanan")[i % 3],
+        "waktu": datetime.fromtimestamp(ts).strftime("%H:%M:%S"),
+        "timestamp": ts,
+    }
+    t.update(fields)
+    return t
+
+
+def content(rows):
+    """{id: (isi transaksi)} untuk membandingkan ledger tanpa peduli urutan & tipe angka."""
+    return {
+        t["id"]: tuple(float(t[k]) if k in ("jumlah", "timestamp") else t[k] for k in CONTENT)
+        for t in rows
+    }
+
+
+def run_other(code):
+    """Jalankan `code` di proses Python lain (instance aplikasi lain) pada cwd ini.
+
+    Backend mengikuti CASH_TRACKER_BACKEND; data_store sudah diimpor dan
+    di-init. Mengembalikan stdout.
+    """
+    script = "import data_store\ndata_store.init_json()\n" + textwrap.dedent(code)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env["CASH_TRACKER_SNAPSHOT"] = data_store.SNAPSHOT_FORMAT
+    proc = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout
@@ -0,0 +1,101 @@
+# tests/test_aggregates.py
+"""Total berjalan ringkasan tetap sama dengan hitung ulang dari nol."""
+import json
+from datetime import datetime
+
+import pytest
+
+import data_store
+import shards
+from conftest import trans
+
+
+def _check(store):
+    rows = store.all()
+    assert store.aggregates.verify(rows) == {}
+
+    pemasukan = sum(t["jumlah"] for t in rows if t["tipe"] == "pemasukan")
+    pengeluaran = sum(t["jumlah"] for t in rows if t["tipe"] == "pengeluaran")
+    assert store.aggregates.saldo() == pemasukan - pengeluaran
+
+
+def test_verify_after_add_edit_delete(backend):
+    ids = [data_store.add_transaction(trans(i)) for i in range(60)]
+    store = data_store.get_store()
+    _check(store)
+
+    data_store.edit_transaction(ids[3], {"jumlah": 7, "tipe": "pemasukan"})
+    data_store.edit_transaction(ids[10], {"kategori": "Baru"})
+    # pindah bulan: bucket bulan & hari lama harus berkurang
+    data_store.edit_transaction(ids[11], {"timestamp": trans(200)["timestamp"]})
+    _check(data_store.get_store())
+
+    for trans_id in ids[::4]:
+        data_store.delete_transaction(trans_id)
+    store = data_store.get_store()
+    _check(store)
+    assert len(store.all()) == 60 - len(ids[::4])
+
+
+def test_month_and_day_totals(backend):
+    for i in range(40):
+        data_store.add_transaction(trans(i))
+    store = data_store.get_store()
+    rows = store.all()
+
+    d = datetime.fromtimestamp(rows[5]["timestamp"])
+    bulan = sum(
+        t["jumlah"] for t in rows
+        if t["tipe"] == "pengeluaran"
+        and datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m") == d.strftime("%Y-%m")
+    )
+    hari = sum(
+        t["jumlah"] for t in rows
+        if t["tipe"] == "pengeluaran"
+        and datetime.fromtimestamp(t["timestamp"]).date() == d.date()
+    )
+    assert store.aggregates.month_total(d, "pengeluaran") == bulan
+    assert store.aggregates.day_total(d, "pengeluaran") == hari
+
+
+def test_verify_reports_drift(ledger_dir):
+    data_store.init_json()
+    for i in range(5):
+        data_store.add_transaction(trans(i))
+    store = data_store.get_store()
+    store.aggregates.total["pengeluaran"] += 1
+    assert list(store.aggregates.verify(store.all())) == [("total", None, "pengeluaran")]
+
+
+@pytest.mark.parametrize("backend", ["sqlite"], indirect=True)
+def test_sqlite_verify_reports_drift(backend):
+    for i in range(5):
+        data_store.add_transaction(trans(i))
+    store = data_store.get_store()
+    assert store.aggregates.verify() == {}
+
+    # ubah tabel rollup langsung, tanpa lewat trigger
+    db = store.backend
+    with db._lock, db._db() as conn:
+        conn.execute("UPDATE rollup SET total = total + 1 WHERE level = 'bulan'")
+    drift = store.aggregates.verify()
+    assert drift and {key[0] for key in drift} == {"bulan"}
+
+
+@pytest.mark.parametrize("backend", ["shard"], indirect=True)
+def test_shard_verify_reports_drift(backend):
+    for i in range(5):
+        data_store.add_transaction(trans(i))
+    store = data_store.get_store()
+    assert store.aggregates.verify() == {}
+
+    # total di manifest tidak lagi sama dengan isi file bulannya
+    path = store.backend.manifest_path
+    with open(path) as f:
+        raw = json.load(f)
+    label, entry = sorted(raw["shards"].items())[0]
+    entry["total"][0][2] += 1
+    with open(path, "w") as f:
+        json.dump(raw, f)
+    drift = store.aggregates.verify()
+    assert [key[:2] for key in drift] == [("bulan", shards._month_key(label))]
@@ -0,0 +1,48 @@
+# tests/test_aggregation.py
+"""sum_by NumPy sama dengan loop Python untuk setiap pengelompokan."""
+import random
+
+import pytest
+
+import aggregation
+from conftest import START, trans
+from data_store import TransactionStore
+
+pytestmark = pytest.mark.skipif(not aggregation.available(), reason="numpy tidak ada")
+
+
+@pytest.fixture
+def store():
+    rng = random.Random(11)
+    rows = [
+        dict(trans(i), timestamp=START + rng.uniform(0, 120 * 86400))
+        for i in range(500)
+    ]
+    return TransactionStore(rows)
+
+
+def _python_sum_by(store, monkeypatch, *args):
+    with monkeypatch.context() as m:
+        m.setattr(aggregation, "np", None)
+        return store.sum_by(*args)
+
+
+def _approx(hasil):
+    return {k: pytest.approx(v) for k, v in hasil.items()}
+
+
+@pytest.mark.parametrize("by", [None, "hari", "bulan", "kategori"])
+def test_matches_python_loop(store, monkeypatch, by):
+    for start_ts, end_ts in [
+        (None, None),
+        (START + 10 * 86400, START + 40 * 86400),
+        (START + 33.5 * 86400, START + 34 * 86400),
+    ]:
+        expected = _python_sum_by(store, monkeypatch, start_ts, end_ts, by)
+        assert store.sum_by(start_ts, end_ts, by) == _approx(expected)
+
+
+def test_empty_range_and_unknown_group(store):
+    assert store.sum_by(START - 10, START - 5, "hari") == {}
+    with pytest.raises(ValueError):
+        store.sum_by(by="minggu")
@@ -0,0 +1,45 @@
+# tests/test_benchmarks.py
+"""Ledger sintetis valid dan pembanding baseline benchmark."""
+import json
+import os
+
+import data_store
+from benchmarks import ledger, suite
+
+
+def test_synthetic_ledger_loads(ledger_dir):
+    ledger.write_ledger(data_store.FILE_JSON, 500, years=1)
+    data = data_store.load_json()
+    rows = list(data["transaksi"])
+
+    assert len(rows) == 500
+    ids = [t["id"] for t in rows]
+    assert ids == sorted(set(ids))
+    ts = [t["timestamp"] for t in rows]
+    assert ts == sorted(ts) and ts[-1] <= ledger.DEFAULT_END + 86400
+    assert set(data["kategori"]) == {t["kategori"] for t in rows}
+    assert data_store.get_store().aggregates.verify(data_store.get_store().all()) == {}
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"results": {"1000": {"load_json": 10.0, "render_bar": 0.2}}}
+    results = {"1000": {"load_json": 16.0, "render_bar": 0.9}}
+    # load_json 60% lebih lambat: regresi; render_bar di bawah min_ms: noise
+    assert suite.compare(results, baseline, 0.5, 1.0) == [("1000", "load_json", 10.0, 16.0)]
+    assert suite.compare(results, baseline, 0.7, 1.0) == []
+
+
+def test_compare_flags_stages_missing_from_baseline():
+    baseline = {"results": {"1000": {"load_json": 10.0}}}
+    results = {"1000": {"load_json": 10.0, "query": 3.0}, "5000": {"load_json": 40.0}}
+    # ukuran 5000 tidak ada di baseline sama sekali: tidak dibandingkan
+    assert suite.compare(results, baseline, 0.5, 1.0) == [("1000", "query", None, 3.0)]
+
+
+def test_suite_covers_baseline_stages(ledger_dir):
+    # baseline.json harus memuat setiap tahap yang diukur suite
+    results = suite.run([200], repeat=1, io_repeat=1)
+    with open(os.path.join(os.path.dirname(suite.__file__), "baseline.json")) as f:
+        baseline = json.load(f)
+    for stages in baseline["results"].values():
+        assert set(stages) == set(results["200"])
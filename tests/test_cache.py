@@ -0,0 +1,49 @@
+# tests/test_cache.py
+"""load_json mem-parse ulang hanya bila file di disk berubah."""
+import json
+
+import data_store
+from conftest import trans
+
+
+def _stats():
+    return dict(data_store.cache_stats)
+
+
+def test_repeated_loads_hit_cache(ledger_dir):
+    data_store.init_json()
+    first = data_store.load_json()
+    before = _stats()
+
+    for _ in range(5):
+        assert data_store.load_json() is first
+    after = _stats()
+    assert after["hits"] - before["hits"] == 5
+    assert after["misses"] == before["misses"]
+
+
+def test_own_append_keeps_cache_fresh(ledger_dir):
+    data_store.init_json()
+    store = data_store.get_store()
+    data_store.add_transaction(trans(0))
+    before = _stats()
+
+    data = data_store.load_json()
+    assert _stats()["misses"] == before["misses"]
+    assert len(data["transaksi"]) == len(store.all()) == 1
+
+
+def test_external_change_invalidates(ledger_dir):
+    data_store.init_json()
+    data_store.add_transaction(trans(0))
+    data_store.load_json()
+    before = _stats()
+
+    # proses lain menambah record ke journal
+    seq = data_store.load_json()["journal_seq"] + 1
+    with open(data_store.FILE_JOURNAL, "a") as f:
+        f.write(json.dumps({"seq": seq, "op": "add", "data": trans(1)}) + "\n")
+
+    data = data_store.load_json()
+    assert _stats()["misses"] == before["misses"] + 1
+    assert len(data["transaksi"]) == 2
@@ -0,0 +1,133 @@
+# tests/test_charts.py
+"""Data grafik sama dengan hitung ulang; artist & cache dipakai ulang antar refresh."""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("matplotlib")
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+import charts  # noqa: E402
+import data_store  # noqa: E402
+from conftest import trans  # noqa: E402
+
+
+def _canvas():
+    figure = Figure()
+    return figure, FigureCanvasAgg(figure)
+
+
+def _ledger(n):
+    data_store.init_json()
+    for i in range(n):
+        data_store.add_transaction(trans(i))
+    return data_store.get_store()
+
+
+def test_series_match_brute_force(ledger_dir):
+    store = _ledger(150)
+    rows = store.all()
+    ref = datetime.fromtimestamp(rows[40]["timestamp"])
+
+    start = charts._week_start(ref)
+    days = [start + timedelta(days=i) for i in range(7)]
+    expected = ([], [])
+    for d in days:
+        harian = [t for t in rows if datetime.fromtimestamp(t["timestamp"]).date() == d.date()]
+        for out, tipe in zip(expected, ("pemasukan", "pengeluaran")):
+            out.append(sum(t["jumlah"] for t in harian if t["tipe"] == tipe))
+    assert charts.bar_series(store, ref, "mingguan") == expected
+
+    kategori = defaultdict(int)
+    for t in rows:
+        dt = datetime.fromtimestamp(t["timestamp"])
+        if t["tipe"] == "pengeluaran" and (dt.year, dt.month) == (ref.year, ref.month):
+            kategori[t["kategori"]] += t["jumlah"]
+    labels, sizes = charts.pie_series(store, ref, "bulanan")
+    assert dict(zip(labels, sizes)) == kategori
+
+
+def test_bar_chart_reuses_bars_within_mode():
+    chart = charts.BarChart(*_canvas())
+    chart.update("mingguan", [1] * 7, [2] * 7)
+    ax, bars = chart.ax, list(chart.bars_p)
+
+    chart.update("mingguan", list(range(7)), [5] * 7)
+    assert chart.ax is ax
+    assert list(chart.bars_p) == bars
+    assert [b.get_height() for b in chart.bars_p] == list(range(7))
+
+    chart.update("bulanan", [1] * 5, [1] * 5)
+    assert chart.ax is not ax
+    assert len(chart.bars_p) == 5
+
+
+def test_pie_chart_moves_wedges_like_fresh_pie():
+    labels = ["Makan", "Transport", "Belanja"]
+    chart = charts.PieChart(*_canvas())
+    chart.update(labels, [1, 1, 1])
+    wedges = list(chart.wedges)
+
+    chart.update(labels, [10, 30, 60])
+    assert chart.wedges == wedges
+
+    fresh = charts.PieChart(*_canvas())
+    fresh.update(labels, [10, 30, 60])
+    for moved, new in zip(chart.wedges, fresh.wedges):
+        assert moved.theta1 == pytest.approx(new.theta1)
+        assert moved.theta2 == pytest.approx(new.theta2)
+    assert [t.get_text() for t in chart.autotexts] == [t.get_text() for t in fresh.autotexts]
+
+    chart.update([], [])
+    assert chart.wedges == [] and chart.empty_text.get_visible()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = charts.LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" baru dipakai, "b" yang tertua
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_chart_data_cached_until_period_changes(backend):
+    charts.series_cache.clear()
+    for i in range(30):
+        data_store.add_transaction(trans(i))
+    store = data_store.get_store()
+    ref = datetime.fromtimestamp(trans(10)["timestamp"])
+
+    first = charts.chart_data(store, ref, "mingguan")
+    assert charts.chart_data(store, ref, "mingguan") is first
+
+    # transaksi baru di minggu yang sama: versi periode naik, data dihitung ulang
+    data_store.add_transaction(trans(10, jumlah=7, tipe="pengeluaran"))
+    store = data_store.get_store()
+    second = charts.chart_data(store, ref, "mingguan")
+    assert second is not first
+    assert sum(second.bar[1]) == sum(first.bar[1]) + 7
+
+    if backend == "json":
+        # periode lain tidak membuat cache minggu ini basi
+        data_store.add_transaction(trans(500))
+        assert charts.chart_data(data_store.get_store(), ref, "mingguan") is second
+
+
+def test_raster_cache_blits_known_state():
+    figure, canvas = _canvas()
+    chart = charts.BarChart(figure, canvas)
+    chart.update("mingguan", [1] * 7, [2] * 7, key="minggu-1")
+    chart.update("mingguan", [3] * 7, [1] * 7, key="minggu-2")
+
+    # state yang sudah pernah digambar cukup di-blit
+    assert chart.raster.show("minggu-1")
+    assert not chart.raster.show("minggu-3")
+
+    # ukuran canvas berubah: buffer lama tidak dipakai
+    figure.set_size_inches(figure.get_size_inches() * 1.5)
+    assert not chart.raster.show("minggu-1")
@@ -0,0 +1,52 @@
+# tests/test_columnar.py
+"""ColumnarTransactions berperilaku seperti list dict transaksi."""
+from columnar import ColumnarTransactions
+from conftest import content, trans
+
+
+def _rows(n):
+    return [trans(i, id=i + 1) for i in range(n)]
+
+
+def test_round_trip_matches_dicts():
+    rows = _rows(50)
+    cols = ColumnarTransactions(rows)
+
+    assert len(cols) == 50
+    assert content(cols) == content(rows)
+    assert content(cols.to_dicts()) == content(rows)
+    assert dict(cols[3])["keterangan"] == rows[3]["keterangan"]
+    assert [t["tipe"] for t in cols[10:15]] == [t["tipe"] for t in rows[10:15]]
+
+
+def test_strings_are_interned():
+    cols = ColumnarTransactions(_rows(200))
+    assert len(cols.kategori_names) == 4
+    assert len(cols.keterangan_strings) == 200
+
+
+def test_delete_and_append_reuse_slot():
+    rows = _rows(10)
+    cols = ColumnarTransactions(rows)
+    rid = cols[4].rid
+
+    del cols[4]
+    del rows[4]
+    assert content(cols) == content(rows)
+
+    row = cols.append(trans(99, id=100))
+    rows.append(trans(99, id=100))
+    assert row.rid == rid
+    assert content(cols) == content(rows)
+
+
+def test_row_view_update_and_extra_fields():
+    cols = ColumnarTransactions(_rows(3))
+    row = cols[1]
+    row.update({"jumlah": 7, "kategori": "Baru", "catatan": "x"})
+
+    assert row["jumlah"] == 7
+    assert row["kategori"] == "Baru"
+    assert row["catatan"] == "x"
+    assert "catatan" in dict(row)
+    assert row == cols[1] and hash(row) == hash(cols[1])
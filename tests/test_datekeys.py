@@ -0,0 +1,54 @@
+# tests/test_datekeys.py
+"""Kunci tanggal integer dan deteksi perubahan zona waktu."""
+import time
+from datetime import date, datetime
+
+import pytest
+
+import datekeys
+from conftest import trans
+from data_store import TransactionStore
+
+# 2024-01-31 20:00 UTC: masih 31 Jan di UTC, sudah 1 Feb di UTC+10
+TS = 1706731200
+
+
+@pytest.fixture
+def set_tz(monkeypatch):
+    def set_tz(tz):
+        monkeypatch.setenv("TZ", tz)
+        time.tzset()
+
+    yield set_tz
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_keys_match_datetime():
+    for i in range(0, 2000, 37):
+        ts = trans(i)["timestamp"]
+        d = datetime.fromtimestamp(ts)
+        hari, bulan, pekan, minggu_ke = datekeys.date_keys(ts)
+        assert hari == datekeys.day_of(d)
+        assert datekeys.day_label(hari) == d.strftime("%Y-%m-%d")
+        assert datekeys.month_label(bulan) == d.strftime("%Y-%m")
+        assert pekan == d.isocalendar()[0] * 100 + d.isocalendar()[1]
+        assert minggu_ke == (d.day - 1) // 7 + 1
+
+
+def test_timezone_change_rebuilds_buckets(set_tz):
+    set_tz("UTC0")
+    store = TransactionStore([trans(0, timestamp=TS)])
+    assert store.dates() == ["2024-01-31"]
+    assert list(store.sum_by(by="bulan")) == [datekeys.month_of(date(2024, 1, 1))]
+
+    set_tz("UTC0")
+    store.check_timezone()  # zona sama: tidak ada yang dihitung ulang
+    assert not store.cols.refresh_date_keys()
+
+    set_tz("XYZ-10")
+    assert store.dates() == ["2024-01-31"]  # kunci lama sampai dicek
+    store.check_timezone()
+    assert store.dates() == ["2024-02-01"]
+    assert list(store.sum_by(by="bulan")) == [datekeys.month_of(date(2024, 2, 1))]
+    assert store.aggregates.verify(store.all()) == {}
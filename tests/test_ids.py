@@ -0,0 +1,65 @@
+# tests/test_ids.py
+"""Id transaksi: unik, O(1) lewat find, dan stabil untuk file lama tanpa id."""
+import json
+
+import data_store
+from conftest import run_other, trans
+
+
+def _legacy_file(rows):
+    # format sebelum ada id; dua baris kembar sengaja disertakan
+    with open(data_store.FILE_JSON, "w") as f:
+        json.dump({"transaksi": rows, "kategori": ["Makan"]}, f)
+
+
+def test_new_ids_are_unique(ledger_dir):
+    data_store.init_json()
+    ids = [data_store.add_transaction(trans(i)) for i in range(200)]
+    assert len(set(ids)) == 200
+    store = data_store.get_store()
+    assert all(store.find(i)["id"] == i for i in ids)
+
+
+def test_get_edit_delete_by_id(backend):
+    ids = [data_store.add_transaction(trans(i)) for i in range(10)]
+    data_store.edit_transaction(ids[4], {"kategori": "Baru"})
+    data_store.delete_transaction(ids[6])
+
+    assert data_store.get_transaction(ids[4])["kategori"] == "Baru"
+    assert data_store.get_transaction(ids[6]) is None
+    assert data_store.get_transaction(ids[5])["keterangan"] == trans(5)["keterangan"]
+
+
+def test_backfilled_ids_are_stable_across_processes(ledger_dir):
+    rows = [trans(i) for i in range(5)] + [trans(0)]
+    _legacy_file(rows)
+
+    # tanpa init_json: id belum ditulis ke disk
+    ids = [t["id"] for t in data_store.load_json()["transaksi"]]
+    assert all(ids) and len(set(ids)) == 6
+
+    lain = json.loads(run_other("""
+        import json
+        print(json.dumps([t["id"] for t in data_store.load_json()["transaksi"]]))
+    """))
+    assert lain == ids
+
+
+def test_edits_by_backfilled_id_survive_reload(ledger_dir):
+    _legacy_file([trans(i) for i in range(5)])
+    ids = [t["id"] for t in data_store.load_json()["transaksi"]]
+    data_store.get_store()
+    data_store.edit_transaction(ids[1], {"jumlah": 7})
+    data_store.delete_transaction(ids[2])
+
+    # instance lain / restart sebelum snapshot ditulis ulang
+    data_store.drop_cache()
+    store = data_store.get_store()
+    assert store.find(ids[1])["jumlah"] == 7
+    assert store.find(ids[2]) is None
+    assert len(store.all()) == 4
+
+    # init_json menulis id ke file; isinya tetap sama
+    data_store.init_json()
+    with open(data_store.FILE_JSON) as f:
+        assert [t["id"] for t in json.load(f)["transaksi"]] == [ids[0], ids[1], ids[3], ids[4]]
@@ -0,0 +1,49 @@
+# tests/test_importer.py
+"""Import CSV: validasi jumlah, buang duplikat saat impor ulang."""
+import pytest
+
+import data_store
+import importer
+
+CSV = """tanggal,jumlah,kategori,keterangan
+2024-01-01,-5000,Makan,nasi
+2024-01-02,"Rp 1.250.000",Gaji,gaji
+2024-01-03,abc,Makan,x
+2024-01-03,,Makan,x
+2024-01-32,100,Makan,x
+2024-01-04,100,,x
+2024-01-03,nan,Makan,x
+2024-01-03,inf,Makan,x
+2024-01-03,1e309,Makan,x
+2024-01-03,0,Makan,x
+"""
+
+
+@pytest.mark.parametrize("text", ["abc", "Rp", "1-2", "12,5", "12.5", "nan", "-inf", "Infinity", "1e309"])
+def test_parse_jumlah_rejects_non_numbers(text):
+    with pytest.raises(importer.RowError):
+        importer.parse_jumlah(text)
+
+
+def test_parse_jumlah_formats():
+    assert importer.parse_jumlah("Rp 1.250.000") == 1_250_000
+    assert importer.parse_jumlah("-50,000.00") == -50_000
+    assert importer.parse_jumlah("(7.500)") == -7500
+    assert importer.parse_jumlah("5.000,00") == 5000
+    assert type(importer.parse_jumlah("-50,000.00")) is int
+
+
+def test_import_rejects_invalid_rows_and_dedupes(ledger_dir):
+    (ledger_dir / "mutasi.csv").write_text(CSV)
+    data_store.init_json()
+
+    result = importer.import_csv("mutasi.csv")
+    assert (result.imported, result.rejected) == (2, 8)
+    assert [line for line, _ in result.errors] == list(range(4, 12))
+    store = data_store.get_store()
+    assert store.aggregates.saldo() == 1_250_000 - 5000
+
+    # impor ulang: baris yang sudah ada tidak ditambah lagi
+    result = importer.import_csv("mutasi.csv")
+    assert (result.imported, result.duplicates, result.rejected) == (0, 2, 8)
+    assert len(data_store.get_store().all()) == 2
@@ -0,0 +1,59 @@
+# tests/test_instrumentation.py
+"""Pengukur waktu per tahap: sampel bergulir, persentil, laporan."""
+import json
+
+import pytest
+
+import data_store
+import instrumentation
+from conftest import trans
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    instrumentation.reset()
+    yield
+    instrumentation.reset()
+
+
+def test_percentiles_over_rolling_window():
+    for ms in range(1, 301):
+        instrumentation.record("tahap", float(ms))
+
+    s = instrumentation.stats()["tahap"]
+    assert s["count"] == 300
+    assert s["last"] == 300
+    # hanya WINDOW (256) sampel terakhir, 45..300, yang dihitung
+    assert s["max"] == 300
+    assert s["p50"] == 45 + 128
+    assert instrumentation.last("tahap") == 300.0
+
+
+def test_timed_context_and_decorator(ledger_dir):
+    with instrumentation.timed("blok"):
+        pass
+
+    @instrumentation.timed("fungsi")
+    def fungsi():
+        return 42
+
+    assert fungsi() == 42 and fungsi() == 42
+    data_store.init_json()
+    data_store.add_transaction(trans(0))
+
+    s = instrumentation.stats()
+    assert s["blok"]["count"] == 1
+    assert s["fungsi"]["count"] == 2
+    assert s["store.add_transaction"]["count"] == 1
+    assert "fungsi" in instrumentation.format_report()
+
+
+def test_dump_appends_json_lines(ledger_dir):
+    instrumentation.record("tahap", 1.5)
+    path = instrumentation.dump(str(ledger_dir / "timing.log"))
+    instrumentation.dump(path)
+
+    with open(path) as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 2
+    assert entries[0]["tahap"]["tahap"]["p95"] == 1.5
@@ -0,0 +1,82 @@
+# tests/test_journal.py
+"""Journal append-only: replay di atas snapshot, sebelum & sesudah compaction."""
+import json
+import os
+
+import data_store
+from conftest import content, trans
+
+
+def _restart():
+    # seperti membuka aplikasi lagi: seq dibaca ulang dari disk
+    data_store._journal_seq = None
+    data_store._cache.update(key=None, data=None)
+    return data_store.load_json()
+
+
+def test_replay_without_compaction(ledger_dir):
+    data_store.init_json()
+    ids = [data_store.add_transaction(trans(i)) for i in range(10)]
+    data_store.edit_transaction(ids[2], {"jumlah": 1})
+    data_store.delete_transaction(ids[5])
+    expected = content(data_store.get_store().all())
+
+    # snapshot belum berubah; semua perubahan hanya ada di journal
+    with open(data_store.FILE_JSON) as f:
+        assert json.load(f)["transaksi"] == []
+    assert content(_restart()["transaksi"]) == expected
+
+
+def test_replay_after_compaction(ledger_dir):
+    data_store.init_json()
+    ids = [data_store.add_transaction(trans(i)) for i in range(20)]
+    data_store.edit_transaction(ids[0], {"keterangan": "diubah"})
+    data_store.delete_transaction(ids[1])
+    data_store.compact()
+
+    # semua record sudah dilipat ke snapshot: journal dibuang
+    assert not os.path.exists(data_store.FILE_JOURNAL)
+    with open(data_store.FILE_JSON) as f:
+        snapshot = json.load(f)
+    seq = snapshot["journal_seq"]
+    assert len(snapshot["transaksi"]) == 19
+
+    # record sesudah compaction menyambung seq & menuju baris di snapshot
+    data_store.edit_transaction(ids[2], {"jumlah": 5})
+    data_store.delete_transaction(ids[3])
+    ids.append(data_store.add_transaction(trans(99)))
+    records = data_store._read_journal()
+    assert [rec["seq"] for rec in records] == [seq + 1, seq + 2, seq + 3]
+
+    expected = content(data_store.get_store().all())
+    data = _restart()
+    assert data["journal_seq"] == seq + 3
+    assert content(data["transaksi"]) == expected
+    data_store.add_transaction(trans(100))  # seq lanjut setelah restart
+    assert data_store._read_journal()[-1]["seq"] == seq + 4
+
+
+def test_background_compaction(ledger_dir, monkeypatch):
+    monkeypatch.setattr(data_store, "COMPACT_THRESHOLD", 8)
+    data_store.init_json()
+    for i in range(30):
+        data_store.add_transaction(trans(i))
+    data_store._compact_thread.join()
+
+    expected = content(data_store.get_store().all())
+    assert len(expected) == 30
+    with open(data_store.FILE_JSON) as f:
+        assert json.load(f)["journal_seq"] > 0  # sudah pernah dipadatkan
+    assert content(_restart()["transaksi"]) == expected
+
+
+def test_truncated_last_line_is_ignored(ledger_dir):
+    data_store.init_json()
+    for i in range(3):
+        data_store.add_transaction(trans(i))
+    expected = content(data_store.get_store().all())
+
+    # proses lain mati di tengah menulis record
+    with open(data_store.FILE_JOURNAL, "a") as f:
+        f.write('{"seq": 4, "op": "add", "data": {"tipe"')
+    assert content(_restart()["transaksi"]) == expected
@@ -0,0 +1,120 @@
+# tests/test_migration.py
+"""Pindah data antar format/backend lalu kembali: isi ledger tidak berubah."""
+import os
+
+import data_store
+import sqlite_backend
+from conftest import content, trans
+
+
+def _ledger():
+    """Ledger JSON berisi tambah, edit & hapus (sebagian masih di journal)."""
+    data_store.init_json()
+    ids = [data_store.add_transaction(trans(i)) for i in range(40)]
+    data_store.compact()
+    data_store.edit_transaction(ids[0], {"jumlah": 1, "keterangan": "diubah"})
+    data_store.delete_transaction(ids[1])
+    data_store.add_transaction(trans(100, kategori="Kategori Baru"))
+    data = data_store.load_json()
+    return content(data["transaksi"]), set(data["kategori"])
+
+
+def _fresh_json():
+    """Kosongkan ledger JSON di cwd (tujuan migrasi balik)."""
+    data_store.wait_for_compaction()
+    for path in (data_store.FILE_JSON, data_store.FILE_JOURNAL, data_store.FILE_ROLLUPS):
+        if os.path.exists(path):
+            os.remove(path)
+    data_store.use_backend("json")
+    data_store.drop_cache()
+    data_store.init_json()
+
+
+def test_json_sqlite_round_trip(ledger_dir):
+    expected, kategori = _ledger()
+
+    n = sqlite_backend.migrate(data_store.FILE_JSON, "migrasi.db")
+    assert n == len(expected)
+    assert data_store.FILE_JSON == "data_cash.json"  # state modul tidak diubah
+
+    db = sqlite_backend.SqliteBackend("migrasi.db")
+    try:
+        data = db.load()
+        assert content(data["transaksi"]) == expected
+        assert set(data["kategori"]) == kategori
+        store = db.store()
+        assert store.aggregates.verify() == {}
+        assert len(store) == len(expected)
+    finally:
+        db._conn.close()
+
+    _fresh_json()
+    data_store.save_json(data)
+    data_store.drop_cache()
+    assert content(data_store.load_json()["transaksi"]) == expected
+
+
+def test_json_shard_round_trip(ledger_dir):
+    expected, kategori = _ledger()
+    data_store.wait_for_compaction()
+
+    # pindah ke backend shard: snapshot + journal dipecah per bulan
+    data_store.use_backend("shard")
+    data_store.init_json()
+    assert not os.path.exists(data_store.FILE_JSON)
+    assert os.path.exists(data_store.FILE_JSON + ".migrated")
+    data = data_store.load_json()
+    assert content(data["transaksi"]) == expected
+    assert set(data["kategori"]) == kategori
+    store = data_store.get_store()
+    assert store.aggregates.verify() == {}
+
+    # perubahan di backend shard ikut kembali ke JSON
+    trans_id = data_store.add_transaction(trans(200))
+    expected = content(data_store.load_json()["transaksi"])
+    assert trans_id in expected
+
+    data_store.use_backend("json")
+    data_store.drop_cache()
+    data_store.init_json()
+    assert content(data_store.load_json()["transaksi"]) == expected
+    assert os.path.exists("data_cash.shards.migrated")
+
+
+def test_json_binary_round_trip(ledger_dir, monkeypatch):
+    expected, _ = _ledger()
+    data_store.wait_for_compaction()
+
+    # ganti CASH_TRACKER_SNAPSHOT: snapshot ditulis ulang, journal tetap berlaku
+    monkeypatch.setattr(data_store, "SNAPSHOT_FORMAT", "bin")
+    data_store.drop_cache()
+    data_store.init_json()
+    assert os.path.exists(data_store.FILE_BIN)
+    assert not os.path.exists(data_store.FILE_JSON)
+    assert content(data_store.load_json()["transaksi"]) == expected
+
+    trans_id = data_store.add_transaction(trans(300))
+    data_store.compact()
+    expected = content(data_store.load_json()["transaksi"])
+    assert trans_id in expected
+    data_store.drop_cache()
+    assert content(data_store.load_json()["transaksi"]) == expected
+
+    monkeypatch.setattr(data_store, "SNAPSHOT_FORMAT", "json")
+    data_store.drop_cache()
+    data_store.init_json()
+    assert not os.path.exists(data_store.FILE_BIN)
+    assert content(data_store.load_json()["transaksi"]) == expected
+
+
+def test_binary_export_import(ledger_dir, monkeypatch):
+    monkeypatch.setattr(data_store, "SNAPSHOT_FORMAT", "bin")
+    expected, _ = _ledger()
+
+    import binary_snapshot
+    assert binary_snapshot.main(["export", "--out", "ekspor.json"]) == 0
+    data_store.delete_transaction(next(iter(expected)))
+    assert binary_snapshot.main(["import", "ekspor.json"]) == 0
+
+    data_store.drop_cache()
+    assert content(data_store.load_json()["transaksi"]) == expected
@@ -0,0 +1,127 @@
+# tests/test_query.py
+"""Query multi-kriteria: hasil planner berbasis indeks == filter brute force."""
+import random
+
+import pytest
+
+import data_store
+from conftest import START
+from query import INDEXES, Query
+
+KATEGORI = ("Makan", "Transport", "Gaji", "Belanja", "Hiburan", "Tagihan")
+KETERANGAN = ("makan siang", "ojek kantor", "gaji bulanan", "belanja mingguan",
+              "tagihan listrik", "nonton bioskop")
+# prefix yang hanya muncul di awal kata (LIKE di SQLite tanpa FTS5 = substring)
+TEKS = ("", "", "mak", "oje", "bulanan", "gaj", "transp", "siang kan")
+
+DAY = 86400
+
+
+def _ledger(rng, n=1500):
+    rows = [
+        {
+            "tipe": rng.choice(("pemasukan", "pengeluaran", "pengeluaran")),
+            "jumlah": rng.randrange(1000, 100_000, 500),
+            "kategori": rng.choice(KATEGORI),
+            "keterangan": rng.choice(KETERANGAN),
+            "timestamp": START + rng.randrange(730 * DAY),
+        }
+        for _ in range(n)
+    ]
+    data_store.add_transactions(rows)
+
+
+def _random_query(rng):
+    start = end = None
+    if rng.random() < 0.7:
+        start = START + rng.randrange(700 * DAY)
+        end = start + rng.choice((1, 7, 31, 120, 400)) * DAY
+    kategori = None
+    if rng.random() < 0.5:
+        kategori = rng.sample(KATEGORI, rng.choice((1, 1, 2, 3)))
+    lo = hi = None
+    if rng.random() < 0.3:
+        lo = rng.randrange(1000, 60_000, 500)
+    if rng.random() < 0.3:
+        hi = rng.randrange(30_000, 100_000, 500)
+    return Query(
+        start_ts=start,
+        end_ts=end,
+        tipe=rng.choice((None, None, "pemasukan", "pengeluaran")),
+        kategori=kategori,
+        min_jumlah=lo,
+        max_jumlah=hi,
+        teks=rng.choice(TEKS),
+    )
+
+
+def _ids(rows):
+    return sorted(t["id"] for t in rows)
+
+
+def _totals(rows):
+    hasil = {}
+    for t in rows:
+        hasil[t["tipe"]] = hasil.get(t["tipe"], 0) + t["jumlah"]
+    return hasil
+
+
+def test_query_matches_brute_force(backend):
+    rng = random.Random(24)
+    _ledger(rng)
+    semua = data_store.load_json()["transaksi"]
+    store = data_store.get_store()
+
+    for _ in range(150):
+        q = _random_query(rng)
+        expected = [t for t in semua if q.match(t)]
+
+        rows, lanjut = store.query(q)
+        rows = rows[:]
+        assert lanjut is None
+        assert _ids(rows) == _ids(expected), q
+        ts = [t["timestamp"] for t in rows]
+        assert ts == sorted(ts)
+
+        total = store.query_sum(q).get(None, {})
+        for tipe, jumlah in _totals(expected).items():
+            assert total.get(tipe, 0) == pytest.approx(jumlah), q
+
+
+def test_chunked_query_covers_range_once(backend):
+    rng = random.Random(7)
+    _ledger(rng)
+    semua = data_store.load_json()["transaksi"]
+    store = data_store.get_store()
+
+    for _ in range(20):
+        q = _random_query(rng)
+        expected = [t for t in semua if q.match(t)]
+        rows = []
+        langkah = q
+        while True:
+            part, lanjut = store.query(langkah, limit=100)
+            rows.extend(part[:])
+            if lanjut is None:
+                break
+            langkah = q._replace(start_ts=lanjut)
+        assert _ids(rows) == _ids(expected), q
+
+
+def test_planner_picks_each_index(ledger_dir):
+    data_store.init_json()
+    _ledger(random.Random(1), 3000)
+    store = data_store.get_store()
+
+    # rentang sempit: indeks waktu; satu kategori di rentang lebar: posting
+    # list kategori; hanya tipe langka di seluruh riwayat: posting list tipe
+    data_store.add_transaction({
+        "tipe": "lainnya", "jumlah": 1, "kategori": "Makan",
+        "keterangan": "tipe langka", "timestamp": START,
+    })
+    plans = {
+        store.plan(Query(START, START + DAY)).index,
+        store.plan(Query(kategori="Hiburan")).index,
+        store.plan(Query(tipe="lainnya")).index,
+    }
+    assert plans == set(INDEXES)
@@ -0,0 +1,88 @@
+# tests/test_refresh_scheduler.py
+"""Notifikasi beruntun digabung; tulisan sendiri tidak memicu refresh."""
+import os
+
+import data_store
+import refresh_scheduler
+from conftest import trans
+from refresh_scheduler import RefreshScheduler
+
+
+class FakeRoot:
+    """Pengganti Tk: `after` hanya dicatat, dijalankan manual lewat `run`."""
+
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, func):
+        self.calls.append(func)
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        for func in calls:
+            func()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(monkeypatch, is_echo=None):
+    clock = Clock()
+    monkeypatch.setattr(refresh_scheduler.time, "monotonic", clock)
+    root = FakeRoot()
+    refreshes = []
+    scheduler = RefreshScheduler(
+        root, lambda: refreshes.append(clock.now), debounce_ms=200, is_echo=is_echo
+    )
+    return scheduler, root, clock, refreshes
+
+
+def test_burst_is_debounced_into_one_refresh(monkeypatch):
+    scheduler, root, clock, refreshes = _scheduler(monkeypatch)
+
+    for _ in range(10):
+        scheduler.notify("data_cash.json")
+        clock.now += 0.05
+        root.run()
+    assert refreshes == []
+
+    clock.now += 0.2
+    root.run()
+    assert len(refreshes) == 1
+    # tanpa notifikasi baru poll berhenti, main loop tidak dibangunkan lagi
+    assert root.calls == []
+
+
+def test_idle_scheduler_does_not_poll(monkeypatch):
+    scheduler, root, clock, refreshes = _scheduler(monkeypatch)
+    assert root.calls == []
+
+    scheduler.notify("data_cash.json")
+    scheduler.notify("data_cash.journal")
+    assert len(root.calls) == 1  # satu poll untuk satu gelombang notifikasi
+
+
+def test_own_writes_are_ignored(ledger_dir, monkeypatch):
+    data_store.init_json()
+    scheduler, root, clock, refreshes = _scheduler(
+        monkeypatch, is_echo=data_store.is_own_write
+    )
+
+    data_store.add_transaction(trans(0))
+    scheduler.notify(os.path.abspath(data_store.FILE_JOURNAL))
+    clock.now += 1
+    root.run()
+    assert refreshes == []
+
+    # tulisan proses lain: isi file berubah tanpa lewat data_store
+    with open(data_store.FILE_JOURNAL, "a") as f:
+        f.write("\n")
+    scheduler.notify(os.path.abspath(data_store.FILE_JOURNAL))
+    clock.now += 1
+    root.run()
+    assert len(refreshes) == 1
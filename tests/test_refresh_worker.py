@@ -0,0 +1,92 @@
+# tests/test_refresh_worker.py
+"""RefreshWorker: hasil permintaan lama dibuang, error diteruskan ke main loop."""
+import threading
+import time
+
+import pytest
+
+from refresh_worker import RefreshWorker
+
+
+class FakeRoot:
+    """Pengganti Tk: `after` hanya dicatat, dijalankan manual lewat `run`."""
+
+    def __init__(self):
+        self.calls = []
+
+    def after(self, ms, func):
+        self.calls.append(func)
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        for func in calls:
+            func()
+
+
+def _finish(worker, root):
+    # tunggu semua compute selesai lalu jalankan poll di "main loop"
+    worker.executor.shutdown(wait=True)
+    root.run()
+
+
+def test_stale_generation_is_dropped():
+    root = FakeRoot()
+    worker = RefreshWorker(root)
+    applied = []
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "lama"
+
+    worker.submit("tabel", slow, applied.append)
+    started.wait(5)
+    assert worker.busy("tabel")
+    # permintaan baru untuk key yang sama saat yang lama masih berjalan
+    worker.submit("tabel", lambda: "baru", applied.append)
+    worker.submit("grafik", lambda: "grafik", applied.append)
+    release.set()
+
+    _finish(worker, root)
+    assert sorted(applied) == ["baru", "grafik"]
+    assert not worker.busy()
+    assert root.calls == []  # semua hasil diterapkan: poll berhenti
+
+
+def test_poll_runs_only_while_busy():
+    root = FakeRoot()
+    worker = RefreshWorker(root)
+    assert root.calls == []
+    applied = []
+
+    def lanjut(hasil):
+        # apply yang mengirim permintaan baru (seperti continue_query)
+        applied.append(hasil)
+        worker.submit("lanjut", lambda: "dua", applied.append)
+
+    worker.submit("tabel", lambda: "satu", lanjut)
+    worker.submit("grafik", lambda: "grafik", applied.append)
+    assert len(root.calls) == 1  # satu poll untuk semua permintaan
+
+    for _ in range(500):
+        if not root.calls:
+            break
+        time.sleep(0.01)
+        root.run()
+    assert sorted(applied) == ["dua", "grafik", "satu"]
+    assert root.calls == [] and not worker.busy()
+
+
+def test_compute_error_is_raised_on_main_loop():
+    root = FakeRoot()
+    worker = RefreshWorker(root)
+    applied = []
+
+    def gagal():
+        raise KeyError("rusak")
+
+    worker.submit("tabel", gagal, applied.append)
+    with pytest.raises(KeyError):
+        _finish(worker, root)
+    assert applied == []
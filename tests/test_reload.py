@@ -0,0 +1,67 @@
+# tests/test_reload.py
+"""reload_changes(): hanya baris yang diubah instance/proses lain yang ditambal."""
+import json
+
+import data_store
+from conftest import content, run_other, trans
+
+
+def _ids(rows):
+    return {t["id"] for t in rows}
+
+
+def test_reload_changes_diff(backend):
+    ids = [data_store.add_transaction(trans(i)) for i in range(12)]
+    store = data_store.get_store()
+    store.all()  # backend shard: semua file bulan dimuat
+
+    baru = run_other(f"""
+        print(data_store.add_transaction({trans(50)!r}))
+        data_store.edit_transaction({ids[1]}, {{"jumlah": 9}})
+        data_store.delete_transaction({ids[2]})
+    """)
+    baru = int(baru)
+
+    diff = data_store.reload_changes()
+    assert _ids(diff.added) == {baru}
+    assert _ids(diff.changed) == {ids[1]}
+    assert _ids(diff.removed) == {ids[2]}
+
+    store = data_store.get_store()
+    assert store.find(ids[1])["jumlah"] == 9
+    assert store.find(ids[2]) is None
+    assert store.find(baru) is not None
+    assert store.aggregates.verify(store.all()) == {}
+
+    # tidak ada perubahan lagi: diff kosong
+    assert not any(data_store.reload_changes())
+
+
+def test_own_writes_are_not_reported(backend):
+    data_store.get_store()
+    trans_id = data_store.add_transaction(trans(1))
+    data_store.edit_transaction(trans_id, {"keterangan": "sendiri"})
+    assert not any(data_store.reload_changes())
+
+
+def test_reload_after_external_snapshot_edit(ledger_dir):
+    data_store.init_json()
+    ids = [data_store.add_transaction(trans(i)) for i in range(6)]
+    data_store.compact()
+    store = data_store.get_store()
+
+    # file diedit manual: satu baris diubah, satu dihapus, satu ditambah
+    with open(data_store.FILE_JSON) as f:
+        data = json.load(f)
+    data["transaksi"][0]["jumlah"] = 123
+    del data["transaksi"][1]
+    data["transaksi"].append(dict(trans(30), id=777))
+    with open(data_store.FILE_JSON, "w") as f:
+        json.dump(data, f)
+
+    diff = data_store.reload_changes()
+    assert _ids(diff.added) == {777}
+    assert _ids(diff.changed) == {ids[0]}
+    assert _ids(diff.removed) == {ids[1]}
+    assert content(data_store.get_store().all()) == content(data["transaksi"])
+    assert data_store.get_store() is store  # store yang sama, bukan dimuat ulang
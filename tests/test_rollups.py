@@ -0,0 +1,73 @@
+# tests/test_rollups.py
+"""Rollup per periode == jumlah ulang dari baris mentah."""
+import random
+from collections import defaultdict
+from datetime import datetime
+
+import charts
+import data_store
+import rollups
+from conftest import START, trans
+
+
+def _ledger(n, seed=5):
+    # tersebar sekitar 3 tahun supaya mode multi_tahun punya isi
+    rng = random.Random(seed)
+    return [
+        data_store.add_transaction(trans(i, timestamp=START + rng.uniform(-730, 365) * 86400))
+        for i in range(n)
+    ]
+
+
+def _brute(rows, key):
+    pemasukan, pengeluaran = defaultdict(float), defaultdict(float)
+    for t in rows:
+        out = pemasukan if t["tipe"] == "pemasukan" else pengeluaran
+        out[key(datetime.fromtimestamp(t["timestamp"]))] += t["jumlah"]
+    return pemasukan, pengeluaran
+
+
+def test_store_rollups_follow_add_edit_delete(ledger_dir):
+    data_store.init_json()
+    ids = _ledger(300)
+    data_store.edit_transaction(ids[0], {"timestamp": START + 400 * 86400, "jumlah": 5})
+    data_store.edit_transaction(ids[1], {"kategori": "Baru", "tipe": "pemasukan"})
+    for trans_id in ids[10:40]:
+        data_store.delete_transaction(trans_id)
+
+    store = data_store.get_store()
+    assert store.rollups.diff(rollups.from_columns(store.cols, store._rids)) == []
+
+
+def test_rollup_modes_match_brute_force(backend):
+    _ledger(300)
+    store = data_store.get_store()
+    rows = store.all()
+    ref = datetime.fromtimestamp(START)
+
+    pemasukan, pengeluaran = _brute(rows, lambda d: (d.year, d.month))
+    bulan = [(ref.year, m) for m in range(1, 13)]
+    assert charts.bar_series(store, ref, "tahunan") == (
+        [pemasukan[k] for k in bulan], [pengeluaran[k] for k in bulan]
+    )
+    kuartal = bulan[:3]
+    assert charts.bar_series(store, ref, "kuartalan") == (
+        [pemasukan[k] for k in kuartal], [pengeluaran[k] for k in kuartal]
+    )
+
+    pemasukan, pengeluaran = _brute(rows, lambda d: d.year)
+    tahun = list(range(ref.year - charts.TAHUN_MULTI + 1, ref.year + 1))
+    assert charts.bar_series(store, ref, "multi_tahun") == (
+        [pemasukan[k] for k in tahun], [pengeluaran[k] for k in tahun]
+    )
+
+
+def test_rollup_file_written_with_snapshot(ledger_dir, capsys):
+    data_store.init_json()
+    _ledger(50)
+    data_store.compact()
+
+    saved, seq = rollups.load(data_store.FILE_ROLLUPS)
+    assert seq == data_store.load_json()["journal_seq"]
+    assert saved.diff(data_store.get_store().rollups) == []
+    assert rollups.main(["verify"]) == 0
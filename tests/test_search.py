@@ -0,0 +1,83 @@
+# tests/test_search.py
+"""Pencarian teks == pemindaian substring prefix per kata."""
+import pytest
+
+import data_store
+import search
+from columnar import ColumnarTransactions
+from conftest import trans
+from query import Query
+
+QUERIES = ["mak", "MAKAN sia", "ojek", "transport", "bul gaji", "transaksi 1", "tidakada", ""]
+
+
+def _brute(rows, query):
+    def cocok(t, tok):
+        return any(
+            w.startswith(tok)
+            for field in ("keterangan", "kategori")
+            for w in search.tokens(t[field])
+        )
+    toks = search.tokens(query)
+    return [t["id"] for t in rows if all(cocok(t, tok) for tok in toks)]
+
+
+def _search_all(store, query, limit=None):
+    ids, q = [], Query(teks=query)
+    while True:
+        rows, lanjut = store.query(q, limit=limit)
+        ids.extend(t["id"] for t in rows[:])
+        if lanjut is None:
+            return ids
+        q = q._replace(start_ts=lanjut)
+
+
+def test_search_matches_substring_scan(backend):
+    ids = [data_store.add_transaction(trans(i)) for i in range(300)]
+    data_store.edit_transaction(ids[5], {"keterangan": "Beli gorengan"})
+    data_store.delete_transaction(ids[6])
+    store = data_store.get_store()
+    rows = store.all()
+
+    for query in QUERIES:
+        expected = _brute(rows, query)
+        assert sorted(_search_all(store, query)) == sorted(expected), query
+    assert _search_all(store, "goreng") == [ids[5]]
+
+
+def test_incremental_search_equals_full(ledger_dir):
+    data_store.init_json()
+    for i in range(500):
+        data_store.add_transaction(trans(i))
+    store = data_store.get_store()
+    full = _search_all(store, "mak")
+    ts = [store.find(i)["timestamp"] for i in full]
+    assert full and ts == sorted(ts)  # urut waktu seperti tabel
+    assert _search_all(store, "mak", limit=37) == full
+
+
+def test_numpy_and_python_filter_agree(monkeypatch):
+    if search.np is None:
+        pytest.skip("numpy tidak ada")
+    cols = ColumnarTransactions(trans(i, id=i + 1) for i in range(200))
+    index = search.SearchIndex(cols)
+    for query in QUERIES:
+        terms = index.terms(query)
+        with_numpy = index.filter(cols.order, terms)
+        with monkeypatch.context() as m:
+            m.setattr(search, "np", None)
+            assert index.filter(cols.order, terms) == with_numpy
+
+
+def test_store_copy_shares_index_with_newer_strings(ledger_dir):
+    data_store.init_json()
+    for i in range(30):
+        data_store.add_transaction(trans(i))
+    salinan = data_store.read_store()
+    assert _search_all(salinan, "ojek") == _brute(salinan.all(), "ojek")
+
+    # string baru masuk ke indeks bersama, tapi bukan milik baris salinan
+    data_store.add_transaction(trans(30, keterangan="ojek zebra"))
+    assert _search_all(data_store.read_store(), "zebra") != []
+    assert _search_all(salinan, "zebra") == []
+    assert _search_all(salinan, "ojek") == _brute(salinan.all(), "ojek")
@@ -0,0 +1,55 @@
+# tests/test_startup.py
+"""Cache ringkasan startup hanya dipakai selama file data belum berubah."""
+import json
+
+import pytest
+
+import data_store
+import startup
+from conftest import trans
+
+
+@pytest.fixture(autouse=True)
+def fresh_saved(monkeypatch):
+    monkeypatch.setattr(startup, "_saved", None)
+
+
+def test_summary_cache_follows_data_files(ledger_dir):
+    data_store.init_json()
+    data_store.add_transaction(trans(1))
+    signature = data_store.files_signature()
+
+    startup.save_summary(signature, (1000, 250, 0))
+    assert startup.load_summary(data_store.files_signature()) == (1000, 250, 0)
+
+    # file data berubah: cache tidak lagi berlaku
+    data_store.add_transaction(trans(2))
+    assert startup.load_summary(data_store.files_signature()) is None
+
+
+def test_summary_cache_expires_next_day(ledger_dir):
+    signature = ((1, 2, 3), None)
+    startup.save_summary(signature, (1, 2, 3))
+    with open(startup.SUMMARY_FILE) as f:
+        cached = json.load(f)
+    cached["tanggal"] = "2000-01-01"
+    with open(startup.SUMMARY_FILE, "w") as f:
+        json.dump(cached, f)
+    assert startup.load_summary(signature) is None
+
+
+def test_corrupt_cache_is_ignored(ledger_dir):
+    (ledger_dir / startup.SUMMARY_FILE).write_text("{rusak")
+    assert startup.load_summary(((1, 2, 3),)) is None
+
+
+def test_timer_marks_each_stage_once(ledger_dir):
+    timer = startup.StartupTimer()
+    timer.mark("jendela")
+    first = timer.marks["jendela"]
+    timer.mark("jendela")
+    assert timer.marks["jendela"] == first
+    assert timer.done("jendela") and not timer.done("jendela", "data")
+
+    entry = timer.dump(str(ledger_dir / "startup.log"))
+    assert entry["tahap"] == {"jendela": first}
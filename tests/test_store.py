@@ -0,0 +1,133 @@
+# tests/test_store.py
+"""TransactionStore: query rentang waktu == filter linear, tetap sinkron dengan journal."""
+import random
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import data_store
+import sqlite_backend
+from conftest import START, content, trans
+
+
+def _ledger(n, seed=2):
+    rng = random.Random(seed)
+    data_store.init_json()
+    # urutan tambah acak: store harus tetap terurut waktu
+    return [
+        data_store.add_transaction(trans(i, timestamp=START + rng.randrange(90 * 86400)))
+        for i in range(n)
+    ]
+
+
+def _brute(rows, start, end):
+    return [t for t in rows if start.timestamp() <= t["timestamp"] < end.timestamp()]
+
+
+def test_range_day_month_match_linear_scan(ledger_dir):
+    _ledger(300)
+    store = data_store.get_store()
+    rows = data_store.load_json()["transaksi"]
+
+    ts = [t["timestamp"] for t in store.all()]
+    assert ts == sorted(ts)
+
+    for offset in range(0, 95, 3):
+        d = datetime.fromtimestamp(START) + timedelta(days=offset, hours=13)
+        hari = datetime(d.year, d.month, d.day)
+        bulan = datetime(d.year, d.month, 1)
+        bulan_depan = datetime(d.year + d.month // 12, d.month % 12 + 1, 1)
+        assert content(store.day(d)) == content(_brute(rows, hari, hari + timedelta(days=1)))
+        assert content(store.month(d)) == content(_brute(rows, bulan, bulan_depan))
+
+    assert store.dates() == sorted({
+        datetime.fromtimestamp(t["timestamp"]).strftime("%Y-%m-%d") for t in rows
+    })
+    assert store.categories() == sorted({t["kategori"] for t in rows})
+
+
+def test_store_follows_add_edit_delete(ledger_dir):
+    ids = _ledger(50)
+    store = data_store.get_store()
+
+    data_store.add_transaction(trans(60))
+    data_store.edit_transaction(ids[3], {"timestamp": START + 200 * 86400, "kategori": "Baru"})
+    data_store.delete_transaction(ids[7])
+
+    # store di memori == store yang dibangun ulang dari disk
+    expected = content(store.all())
+    assert store.find(ids[3])["kategori"] == "Baru"
+    assert store.find(ids[7]) is None
+    data_store.reload()
+    assert content(data_store.get_store().all()) == expected
+    assert len(expected) == 50
+    assert "Baru" in data_store.get_store().categories()
+
+
+def test_amounts_read_back_as_int(backend):
+    utuh = data_store.add_transaction(trans(0, jumlah=5000))
+    pecahan = data_store.add_transaction(trans(1, jumlah=12.5))
+
+    got = data_store.get_transaction(utuh)["jumlah"]
+    assert got == 5000 and type(got) is int
+    assert data_store.get_transaction(pecahan)["jumlah"] == 12.5
+    for t in data_store.get_store().all()[:]:
+        assert type(t["jumlah"]) is (int if t["id"] == utuh else float)
+
+
+def test_write_not_blocked_while_reading_copy(ledger_dir):
+    _ledger(50)
+    started, release = threading.Event(), threading.Event()
+    hasil = {}
+
+    def compute():
+        store = data_store.read_store()
+        started.set()
+        release.wait(5)  # komputasi refresh yang lama
+        hasil["n"] = len(store.all())
+        hasil["saldo"] = store.aggregates.saldo()
+
+    reader = threading.Thread(target=compute)
+    reader.start()
+    assert started.wait(5)
+    saldo = data_store.read_store().aggregates.saldo()
+
+    writer = threading.Thread(target=data_store.add_transaction, args=(trans(99, jumlah=10),))
+    writer.start()
+    writer.join(2)
+    assert not writer.is_alive()
+
+    release.set()
+    reader.join(5)
+    # salinan yang sedang dibaca tidak ikut berubah
+    assert hasil == {"n": 50, "saldo": saldo}
+    store = data_store.read_store()
+    assert len(store.all()) == 51
+    assert store is data_store.read_store()  # dipakai ulang selama tidak ada tulisan
+
+
+@pytest.mark.parametrize("backend", ["sqlite"], indirect=True)
+def test_sqlite_slices_follow_keyset_anchors(backend, monkeypatch):
+    monkeypatch.setattr(sqlite_backend, "KEYSET_PAGE", 7)
+    # timestamp kembar: urutan ditentukan id
+    ids = [data_store.add_transaction(trans(i, timestamp=START + i // 3 * 60)) for i in range(50)]
+    store = data_store.get_store()
+
+    def urut():
+        rows = [data_store.get_transaction(i) for i in ids]
+        return [t["id"] for t in sorted((t for t in rows if t), key=lambda t: (t["timestamp"], t["id"]))]
+
+    expected = urut()
+    for start, stop in ((0, 5), (6, 8), (7, 7), (13, 29), (45, 60), (49, 50)):
+        assert [t["id"] for t in store[start:stop]] == expected[start:stop]
+    assert store[20]["id"] == expected[20]
+    assert store[-1]["id"] == expected[-1]
+
+    # tulisan membuang jangkar lama
+    data_store.delete_transaction(expected[3])
+    data_store.edit_transaction(expected[30], {"timestamp": START - 60})
+    store = data_store.get_store()
+    expected = urut()
+    assert [t["id"] for t in store[:]] == expected
+    assert [t["id"] for t in store[10:40]] == expected[10:40]
@@ -0,0 +1,56 @@
+# tests/test_table_view.py
+"""VirtualTable hanya membuat item untuk jendela yang terlihat."""
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+
+@pytest.fixture
+def table():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("tidak ada display untuk Tk")
+    root.withdraw()
+
+    from table_view import VirtualTable
+    view = VirtualTable(root, ("no", "isi"), lambda i, t: (i, t), buffer=5)
+    yield view
+    root.destroy()
+
+
+def _values(table, iid):
+    return [str(v) for v in table.tree.item(iid, "values")]
+
+
+def test_items_are_limited_to_window(table):
+    rows = [f"baris {i}" for i in range(10000)]
+    table.set_rows(rows)
+    items = table.tree.get_children()
+    assert len(items) == table._visible + table.buffer
+    assert _values(table, items[0]) == ["1", "baris 0"]
+
+
+def test_scroll_reuses_items_and_keeps_position_per_key(table):
+    rows = [f"baris {i}" for i in range(500)]
+    table.set_rows(rows, key="semua")
+    before = table.tree.get_children()
+
+    table._scroll_to(100)
+    after = table.tree.get_children()
+    assert after == before
+    assert _values(table, after[0]) == ["101", "baris 100"]
+
+    # key sama: posisi dipertahankan, key berbeda: kembali ke atas
+    table.set_rows(rows, key="semua")
+    assert table._offset == 100
+    table.set_rows(rows[:50], key="filter")
+    assert table._offset == 0
+
+
+def test_key_navigation_moves_window(table):
+    table.set_rows(list(range(100)))
+    for _ in range(table._visible + 2):
+        table._on_key(1)
+    assert table._selected == table._visible + 2
+    assert table._offset == table._selected - table._visible + 1